@@ -74,16 +74,61 @@ def _list_jobs(cli_ctx):
     default=-1,
     help="Number of threads per each worker process",
 )
+@click.option(
+    "--dag",
+    is_flag=True,
+    default=False,
+    help="Run the tasks of all the selected jobs as a single DAG inferred "
+    "from the datasets they declare as inputs/outputs",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Run all the tasks instead of restoring their outputs from the cache",
+)
+@click.option(
+    "-f",
+    "--force",
+    multiple=True,
+    help="Name of a task to run even if its outputs are cached. "
+    "Can be used multiple times",
+)
 @click.pass_context
-def _run_job(cli_ctx, job_id, num_workers, num_threads_per_worker):
+def _run_job(
+    cli_ctx, job_id, num_workers, num_threads_per_worker, dag, no_cache, force
+):
 
     proj_ctxt = cli_ctx.obj["project_context"]
     job_catalog = proj_ctxt.job_catalog
+    for job_spec in job_catalog["jobs"]:
+        for stage_spec in job_spec["stages"]:
+            for task_spec in stage_spec["tasks"]:
+                if no_cache or (task_spec["name"] in force):
+                    task_spec["use_cache"] = False
 
     init_fn = None
     if num_workers != 1:
         init_fn = partial(load_job_processors, op.dirname(op.abspath(__file__)))
 
+    if dag:
+        job_specs = [
+            job_spec
+            for job_spec in job_catalog["jobs"]
+            if (job_id == "all") or (job_spec["name"] == job_id)
+        ]
+        if not job_specs:
+            print(
+                f"Invalid job-id : {job_id}. \n\n"
+                "Use list sub-command to see available tasks."
+            )
+            return
+        dag_plan = job_planner.create_dag_plan(proj_ctxt, job_specs)
+        job_runner.execute_dag_plan(
+            proj_ctxt, dag_plan, init_fn=init_fn, n_workers=num_workers
+        )
+        return
+
     _completed = False
     for job_spec in job_catalog["jobs"]:
         spec_job_id = job_spec["name"]
@@ -1,16 +1,16 @@
 """Processors for the model scoring/evaluation step of the worklow."""
-import os.path as op
 
 from ta_lib.core.api import (get_dataframe,
                              get_feature_names_from_column_transformer,
                              get_package_path, hash_object, load_dataset,
-                             load_pipeline, register_processor, save_dataset, DEFAULT_ARTIFACTS_PATH)
+                             load_pipeline, register_processor, save_dataset, get_dataset_uri)
 import joblib
 import mlflow
 import numpy as np
 import pandas as pd
 import logging
 from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error
+from training import load_model_fleet
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ def score_model(context, params):
 
     This processor:
     - Loads the test feature set and target variable from the data store.
-    - Loads the trained model pipeline from the artifacts directory.
+    - Loads the trained model pipeline from the artifacts/FnB/linear_model dataset.
     - Generates predictions using the test set.
     - Calculates the Mean Absolute Percentage Error (MAPE).
     - Logs the MAPE value for evaluation.
@@ -44,9 +44,8 @@ def score_model(context, params):
     X_test = load_dataset(context, "test/FnB/features")
     y_test = load_dataset(context, "test/FnB/target")
     
-    artifacts_folder = DEFAULT_ARTIFACTS_PATH
-
-    model_pipeline = load_pipeline(op.join(artifacts_folder, "linear_model.pkl"))
+    model_path = get_dataset_uri(context, "artifacts/FnB/linear_model")
+    model_pipeline = load_pipeline(model_path)
     predictions = model_pipeline.predict(X_test)
     mape = mean_absolute_percentage_error(y_test, predictions) * 100
     print(f"MAPE: {mape:.4f}%")
@@ -54,3 +53,78 @@ def score_model(context, params):
     predictions = pd.DataFrame(predictions)
     save_dataset(context, predictions, output_ds)
     logger.info("Saved the test predictions to test directory")
+
+
+def predict_model_fleet(fleet, X, claim_ids):
+    """Score the rows of all the claims in a single vectorized pass.
+
+    Parameters
+    ----------
+    fleet : dict
+        Model fleet loaded using ``load_model_fleet``.
+    X : pd.DataFrame
+        Features of all the rows. Missing features are treated as zero.
+    claim_ids : array-like
+        Claim of each row in ``X``.
+
+    Returns
+    -------
+    np.ndarray
+        Predictions of the model of each row's claim.
+    """
+    model_idx = pd.Index(fleet["claim_ids"]).get_indexer(claim_ids)
+    if (model_idx < 0).any():
+        raise ValueError("Rows found for claims without a trained model")
+    X = X.reindex(columns=fleet["features"], fill_value=0).fillna(0).to_numpy()
+    coefs = fleet["coefs"][model_idx]
+    return np.einsum("ij,ij->i", X, coefs) + fleet["intercepts"][model_idx]
+
+
+@register_processor("model-eval", "score-model-fleet")
+def score_model_fleet(context, params):
+    """
+    Scores the models of all the claims using their test data and logs evaluation metrics.
+
+    This processor:
+    - Loads the model fleet from the artifacts/FnB/linear_model_fleet dataset.
+    - Loads and stacks the test features and target of all the claims.
+    - Generates the predictions of every row with the model of its claim in a single pass.
+    - Logs the overall Mean Absolute Percentage Error (MAPE).
+    - Saves the prediction results to the score directory.
+
+    Parameters
+    ----------
+    context : object
+        A custom context object used to load and save datasets and pipelines.
+    params : dict
+        Optional parameters for extension. Currently unused.
+
+    Returns
+    -------
+    None
+        The function saves the predictions to "score/FnB/fleet_output" and logs MAPE.
+    """
+    output_ds = "score/FnB/fleet_output"
+
+    fleet_path = get_dataset_uri(context, "artifacts/FnB/linear_model_fleet")
+    fleet = load_model_fleet(fleet_path)
+
+    X_test, y_test, claim_ids = [], [], []
+    for claim in fleet["claim_ids"]:
+        X = load_dataset(context, "test/FnB/claim_features", claim_id=claim)
+        y = load_dataset(context, "test/FnB/claim_target", claim_id=claim)
+        X_test.append(X)
+        y_test.append(y.iloc[:, 0])
+        claim_ids.append(np.full(len(X), claim))
+    X_test = pd.concat(X_test, ignore_index=True)
+    y_test = pd.concat(y_test, ignore_index=True)
+    claim_ids = np.concatenate(claim_ids)
+
+    predictions = predict_model_fleet(fleet, X_test, claim_ids)
+    mape = mean_absolute_percentage_error(y_test, predictions) * 100
+    logger.info(f"MAPE: {mape:.4f}%")
+    output = pd.DataFrame(
+        {"claim_id": claim_ids, "actual": y_test.values, "prediction": predictions}
+    )
+    save_dataset(context, output, output_ds)
+    logger.info("Saved the test predictions of all the claims to test directory")
@@ -1,5 +1,6 @@
 """Processors for the model training step of the worklow."""
 import logging
+import os
 import os.path as op
 import pandas as pd
 import numpy as np
@@ -21,11 +22,12 @@ from ta_lib.core.api import (
     register_processor,
     save_pipeline,
     save_dataset,
-    DEFAULT_ARTIFACTS_PATH
+    get_dataset_uri,
 )
 from ta_lib.regression.api import SKLStatsmodelOLS
 from feature_engineering import transform_features
 import joblib
+from joblib import Parallel, delayed
 
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.impute import SimpleImputer
@@ -34,18 +36,103 @@ from scipy.stats import randint
 
 logger = logging.getLogger(__name__)
 
+_NON_FEATURE_COLS = [
+    "sales_dollars_value",
+    "sales_units_value",
+    "sales_lbs_value",
+    "vendor",
+    "claim_id",
+]
+
+
+def _create_lagged_features(data, max_lag):
+    """Add ``max_lag`` lags of search volume and sales without dropping any rows."""
+    lags = {}
+    for i in range(1, max_lag + 1):
+        lags[f"search_lag_{i}"] = data["search_volume"].shift(i)
+        lags[f"sales_lag_{i}"] = data["sales_dollars_value"].shift(i)
+    return pd.concat([data, pd.DataFrame(lags, index=data.index)], axis=1)
+
+
+def _timeseries_train_test_split(X, y, test_size=0.3):
+    test_index = int(len(X) * (1 - test_size))
+    return X.iloc[:test_index], X.iloc[test_index:], y.iloc[:test_index], y.iloc[test_index:]
+
+
+def _mean_absolute_percentage_error(y_true, y_pred):
+    return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+
+
+def _search_best_lag(exp, target, test_size, max_lag=18):
+    """Find the number of lags with the least test MAPE for a single claim.
+
+    The design matrix is built once with ``max_lag`` lags. The candidate with
+    ``lag`` lags uses its first ``2 * lag`` lag columns and drops the first
+    ``lag`` rows, which is identical to rebuilding the lagged features.
+
+    Returns
+    -------
+    tuple
+        best lag, its MAPE and the scaled train-test split
+        ``(X_train, X_test, y_train, y_test)``.
+    """
+    exp = exp.fillna(0).sort_values(by="date").set_index("date")
+    lagged_data = _create_lagged_features(exp, max_lag)
+    base_cols = [col for col in exp.columns if col not in _NON_FEATURE_COLS]
+    lag_cols = list(lagged_data.columns[len(exp.columns):])
+
+    min_mape = float("inf")
+    best_lag = 0
+    best_split = None
+    scaler = StandardScaler()
+    for lag in range(1, max_lag + 1):
+        rows = lagged_data.iloc[lag:]
+        y = rows[target]
+        X = rows[base_cols + lag_cols[: 2 * lag]]
+
+        X_train, X_test, y_train, y_test = _timeseries_train_test_split(X, y, test_size)
+
+        X_train_scaled = pd.DataFrame(scaler.fit_transform(X_train), columns=X_train.columns, index=X_train.index)
+        X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns, index=X_test.index)
+
+        model = LinearRegression()
+        model.fit(X_train_scaled, y_train)
+        y_pred = model.predict(X_test_scaled)
+
+        mape = _mean_absolute_percentage_error(y_test, y_pred)
+
+        if mape < min_mape:
+            min_mape = mape
+            best_lag = lag
+            best_split = (X_train_scaled, X_test_scaled, y_train, y_test)
+
+    return best_lag, min_mape, best_split
+
+
+def _search_best_lag_safe(claim_id, exp, target, test_size, max_lag):
+    try:
+        return _search_best_lag(exp, target, test_size, max_lag)
+    except ValueError:
+        # e.g. not enough weeks of data for the claim to create the split
+        logger.warning(f"Unable to create the train-test split for claim {claim_id}")
+        return None
+
+
 @register_processor("model-gen", "train-test")
 def create_training_datasets(context, params):
     """
     Prepares training and test datasets for time series modeling using lag features.
 
     This processor:
-    - Filters the dataset for a specific `claim_id` (default: 8).
+    - Filters the dataset for each of the `claim_ids` (default: the `claim_id` 8).
     - Generates lag features for `search_volume` and `sales_dollars_value`.
     - Splits the data using a time series-aware split.
     - Tunes the number of lags based on Mean Absolute Percentage Error (MAPE).
     - Scales features using StandardScaler.
-    - Saves the best train-test split based on minimum MAPE.
+    - Saves the best train-test split of each claim based on minimum MAPE.
+
+    The lagged features are built once per claim with the maximum number of
+    lags and the claims are processed in parallel.
 
     Parameters
     ----------
@@ -53,9 +140,12 @@ def create_training_datasets(context, params):
         A custom context object used to load and save datasets.
     params : dict
         Configuration dictionary. Optional keys:
-            - 'claim_id': int, claim identifier to filter the data.
+            - 'claim_id': int, claim identifier whose split is also saved as the default train-test datasets.
+            - 'claim_ids': list or "all", claims for which the best split is saved (default: [claim_id]).
             - 'target_column': str, target column to predict (default: "sales_dollars_value").
             - 'test_size': float, ratio of data to reserve for testing (default: 0.3).
+            - 'max_lag': int, maximum number of lags to evaluate (default: 18).
+            - 'n_jobs': int, number of parallel processes (default: -1).
 
     Returns
     -------
@@ -65,76 +155,62 @@ def create_training_datasets(context, params):
         - test/FnB/features
         - train/FnB/target
         - test/FnB/target
+        and for each claim in:
+        - train/FnB/claim_features
+        - test/FnB/claim_features
+        - train/FnB/claim_target
+        - test/FnB/claim_target
+        along with the best lag of each claim in train/FnB/claim_lags.
     """
 
     logger.info("Loading data from processes directory")
 
     client_data = load_dataset(context, "processed/FnB/client_data")
     claim_id = params.get("claim_id", 8)
+    claim_ids = params.get("claim_ids", [claim_id])
+    if claim_ids == "all":
+        claim_ids = sorted(client_data["claim_id"].unique())
 
-    exp = client_data[client_data['claim_id'] == claim_id]
-    exp.fillna(0, inplace=True)
-    exp.sort_values(by='date', inplace=True)
-    exp.set_index('date', inplace=True)
-
-    def create_lagged_features(data, max_lag):
-        df = data.copy()
-        for i in range(1, max_lag + 1):
-            df[f"search_lag_{i}"] = df["search_volume"].shift(i)
-            df[f"sales_lag_{i}"] = df["sales_dollars_value"].shift(i)
-        return df.dropna()
-
-    def timeseries_train_test_split(X, y, test_size=0.3):
-        test_index = int(len(X) * (1 - test_size))
-        return X.iloc[:test_index], X.iloc[test_index:], y.iloc[:test_index], y.iloc[test_index:]
-
-    def mean_absolute_percentage_error(y_true, y_pred): 
-        return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-
-    logger.info("Performing Hyper Parameter Tuning")
-    min_mape = float("inf")
-    best_lag = 0
-    best_split = None
-    scaler = StandardScaler()
     target = params.get("target_column", "sales_dollars_value")
     test_size = params.get("test_size", 0.3)
-    for lag in range(1, 19):
-        lagged_data = create_lagged_features(exp, lag)
-        y = lagged_data[target]
-        X = lagged_data.drop(['sales_dollars_value', 'sales_units_value', 'sales_lbs_value', 'vendor', 'claim_id'], axis=1, errors='ignore')
+    max_lag = params.get("max_lag", 18)
 
-        X_train, X_test, y_train, y_test = timeseries_train_test_split(X, y, test_size)
-
-        X_train_scaled = pd.DataFrame(scaler.fit_transform(X_train), columns=X_train.columns, index=X_train.index)
-        X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns, index=X_test.index)
-
-
-        model = LinearRegression()
-        model.fit(X_train_scaled, y_train)
-        y_pred = model.predict(X_test_scaled)
-
-        mape = mean_absolute_percentage_error(y_test, y_pred)
-
-        if mape < min_mape:
-            min_mape = mape
-            best_lag = lag
-            best_split = (X_train_scaled, X_test_scaled, y_train, y_test)
-
-        # logger.info(f"Lag {lag}: MAPE = {mape:.4f}")
+    logger.info("Performing Hyper Parameter Tuning")
+    claim_groups = client_data.groupby("claim_id")
+    results = Parallel(n_jobs=params.get("n_jobs", -1))(
+        delayed(_search_best_lag_safe)(
+            claim, claim_groups.get_group(claim), target, test_size, max_lag
+        )
+        for claim in claim_ids
+        if claim in claim_groups.groups
+    )
+    results = dict(zip([c for c in claim_ids if c in claim_groups.groups], results))
 
     # Save the best result
-    X_train_scaled, X_test_scaled, y_train, y_test = best_split
-
-    save_dataset(context, X_train_scaled, "train/FnB/features")
-    save_dataset(context, X_test_scaled, "test/FnB/features")
-    save_dataset(context, y_train, "train/FnB/target")
-    save_dataset(context, y_test, "test/FnB/target")
-
-    logger.info(f"Best lag: {best_lag} with MAPE = {min_mape:.4f}")
+    claim_lags = []
+    for claim, result in results.items():
+        if result is None:
+            continue
+        best_lag, min_mape, (X_train_scaled, X_test_scaled, y_train, y_test) = result
+        save_dataset(context, X_train_scaled, "train/FnB/claim_features", claim_id=claim)
+        save_dataset(context, X_test_scaled, "test/FnB/claim_features", claim_id=claim)
+        save_dataset(context, y_train, "train/FnB/claim_target", claim_id=claim)
+        save_dataset(context, y_test, "test/FnB/claim_target", claim_id=claim)
+        claim_lags.append({"claim_id": claim, "best_lag": best_lag, "mape": min_mape})
+        logger.info(f"Claim {claim} : Best lag: {best_lag} with MAPE = {min_mape:.4f}")
+
+    save_dataset(context, pd.DataFrame(claim_lags), "train/FnB/claim_lags")
+
+    if results.get(claim_id) is not None:
+        _, _, (X_train_scaled, X_test_scaled, y_train, y_test) = results[claim_id]
+        save_dataset(context, X_train_scaled, "train/FnB/features")
+        save_dataset(context, X_test_scaled, "test/FnB/features")
+        save_dataset(context, y_train, "train/FnB/target")
+        save_dataset(context, y_test, "test/FnB/target")
 
     logger.info("Saved the train and test data to respective directories")
 
-    del client_data, exp, best_split, X_train_scaled, X_test_scaled, y_train, y_test, scaler
+    del client_data, claim_groups, results
     gc.collect()
 
 @register_processor("model-gen", "train-model")
@@ -145,7 +221,7 @@ def train_model(context, params):
     This processor:
     - Loads the training features and target.
     - Trains a Linear Regression model.
-    - Saves the trained model to the artifacts directory.
+    - Saves the trained model to the artifacts/FnB/linear_model dataset.
 
     Parameters
     ----------
@@ -157,10 +233,10 @@ def train_model(context, params):
     Returns
     -------
     None
-        The trained model is saved as 'linear_model.pkl' in the artifacts directory.
+        The trained model is saved to the artifacts/FnB/linear_model dataset.
     """
 
-    artifacts_folder = DEFAULT_ARTIFACTS_PATH
+    model_path = op.abspath(get_dataset_uri(context, "artifacts/FnB/linear_model"))
 
     X_train = load_dataset(context, "train/FnB/features")
     y_train = load_dataset(context, "train/FnB/target")
@@ -168,6 +244,105 @@ def train_model(context, params):
     model = LinearRegression()
     model.fit(X_train, y_train)
 
-    joblib.dump(model, op.abspath(op.join(artifacts_folder, "linear_model.pkl")))
+    os.makedirs(op.dirname(model_path), exist_ok=True)
+    joblib.dump(model, model_path)
+
+    logger.info("Trained and saved the model to artifacts directory")
+
+
+def _fit_claim_model(X, y):
+    model = LinearRegression()
+    model.fit(X, y)
+    return np.ravel(model.coef_), float(np.ravel(model.intercept_)[0])
+
 
-    logger.info("Trained and saved the model to artifacts directory")
\ No newline at end of file
+def save_model_fleet(path, claim_ids, features, coefs, intercepts):
+    """Save the linear models of all the claims as stacked arrays in a npz file.
+
+    Parameters
+    ----------
+    path : str
+        Location of the ``.npz`` artifact.
+    claim_ids : list
+        Claim of each model.
+    features : list(str)
+        Union of the features of all the models.
+    coefs : np.ndarray
+        Coefficients of shape (n_claims, n_features), zero for the features
+        not used by a claim's model.
+    intercepts : np.ndarray
+        Intercepts of shape (n_claims,).
+    """
+    os.makedirs(op.dirname(path), exist_ok=True)
+    np.savez_compressed(
+        path,
+        claim_ids=np.asarray(claim_ids),
+        features=np.asarray(features, dtype=str),
+        coefs=coefs,
+        intercepts=intercepts,
+    )
+
+
+def load_model_fleet(path):
+    """Load the model fleet saved using ``save_model_fleet`` as a dictionary."""
+    with np.load(path) as fleet:
+        return {key: fleet[key] for key in fleet.files}
+
+
+@register_processor("model-gen", "train-model-fleet")
+def train_model_fleet(context, params):
+    """
+    Trains a Linear Regression model for every claim on its training dataset.
+
+    This processor:
+    - Loads the training features and target of each claim listed in train/FnB/claim_lags.
+    - Trains the Linear Regression models in parallel.
+    - Saves the coefficients and intercepts of all the models as stacked arrays.
+
+    Parameters
+    ----------
+    context : object
+        A custom context object used to access and manage datasets and pipelines.
+    params : dict
+        Configuration dictionary. Optional keys:
+            - 'n_jobs': int, number of parallel processes (default: -1).
+
+    Returns
+    -------
+    None
+        The models are saved to the artifacts/FnB/linear_model_fleet dataset.
+    """
+    fleet_path = get_dataset_uri(context, "artifacts/FnB/linear_model_fleet")
+
+    claim_ids = load_dataset(context, "train/FnB/claim_lags")["claim_id"].tolist()
+    datasets = [
+        (
+            load_dataset(context, "train/FnB/claim_features", claim_id=claim),
+            load_dataset(context, "train/FnB/claim_target", claim_id=claim),
+        )
+        for claim in claim_ids
+    ]
+
+    results = Parallel(n_jobs=params.get("n_jobs", -1))(
+        delayed(_fit_claim_model)(X, y) for X, y in datasets
+    )
+
+    # the claims have different lags, so the models are stored over the
+    # union of their features with zero coefficients for the unused ones
+    features = list(dict.fromkeys(col for X, _ in datasets for col in X.columns))
+    feature_index = pd.Index(features)
+    coefs = np.zeros((len(claim_ids), len(features)))
+    intercepts = np.zeros(len(claim_ids))
+    for i, ((X, _), (coef, intercept)) in enumerate(zip(datasets, results)):
+        coefs[i, feature_index.get_indexer(X.columns)] = coef
+        intercepts[i] = intercept
+
+    save_model_fleet(
+        op.abspath(fleet_path),
+        claim_ids,
+        features,
+        coefs,
+        intercepts,
+    )
+
+    logger.info(f"Trained and saved {len(claim_ids)} models to artifacts directory")
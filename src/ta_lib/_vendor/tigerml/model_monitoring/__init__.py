@@ -2,9 +2,11 @@ import logging
 import os
 from tigerml.core.utils import set_logger
 
+from .core.baseline_profile import BaselineProfile
 from .model_drift import ModelDrift
 from .multiple_models import MultipleModelDrift
 from .segmented import SegmentedModelDrift
+from .streaming import StreamingDrift
 
 # Configure logger for the module
 log_dir = os.environ.get("logger_path", None)
@@ -21,6 +21,9 @@ from tigerml.model_monitoring.config.threshold_options import (
     THRESHOLD_OPTIONS,
     update_threshold_options,
 )
+from tigerml.model_monitoring.core import metrics
+from tigerml.model_monitoring.core.baseline_profile import BaselineProfile
+from tigerml.model_monitoring.core.drift_engine import get_drift_engine
 from tigerml.model_monitoring.utils.dao import db_connection, metadata
 from tigerml.model_monitoring.utils.data_utils import (
     compare_bool_stats,
@@ -34,10 +37,19 @@ from tigerml.model_monitoring.utils.misc import (
     apply_threshold,
     get_applicable_metrics,
 )
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 _LOGGER = logging.getLogger(__name__)
 
+# metrics computed by the DriftEngine when configured with these functions
+_ENGINE_FUNCS = {
+    "PSI": metrics.psi,
+    "DSI": metrics.dsi,
+    "KS": metrics.ks,
+    "ChiSquare": metrics.chiSquare,
+    "KLDivergence": metrics.kl,
+}
+
 
 class BaseDrift:
     """
@@ -45,8 +57,8 @@ class BaseDrift:
 
     Parameters
     ----------
-    base_df: pd.DataFrame
-        Base data / reference data
+    base_df: pd.DataFrame or BaselineProfile
+        Base data / reference data, or its profile built with ``BaselineProfile``
     current_df: pd.DataFrame
         Current data for which you want to calculate shift
     yhat: str
@@ -59,7 +71,7 @@ class BaseDrift:
 
     def __init__(
         self,
-        base_df: pd.DataFrame,
+        base_df: Union[pd.DataFrame, BaselineProfile],
         current_df: pd.DataFrame,
         yhat: str,
         y: Optional[str] = None,
@@ -67,7 +79,13 @@ class BaseDrift:
         options: Optional[Dict] = {},
         thresholds: Optional[Dict] = {},
     ):
-        self.base_df = base_df
+        if isinstance(base_df, BaselineProfile):
+            # the base data is only available through its profile
+            self.base_profile = base_df
+            self.base_df = None
+        else:
+            self.base_profile = None
+            self.base_df = base_df
         self.current_df = current_df
         self.yhat_base = yhat
         self.yhat_curr = yhat
@@ -79,7 +97,7 @@ class BaseDrift:
 
         self.features = self._set_features()
         if len(self.options):
-            self.options["max_levels"] = options["max_levels"]
+            self.options["max_levels"] = options.get("max_levels", 0.05)
         else:
             self.options["max_levels"] = 0.05
 
@@ -113,6 +131,9 @@ class BaseDrift:
         self.dependency_stability_index = {}
         self.descriptive_stats = {}
         self.drift_summary = None
+        self._drift_engine = None
+        self._current_counts = None
+        self._drift_metrics_cache = {}
 
         _LOGGER.info("Initiated DriftMetrics Class")
 
@@ -123,7 +144,7 @@ class BaseDrift:
         violations = []
         # Validation: Check types of input parameters
         if not (
-            (type(self.base_df) == pd.DataFrame)
+            (type(self.base_df) == pd.DataFrame or self.base_profile is not None)
             and (type(self.current_df) == pd.DataFrame)
             and (type(self.yhat_base) == str)
             and (type(self.yhat_curr) == str)
@@ -148,27 +169,15 @@ class BaseDrift:
                 "If y_base,y_curr are provided, thier type should be string"
             )
 
+        validation_flag &= self._validate_base_profile(violations)
         # Validation: Feature list of base_df and current_df should be same
-        if not (len(self.base_df.columns.difference(self.current_df.columns)) == 0):
+        base_columns = self._get_base_columns()
+        if not (len(base_columns.difference(self.current_df.columns)) == 0):
             validation_flag = False
             violations.append(
                 "Feature list/Column names of base_df and current_df are not same"
             )
-        if self.features:
-            # Validation: If 'features' param is given, it should be a list of strings
-            if not all(isinstance(n, str) for n in self.features):
-                validation_flag = False
-                violations.append(
-                    "If features param is given, it should be a list of strings"
-                )
-            # Validation: If 'features' param is given, it should be a subset of both base_df and current_df columns
-            if not (set(self.features).issubset(self.base_df.columns)) and (
-                set(self.features).issubset(self.current_df.columns)
-            ):
-                validation_flag = False
-                violations.append(
-                    "If features param is given, it should be a subset of both base_df and current_df"
-                )
+        validation_flag &= self._validate_features(base_columns, violations)
         if self.options:
             # Validation: if options are given, it should be a dictionary
             if not (type(self.options) == dict):
@@ -189,18 +198,47 @@ class BaseDrift:
             _LOGGER.info(f"Validation Flag: {validation_flag}")
         return validation_flag, violations
 
+    def _validate_base_profile(self, violations):
+        """Validate the baseline profile against the yhat, y and features inputs."""
+        if self.base_profile is None or (
+            self.base_profile.yhat == self.yhat_base
+            and self.y_base in (None, self.base_profile.yhat, self.base_profile.y)
+            and set(self.features).issubset(self.base_profile.features)
+        ):
+            return True
+        violations.append(
+            "yhat, y and features should be the ones the baseline profile was built with"
+        )
+        return False
+
+    def _validate_features(self, base_columns, violations):
+        """Validate the features input against the base and current columns."""
+        validation_flag = True
+        if self.features:
+            # Validation: If 'features' param is given, it should be a list of strings
+            if not all(isinstance(n, str) for n in self.features):
+                validation_flag = False
+                violations.append(
+                    "If features param is given, it should be a list of strings"
+                )
+            # Validation: If 'features' param is given, it should be a subset of both base_df and current_df columns
+            if not (set(self.features).issubset(base_columns)) and (
+                set(self.features).issubset(self.current_df.columns)
+            ):
+                validation_flag = False
+                violations.append(
+                    "If features param is given, it should be a subset of both base_df and current_df"
+                )
+        return validation_flag
+
     def _get_data_types(self, max_levels):
 
         # Validation: yhat_base dtype & yhat_curr dtype should be same
-        yhat_curr_type = get_data_type(
-            self.current_df[self.yhat_curr], max_levels=max_levels
-        )
+        yhat_curr_type = self._get_curr_data_type(self.yhat_curr, max_levels)
         if yhat_curr_type == "boolean":
             yhat_curr_type = "categorical"
 
-        yhat_base_type = get_data_type(
-            self.base_df[self.yhat_base], max_levels=max_levels
-        )
+        yhat_base_type = self._get_base_data_type(self.yhat_base, max_levels)
         if yhat_base_type == "boolean":
             yhat_base_type = "categorical"
             _LOGGER.info("Target is categorical")
@@ -214,14 +252,10 @@ class BaseDrift:
 
         # Validation: If y_base & y_curr are given, thier dtypes should be the same
         if self.y_base:
-            y_curr_type = get_data_type(
-                self.current_df[self.y_curr], max_levels=max_levels
-            )
+            y_curr_type = self._get_curr_data_type(self.y_curr, max_levels)
             if y_curr_type == "boolean":
                 y_curr_type = "categorical"
-            y_base_type = get_data_type(
-                self.base_df[self.y_base], max_levels=max_levels
-            )
+            y_base_type = self._get_base_data_type(self.y_base, max_levels)
             if y_base_type == "boolean":
                 y_base_type = "categorical"
                 _LOGGER.info("Actual Target is categorical")
@@ -234,15 +268,15 @@ class BaseDrift:
             # Assign after validation
             self.actual_target_type = y_base_type
 
-        base_feature_df = self.base_df[self.features]
-        curr_feature_df = self.current_df[self.features]
-        # reason for adding result_type param in apply is that .apply() changes the dtype of series to object and is causing issues in recognizing the data_type correctly
-        # https://stackoverflow.com/questions/34917404/why-does-apply-change-dtype-in-pandas-dataframe-columns
-        base_data_type = base_feature_df.apply(
-            func=get_data_type, result_type="expand", axis=0, max_levels=max_levels
+        base_data_type = pd.Series(
+            [self._get_base_data_type(x, max_levels) for x in self.features],
+            index=self.features,
+            dtype=object,
         )
-        curr_data_type = curr_feature_df.apply(
-            func=get_data_type, result_type="expand", axis=0, max_levels=max_levels
+        curr_data_type = pd.Series(
+            [self._get_curr_data_type(x, max_levels) for x in self.features],
+            index=self.features,
+            dtype=object,
         )
 
         # Validation: The dtypes of base_df features & current_df features should be same
@@ -272,7 +306,7 @@ class BaseDrift:
                     "Column Name": col,
                     "Detected dtype in Base": base_data_type.loc[col],
                     "Detected dtype in Current": curr_data_type.loc[col],
-                    "pd dtype in Base": self.base_df[col].dtype,
+                    "pd dtype in Base": self._get_base_dtype(col),
                     "pd dtype in Current": self.current_df[col].dtype,
                 }
                 mismatch_dtype_df = mismatch_dtype_df.append(row, ignore_index=True)
@@ -303,7 +337,9 @@ class BaseDrift:
     def _set_features(self):
         exclude = {self.yhat_base, self.yhat_curr, self.y_base, self.y_curr}
 
-        if self.features is None:
+        if self.features is None and self.base_profile is not None:
+            features = list(self.base_profile.features)
+        elif self.features is None:
             features = self.base_df.columns.tolist()
         else:
             features = self.features
@@ -311,6 +347,73 @@ class BaseDrift:
         _LOGGER.info("Get all the features to be used")
         return features
 
+    def _get_base_columns(self):
+        """Return the columns of the base data."""
+        if self.base_profile is not None:
+            return pd.Index(self.base_profile.columns)
+        return self.base_df.columns
+
+    def _get_base_data_type(self, column, max_levels):
+        """Return the data type of a column of the base data."""
+        data_types = self.options.get("data_types", {})
+        if column in data_types:
+            return data_types[column]
+        if self.base_profile is not None:
+            return self.base_profile.data_types[column]
+        return get_data_type(self.base_df[column], max_levels=max_levels)
+
+    def _get_curr_data_type(self, column, max_levels):
+        """Return the data type of a column of the current data."""
+        data_types = self.options.get("data_types", {})
+        if column in data_types:
+            return data_types[column]
+        return get_data_type(self.current_df[column], max_levels=max_levels)
+
+    def _get_data_types_option(self):
+        """Return the detected data type of every column, usable as ``data_types`` option."""
+        data_types = {x: "numerical" for x in self.num_features}
+        data_types.update({x: "categorical" for x in self.cat_features})
+        data_types.update({x: "boolean" for x in self.bool_features})
+        data_types[self.yhat_base] = self.target_type
+        if self.y_base:
+            data_types[self.y_base] = self.actual_target_type
+        return data_types
+
+    def _get_base_dtype(self, column):
+        """Return the pandas dtype of a column of the base data."""
+        if self.base_profile is not None:
+            return self.base_profile.dtypes[column]
+        return self.base_df[column].dtype
+
+    def _get_base_df(self, columns=None):
+        """Return the base data, or ``None`` when only its profile is available."""
+        if self.base_profile is not None:
+            return None
+        if columns is None:
+            return self.base_df
+        return self.base_df[columns]
+
+    def _get_base_desc(self, data_type):
+        """Return the descriptive stats of the base data stored in the profile."""
+        if self.base_profile is None:
+            return None
+        return self.base_profile.descriptive_stats[data_type]
+
+    def _get_base_levels(self):
+        """Return the base data, or the levels of its categorical features from the profile."""
+        if self.base_profile is None:
+            return self.base_df
+        categories = self.base_profile.drift_engine.base_counts_["categories"]
+        return {
+            feature: counts.index[counts > 0] for feature, counts in categories.items()
+        }
+
+    def _get_base_target_df(self):
+        """Return the predicted and actual target columns of the base data."""
+        if self.base_profile is not None:
+            return self.base_profile.target_data
+        return self.base_df
+
     def _get_glossary(self, glossary_path=None):
         glossary_dataframe = self.glossary_dataframe
         return glossary_dataframe
@@ -395,7 +498,10 @@ class BaseDrift:
 
         if len(self.num_features):
             num_stats = compare_num_stats(
-                self.base_df, self.current_df, features=self.num_features
+                self._get_base_df(),
+                self.current_df,
+                features=self.num_features,
+                base_desc=self._get_base_desc("numerical"),
             )
             num_stats = num_stats.set_index("variable")
             num_stats_base = num_stats.filter(regex="_base")
@@ -429,7 +535,10 @@ class BaseDrift:
         bool_summary = None
         if len(self.bool_features):
             bool_stats = compare_bool_stats(
-                self.base_df, self.current_df, features=self.bool_features
+                self._get_base_df(),
+                self.current_df,
+                features=self.bool_features,
+                base_desc=self._get_base_desc("boolean"),
             )
             bool_stats = bool_stats.set_index("variable")
             bool_stats_base = bool_stats.filter(regex="_base")
@@ -495,9 +604,31 @@ class BaseDrift:
         _LOGGER.info("Data summary for features calculated")
         return data_summary
 
+    def _get_drift_engine(self):
+        """Return the drift engine fitted on the base data and the counts of current_df."""
+        if self._drift_engine is None:
+            if self.base_profile is not None:
+                self._drift_engine = self.base_profile.drift_engine
+            else:
+                self._drift_engine = get_drift_engine(
+                    num_features=self.num_features,
+                    cat_features=self.cat_features,
+                    target=self.yhat_base,
+                    target_type=self.target_type,
+                    drift_options=self.drift_metrics,
+                ).fit(self.base_df)
+            self._current_counts = self._drift_engine.count(self.current_df)
+            _LOGGER.info("Computed the histograms of base and current data")
+        return self._drift_engine, self._current_counts
+
     def _compute_drift_metrics(self, metrics_list, feature_list, feature_type):
-        var_level = defaultdict(lambda: defaultdict(dict))
-        bin_level = defaultdict(lambda: defaultdict(dict))
+        # target, feature and concept drift at var and bin level share results
+        cache_key = (tuple(metrics_list), tuple(feature_list), feature_type)
+        if cache_key in self._drift_metrics_cache:
+            return self._drift_metrics_cache[cache_key]
+
+        var_level = defaultdict(dict)
+        bin_level = defaultdict(dict)
 
         # list of metrics which need both feature and target
         need_xy_both = ["DSI"]
@@ -506,6 +637,20 @@ class BaseDrift:
         for metric in metrics_list:
             metric_details = self.drift_metrics[metric]
             func = metric_details["func"]
+            if func is _ENGINE_FUNCS.get(metric):
+                engine, current_counts = self._get_drift_engine()
+                values, bins = engine.compute(current_counts, metric, feature_list)
+                for feature in feature_list:
+                    var_level[feature][metric.lower()] = values[feature]
+                    if bins is not None:
+                        bin_level[metric.lower()][feature] = bins[feature]
+                continue
+
+            if self.base_profile is not None:
+                raise ValueError(
+                    f"Custom function of metric {metric} needs base_df, "
+                    "it can not be computed from a BaselineProfile"
+                )
             default_params = metric_details.get("default_params", {})
             if metric in need_data_type:
                 default_params["feature_data_type"] = feature_type
@@ -540,6 +685,7 @@ class BaseDrift:
 
         var_level = concat_dfs(var_level, names=["variable"])
         metric_dict = {"var_level": var_level, "bin_level": bin_level}
+        self._drift_metrics_cache[cache_key] = metric_dict
         _LOGGER.info("Calculated drift metrics dictionary for data")
         return metric_dict
 
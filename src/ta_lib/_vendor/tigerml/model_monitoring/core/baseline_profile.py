@@ -0,0 +1,358 @@
+"""Summaries of the base data used in place of the base data in drift runs.
+
+A ``BaselineProfile`` is built once from the base (training) data and holds
+everything the drift classes read from it: the column types, the histograms
+of the drift engine (bin edges, bin counts, moments, category frequencies
+and joint counts with the target), the descriptive statistics and the
+predicted and actual target columns needed by the performance metrics.
+Profiles can be built for each segment as well.
+
+The profile is saved to a single ``.npz`` file, so a monitoring job only
+needs to read the profile and the current data.
+"""
+import json
+import logging
+import numpy as np
+import pandas as pd
+from tigerml.core.utils.segmented import calculate_all_segments
+from tigerml.model_monitoring.config.drift_options import DRIFT_OPTIONS
+from tigerml.model_monitoring.core.drift_engine import DriftEngine, get_drift_engine
+from tigerml.model_monitoring.utils.data_utils import (
+    get_bool_desc,
+    get_cat_desc,
+    get_data_type,
+    get_num_desc,
+    get_segment_indices,
+)
+from typing import Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+_META_KEY = "__meta__"
+
+# attributes saved with the profile, the segments and the engine are saved separately
+_STATE_ATTRS = [
+    "yhat",
+    "y",
+    "features",
+    "segment_by",
+    "options",
+    "columns",
+    "dtypes",
+    "data_types",
+    "num_features",
+    "cat_features",
+    "bool_features",
+    "target_type",
+    "actual_target_type",
+    "descriptive_stats",
+    "target_data",
+]
+
+
+def _object_array(values):
+    """Return a 1-d object array of ``values``, keeping tuples as elements."""
+    arr = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        arr[i] = value
+    return arr
+
+
+def _pack(obj, key, arrays):
+    """Store the arrays of ``obj`` in ``arrays`` and return a JSON spec to rebuild it."""
+    if isinstance(obj, dict):
+        arrays[f"{key}/keys"] = _object_array(list(obj))
+        return {
+            "type": "dict",
+            "values": [
+                _pack(value, f"{key}/{i}", arrays) for i, value in enumerate(obj.values())
+            ],
+        }
+    if isinstance(obj, (list, tuple)):
+        return {
+            "type": type(obj).__name__,
+            "values": [_pack(value, f"{key}/{i}", arrays) for i, value in enumerate(obj)],
+        }
+    if isinstance(obj, pd.MultiIndex):
+        return {
+            "type": "multiindex",
+            "names": _pack(list(obj.names), f"{key}/names", arrays),
+            "levels": _pack(list(obj.levels), f"{key}/levels", arrays),
+            "codes": _pack([np.asarray(x) for x in obj.codes], f"{key}/codes", arrays),
+        }
+    if isinstance(obj, pd.Index):
+        arrays[key] = np.asarray(obj)
+        return {"type": "index", "name": _pack(obj.name, f"{key}/name", arrays)}
+    if isinstance(obj, pd.Series):
+        arrays[key] = obj.to_numpy()
+        return {
+            "type": "series",
+            "name": _pack(obj.name, f"{key}/name", arrays),
+            "index": _pack(obj.index, f"{key}/index", arrays),
+        }
+    if isinstance(obj, pd.DataFrame):
+        return {
+            "type": "frame",
+            "columns": _pack(obj.columns, f"{key}/columns", arrays),
+            "index": _pack(obj.index, f"{key}/index", arrays),
+            "data": [
+                _pack(obj.iloc[:, i].to_numpy(), f"{key}/{i}", arrays)
+                for i in range(obj.shape[1])
+            ],
+        }
+    if isinstance(obj, np.ndarray):
+        arrays[key] = obj
+        return {"type": "array"}
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"type": "value", "value": obj}
+    # any other scalar is stored as an object array
+    arrays[key] = _object_array([obj])
+    return {"type": "object"}
+
+
+def _unpack(spec, key, arrays):
+    """Rebuild the object stored by ``_pack``."""
+    kind = spec["type"]
+    if kind == "dict":
+        keys = arrays[f"{key}/keys"]
+        return {
+            k: _unpack(value, f"{key}/{i}", arrays)
+            for i, (k, value) in enumerate(zip(keys, spec["values"]))
+        }
+    if kind in ("list", "tuple"):
+        values = [
+            _unpack(value, f"{key}/{i}", arrays)
+            for i, value in enumerate(spec["values"])
+        ]
+        return values if kind == "list" else tuple(values)
+    if kind == "multiindex":
+        return pd.MultiIndex(
+            levels=_unpack(spec["levels"], f"{key}/levels", arrays),
+            codes=_unpack(spec["codes"], f"{key}/codes", arrays),
+            names=_unpack(spec["names"], f"{key}/names", arrays),
+        )
+    if kind == "index":
+        return pd.Index(arrays[key], name=_unpack(spec["name"], f"{key}/name", arrays))
+    if kind == "series":
+        return pd.Series(
+            arrays[key],
+            index=_unpack(spec["index"], f"{key}/index", arrays),
+            name=_unpack(spec["name"], f"{key}/name", arrays),
+        )
+    if kind == "frame":
+        columns = _unpack(spec["columns"], f"{key}/columns", arrays)
+        data = [
+            _unpack(value, f"{key}/{i}", arrays) for i, value in enumerate(spec["data"])
+        ]
+        frame = pd.DataFrame(
+            dict(enumerate(data)),
+            index=_unpack(spec["index"], f"{key}/index", arrays),
+        )
+        frame.columns = columns
+        return frame
+    if kind == "array":
+        return arrays[key]
+    if kind == "value":
+        return spec["value"]
+    if kind == "object":
+        return arrays[key][0]
+    raise ValueError(f"Unknown type {kind} in baseline profile file")
+
+
+class BaselineProfile:
+    """
+    Profile of the base data used in place of ``base_df`` in the drift classes.
+
+    Parameters
+    ----------
+    base_df: pd.DataFrame
+        Base data / reference data
+    yhat: str
+        Predicted target column name for data
+    y:  str
+        Actual target column name for data
+    features: List[str]
+        List of features for which you want to calculate drift
+    segment_by: List[str]
+        Columns defining the segments for which profiles are also built
+    options: Dict
+        Options of the drift classes, ``max_levels`` is used to detect the
+        type of the columns and ``data_types`` to skip their detection.
+
+    Examples
+    --------
+    >>> from tigerml.model_monitoring import BaselineProfile, ModelDrift
+    >>> profile = BaselineProfile(base_df, yhat="predicted_target", y="target")
+    >>> profile.save("baseline_profile.npz")
+    >>> # later, in the monitoring job
+    >>> profile = BaselineProfile.load("baseline_profile.npz")
+    >>> drift = ModelDrift(
+    ...     base_df=profile,
+    ...     current_df=current_df,
+    ...     yhat="predicted_target",
+    ...     y="target",
+    ... )
+    """
+
+    def __init__(
+        self,
+        base_df: pd.DataFrame,
+        yhat: str,
+        y: Optional[str] = None,
+        features: Optional[List[str]] = None,
+        segment_by: Optional[List[str]] = None,
+        options: Optional[Dict] = {},
+    ):
+        if not isinstance(base_df, pd.DataFrame):
+            raise ValueError("base_df should be a pandas DataFrame")
+        targets = [yhat] if y is None else [yhat, y]
+        if features is None:
+            features = base_df.columns.tolist()
+        features = [x for x in features if x not in targets]
+        missing = set(features + targets) - set(base_df.columns)
+        if missing:
+            raise ValueError(f"Columns {sorted(missing)} are not in base_df")
+
+        self.yhat = yhat
+        self.y = y
+        self.features = features
+        self.segment_by = segment_by
+        self.options = {"max_levels": options.get("max_levels", 0.05)}
+        self.columns = base_df.columns.tolist()
+        self.dtypes = base_df.dtypes.astype(str).to_dict()
+
+        max_levels = self.options["max_levels"]
+        data_types = options.get("data_types", {})
+        self.data_types = {
+            col: data_types.get(col) or get_data_type(base_df[col], max_levels=max_levels)
+            for col in features + targets
+        }
+        self.num_features = [x for x in features if self.data_types[x] == "numerical"]
+        self.cat_features = [x for x in features if self.data_types[x] == "categorical"]
+        self.bool_features = [x for x in features if self.data_types[x] == "boolean"]
+        self.target_type = self._get_target_type(yhat)
+        self.actual_target_type = None if y is None else self._get_target_type(y)
+
+        self.drift_engine = get_drift_engine(
+            num_features=self.num_features,
+            cat_features=self.cat_features,
+            target=yhat,
+            target_type=self.target_type,
+            drift_options=DRIFT_OPTIONS,
+        ).fit(base_df)
+
+        num_cols = self.num_features + [
+            x for x in targets if self._get_target_type(x) == "numerical"
+        ]
+        cat_cols = self.cat_features + [
+            x for x in targets if self._get_target_type(x) == "categorical"
+        ]
+        self.descriptive_stats = {
+            "numerical": get_num_desc(base_df[num_cols]) if num_cols else None,
+            "categorical": get_cat_desc(base_df[cat_cols]) if cat_cols else None,
+            "boolean": (
+                get_bool_desc(base_df, self.bool_features)
+                if self.bool_features
+                else None
+            ),
+        }
+        # the performance metrics need the predictions and actuals of each row
+        self.target_data = base_df[targets].copy()
+
+        self.segments = {}
+        if segment_by:
+            # the segments share the data types detected on the full data
+            segment_options = {**options, "data_types": self.data_types}
+            indices = get_segment_indices(base_df, segment_by)
+            for segment in calculate_all_segments(base_df, segment_by):
+                segment = tuple(segment)
+                if segment not in indices:
+                    # rows with missing segment values are in no segment
+                    continue
+                self.segments[segment] = BaselineProfile(
+                    base_df.iloc[indices[segment]],
+                    yhat=yhat,
+                    y=y,
+                    features=features,
+                    options=segment_options,
+                )
+        _LOGGER.info("Created the baseline profile of the base data")
+
+    def _get_target_type(self, column):
+        target_type = self.data_types[column]
+        return "categorical" if target_type == "boolean" else target_type
+
+    def _get_state(self):
+        state = {attr: getattr(self, attr) for attr in _STATE_ATTRS}
+        engine = {
+            attr: value
+            for attr, value in vars(self.drift_engine).items()
+            if attr != "_bin_maps"
+        }
+        state["drift_engine"] = engine
+        state["segments"] = {
+            segment: profile._get_state() for segment, profile in self.segments.items()
+        }
+        return state
+
+    @classmethod
+    def _from_state(cls, state):
+        profile = cls.__new__(cls)
+        for attr in _STATE_ATTRS:
+            setattr(profile, attr, state[attr])
+        engine = DriftEngine.__new__(DriftEngine)
+        vars(engine).update(state["drift_engine"])
+        engine._bin_maps = {}
+        profile.drift_engine = engine
+        profile.segments = {
+            segment: cls._from_state(segment_state)
+            for segment, segment_state in state["segments"].items()
+        }
+        return profile
+
+    def save(self, path):
+        """
+        Save the profile to a compressed ``.npz`` file.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file, ``.npz`` is appended if missing.
+        """
+        arrays = {}
+        spec = _pack(self._get_state(), "profile", arrays)
+        meta = {"version": _FORMAT_VERSION, "spec": spec}
+        arrays[_META_KEY] = np.array(json.dumps(meta))
+        np.savez_compressed(path, **arrays)
+        _LOGGER.info(f"Saved the baseline profile to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a profile saved with ``save``.
+
+        The file stores object arrays as pickles, only load files from a
+        trusted source.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+
+        Returns
+        -------
+        BaselineProfile
+        """
+        with np.load(path, allow_pickle=True) as data:
+            arrays = {key: data[key] for key in data.files}
+        meta = json.loads(arrays.pop(_META_KEY).item())
+        if meta["version"] != _FORMAT_VERSION:
+            raise ValueError(
+                f"Baseline profile version {meta['version']} is not supported"
+            )
+        profile = cls._from_state(_unpack(meta["spec"], "profile", arrays))
+        _LOGGER.info(f"Loaded the baseline profile from {path}")
+        return profile
@@ -0,0 +1,578 @@
+"""Drift metrics derived from shared histograms of the features.
+
+The numerical features are binned once on a fine grid of quantiles of the
+base data. The grid includes the quantiles used for the PSI and DSI bins,
+so the counts of those bins are sums of the fine counts, and the KS
+statistic is evaluated on the fine bin edges. Categorical features are
+counted once per dataset. Every metric of a feature is then computed from
+the same counts instead of re-binning the raw columns for each metric.
+
+The counts of a dataset are additive, so the counts of the base data can be
+computed once and reused for every current dataset, and the counts of the
+chunks of a dataset can be merged with ``merge_counts``.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+from scipy.stats.distributions import kstwobign
+from tigerml.model_monitoring.core.metrics import _gamma_kl_divergence, _psi_calculation
+
+_LOGGER = logging.getLogger(__name__)
+
+ENGINE_METRICS = ["PSI", "DSI", "KS", "ChiSquare", "KLDivergence"]
+
+
+def _get_quantiles(n_bins_list):
+    """Return the sorted union of the quantiles splitting data in each of ``n_bins_list`` bins."""
+    return np.unique(np.concatenate([np.linspace(0, 1, n + 1) for n in n_bins_list]))
+
+
+def _get_moments(values):
+    """Return the count, mean, sum of squared deviations, min and max of ``values``."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.array([0, np.nan, np.nan, np.nan, np.nan])
+    mean = values.mean()
+    return np.array(
+        [len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max()]
+    )
+
+
+def _get_bin_labels(edges, low, high):
+    """Return the intervals of ``pd.cut`` for bin edges extended to ``low`` and ``high``."""
+    if len(edges) < 2:
+        return pd.IntervalIndex.from_breaks([low, high])
+    edges = edges.copy()
+    edges[0] = low
+    edges[-1] = high
+    return pd.cut(edges[:1], bins=edges, include_lowest=True).categories
+
+
+def _get_level_counts(codes, n_levels):
+    """Return the count of each level of ``codes``, ignoring the negative codes."""
+    return np.bincount(codes[codes >= 0], minlength=n_levels)
+
+
+def _get_joint_counts(x_codes, x_levels, y_codes, y_levels):
+    """Return the counts of each pair of levels of ``x_codes`` and ``y_codes``."""
+    valid = (x_codes >= 0) & (y_codes >= 0)
+    counts = np.bincount(
+        x_codes[valid] * len(y_levels) + y_codes[valid],
+        minlength=len(x_levels) * len(y_levels),
+    )
+    index = pd.MultiIndex.from_product(
+        [x_levels, y_levels], names=["feature_bin", "target_bin"]
+    )
+    return pd.Series(counts, index=index)
+
+
+def _merge_moments(moments_1, moments_2):
+    """Return the moments of the union of two samples from the moments of each."""
+    n_1, mean_1, m2_1, min_1, max_1 = moments_1
+    n_2, mean_2, m2_2, min_2, max_2 = moments_2
+    if not n_1:
+        return moments_2.copy()
+    if not n_2:
+        return moments_1.copy()
+    n = n_1 + n_2
+    delta = mean_2 - mean_1
+    return np.array(
+        [
+            n,
+            mean_1 + delta * n_2 / n,
+            m2_1 + m2_2 + delta ** 2 * n_1 * n_2 / n,
+            min(min_1, min_2),
+            max(max_1, max_2),
+        ]
+    )
+
+
+def _merge_level_counts(counts_1, counts_2):
+    """Return the sum of two count series indexed by level."""
+    counts = counts_1.add(counts_2, fill_value=0).astype("int64")
+    counts.name = counts_1.name
+    return counts
+
+
+def merge_counts(counts_list):
+    """
+    Merge the counts of several datasets returned by ``DriftEngine.count``.
+
+    The counts of each dataset use the bins fitted on the base data, so the
+    merged counts are the counts of the concatenated datasets.
+
+    Parameters
+    ----------
+    counts_list: List[dict]
+        Counts returned by ``DriftEngine.count`` of the same engine.
+
+    Returns
+    -------
+    dict
+    """
+    counts_list = list(counts_list)
+    if not counts_list:
+        raise ValueError("counts_list should have at least one element")
+    merged = counts_list[0]
+    for counts in counts_list[1:]:
+        merged = {
+            "n_rows": merged["n_rows"] + counts["n_rows"],
+            "bins": {
+                feature: merged["bins"][feature] + counts["bins"][feature]
+                for feature in merged["bins"]
+            },
+            "moments": {
+                feature: _merge_moments(merged["moments"][feature], value)
+                for feature, value in counts["moments"].items()
+            },
+            "categories": {
+                feature: _merge_level_counts(merged["categories"][feature], value)
+                for feature, value in counts["categories"].items()
+            },
+            "joint": {
+                feature: _merge_level_counts(merged["joint"][feature], value)
+                for feature, value in counts["joint"].items()
+            },
+        }
+    return merged
+
+
+def get_drift_engine(num_features, cat_features, target, target_type, drift_options):
+    """
+    Return an unfitted drift engine for the features and the target.
+
+    Parameters
+    ----------
+    num_features: List[str]
+        Numerical features.
+    cat_features: List[str]
+        Categorical features.
+    target: str
+        Target column, added to the numerical or categorical features.
+    target_type: str
+        Data type of the target, numerical or categorical.
+    drift_options: dict
+        Drift metrics options, the bins of the engine are the ``default_params``
+        of the PSI and DSI metrics.
+
+    Returns
+    -------
+    DriftEngine
+    """
+    num_features = list(num_features)
+    cat_features = list(cat_features)
+    if target_type == "numerical":
+        num_features.append(target)
+    else:
+        cat_features.append(target)
+    psi_params = drift_options["PSI"].get("default_params", {})
+    dsi_params = drift_options["DSI"].get("default_params", {})
+    return DriftEngine(
+        num_features=num_features,
+        cat_features=cat_features,
+        target=target,
+        target_type=target_type,
+        n_bins=psi_params.get("n_bins", 10),
+        n_feature_bins=dsi_params.get("n_feature_bins", 10),
+        n_target_bins=dsi_params.get("n_target_bins", 5),
+    )
+
+
+class DriftEngine:
+    """
+    Drift metrics of many features from shared histograms.
+
+    Parameters
+    ----------
+    num_features: List[str]
+        Numerical columns, including the target when it is numerical.
+    cat_features: List[str]
+        Categorical columns, including the target when it is categorical.
+    target: str, default=None
+        Target column used for the DSI joint counts.
+    target_type: str, default="numerical"
+        Data type of the target, numerical or categorical.
+    n_bins: int, default=7
+        Number of quantile bins of the PSI.
+    n_feature_bins: int, default=10
+        Number of quantile bins of the features in the DSI.
+    n_target_bins: int, default=5
+        Number of quantile bins of the target in the DSI.
+    n_ks_bins: int, default=200
+        Number of quantile bins on which the KS statistic is evaluated.
+
+    Examples
+    --------
+    >>> engine = DriftEngine(num_features=["x", "y"], cat_features=["c"], target="y")
+    >>> engine.fit(base_df)
+    >>> current_counts = engine.count(current_df)
+    >>> psi, psi_bins = engine.psi(current_counts, ["x", "c"])
+    """
+
+    def __init__(
+        self,
+        num_features,
+        cat_features,
+        target=None,
+        target_type="numerical",
+        n_bins=7,
+        n_feature_bins=10,
+        n_target_bins=5,
+        n_ks_bins=200,
+    ):
+        self.num_features = list(num_features)
+        self.cat_features = list(cat_features)
+        self.target = target
+        self.target_type = target_type
+        self.n_bins = n_bins
+        self.n_feature_bins = n_feature_bins
+        self.n_target_bins = n_target_bins
+        self.n_ks_bins = n_ks_bins
+
+    def fit(self, base_df):
+        """
+        Compute the bin edges and the counts of the base data.
+
+        Parameters
+        ----------
+        base_df: pd.DataFrame
+            Data used as reference distribution.
+        """
+        self.quantiles_ = _get_quantiles(
+            [self.n_bins, self.n_feature_bins, self.n_target_bins, self.n_ks_bins]
+        )
+        self.edges_ = {}
+        for feature in self.num_features:
+            values = base_df[feature].to_numpy(dtype="float64")
+            values = values[~np.isnan(values)]
+            self.edges_[feature] = np.quantile(values, self.quantiles_)
+        self._bin_maps = {}
+        self.base_counts_ = self.count(base_df)
+        _LOGGER.info("Computed the base histograms of the drift engine")
+        return self
+
+    def _get_bin_map(self, feature, n_bins):
+        """Return the bin edges for ``n_bins`` quantile bins and the bin of each fine bin."""
+        key = (feature, n_bins)
+        if key not in self._bin_maps:
+            raw_edges = self.edges_[feature]
+            fine_edges = np.unique(raw_edges)
+            pos = np.searchsorted(self.quantiles_, np.linspace(0, 1, n_bins + 1))
+            edges = np.unique(raw_edges[pos])
+            # fine bin i holds the values in (fine_edges[i - 1], fine_edges[i]],
+            # the values outside the edges belong to the first and last bins.
+            bins = np.searchsorted(edges, fine_edges, side="left") - 1
+            bins = np.clip(np.append(bins, len(edges) - 2), 0, max(len(edges) - 2, 0))
+            self._bin_maps[key] = (edges, bins)
+        return self._bin_maps[key]
+
+    def _get_fine_codes(self, feature, values):
+        """Return the fine bin of each value, -1 for missing values."""
+        fine_edges = np.unique(self.edges_[feature])
+        codes = np.searchsorted(fine_edges, values, side="left")
+        codes[np.isnan(values)] = -1
+        return codes, len(fine_edges) + 1
+
+    def _get_target_codes(self, df):
+        """Return the DSI target level of each row and the levels."""
+        if self.target_type == "numerical":
+            values = df[self.target].to_numpy(dtype="float64")
+            codes, _ = self._get_fine_codes(self.target, values)
+            edges, bins = self._get_bin_map(self.target, self.n_target_bins)
+            codes = np.where(codes >= 0, bins[codes], -1)
+            return codes, np.arange(max(len(edges) - 1, 1))
+        codes, levels = pd.factorize(df[self.target])
+        return codes, levels
+
+    def count(self, df):
+        """
+        Count the rows of ``df`` in the bins of every feature.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Data with the columns of the features.
+
+        Returns
+        -------
+        dict
+            Counts of the fine bins and moments of the numerical features,
+            value counts of the categorical features and the joint counts of
+            each feature with the target bins.
+        """
+        counts = {"n_rows": len(df), "bins": {}, "moments": {}, "categories": {}}
+        counts["joint"] = {}
+        if self.target is not None:
+            target_codes, target_levels = self._get_target_codes(df)
+
+        for feature in self.num_features:
+            values = df[feature].to_numpy(dtype="float64")
+            codes, n_codes = self._get_fine_codes(feature, values)
+            counts["bins"][feature] = _get_level_counts(codes, n_codes)
+            counts["moments"][feature] = _get_moments(values)
+            if self.target is not None and feature != self.target:
+                edges, bins = self._get_bin_map(feature, self.n_feature_bins)
+                codes = np.where(codes >= 0, bins[codes], -1)
+                counts["joint"][feature] = _get_joint_counts(
+                    codes,
+                    np.arange(max(len(edges) - 1, 1)),
+                    target_codes,
+                    target_levels,
+                )
+
+        for feature in self.cat_features:
+            counts["categories"][feature] = df[feature].value_counts(dropna=False)
+            if self.target is not None and feature != self.target:
+                codes, levels = pd.factorize(df[feature])
+                joint = _get_joint_counts(codes, levels, target_codes, target_levels)
+                counts["joint"][feature] = joint[joint > 0]
+        return counts
+
+    def _get_range(self, current_counts, feature):
+        """Return the min and max of a feature over the base and current data."""
+        base = self.base_counts_["moments"][feature]
+        current = current_counts["moments"][feature]
+        return np.nanmin([base[3], current[3]]), np.nanmax([base[4], current[4]])
+
+    def _get_bins(self, current_counts, feature, n_bins):
+        """Return the labels and the base and current counts of the bins of a feature."""
+        edges, bins = self._get_bin_map(feature, n_bins)
+        n_levels = max(len(edges) - 1, 1)
+        base = np.bincount(
+            bins, weights=self.base_counts_["bins"][feature], minlength=n_levels
+        )
+        current = np.bincount(
+            bins, weights=current_counts["bins"][feature], minlength=n_levels
+        )
+        labels = _get_bin_labels(edges, *self._get_range(current_counts, feature))
+        return labels, base.astype("int64"), current.astype("int64")
+
+    def psi(self, current_counts, features):
+        """
+        Population stability index of each feature.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        features: List[str]
+            Features for which the PSI is computed.
+
+        Returns
+        -------
+        tuple
+            Aggregated PSI of each feature and a dictionary of the bin level
+            PSI dataframes.
+        """
+        aggregated = {}
+        bin_level = {}
+        for feature in features:
+            if feature in self.edges_:
+                labels, base, current = self._get_bins(
+                    current_counts, feature, self.n_bins
+                )
+                merged = pd.DataFrame(
+                    {
+                        "bins_or_categories": labels,
+                        "count_base": base,
+                        "count_current": current,
+                    }
+                )
+            else:
+                base = self.base_counts_["categories"][feature]
+                current = current_counts["categories"][feature]
+                levels = base.index.append(current.index[~current.index.isin(base.index)])
+                merged = pd.DataFrame(
+                    {
+                        "bins_or_categories": levels,
+                        "count_base": base.reindex(levels).to_numpy(),
+                        "count_current": current.reindex(levels).to_numpy(),
+                    }
+                )
+            merged = _psi_calculation(merged)
+            aggregated[feature] = merged["psi"].sum()
+            bin_level[feature] = merged
+        return aggregated, bin_level
+
+    def dsi(self, current_counts, features):
+        """
+        Dependency stability index of each feature with the target.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        features: List[str]
+            Features for which the DSI is computed.
+
+        Returns
+        -------
+        tuple
+            Aggregated DSI of each feature and a dictionary of the bin level
+            DSI dataframes.
+        """
+        target_labels = None
+        if self.target_type == "numerical":
+            edges, _ = self._get_bin_map(self.target, self.n_target_bins)
+            target_labels = _get_bin_labels(
+                edges, *self._get_range(current_counts, self.target)
+            )
+
+        aggregated = {}
+        bin_level = {}
+        for feature in features:
+            base = self.base_counts_["joint"][feature].rename("count_base")
+            current = current_counts["joint"][feature].rename("count_current")
+            merged = pd.concat([base, current], axis=1).fillna(0)
+            if feature in self.edges_:
+                edges, _ = self._get_bin_map(feature, self.n_feature_bins)
+                labels = _get_bin_labels(
+                    edges, *self._get_range(current_counts, feature)
+                )
+                merged.index = merged.index.set_levels(
+                    labels.take(merged.index.levels[0]), level=0, verify_integrity=False
+                )
+            else:
+                merged = merged[(merged["count_base"] > 0) | (merged["count_current"] > 0)]
+            if target_labels is not None:
+                merged.index = merged.index.set_levels(
+                    target_labels.take(merged.index.levels[1]),
+                    level=1,
+                    verify_integrity=False,
+                )
+            merged = _psi_calculation(merged.reset_index())
+            merged = merged.rename(columns={"psi": "dsi"})
+            aggregated[feature] = merged["dsi"].sum()
+            bin_level[feature] = merged
+        return aggregated, bin_level
+
+    def ks(self, current_counts, features):
+        """
+        Two sample Kolmogorov-Smirnov statistic of each numerical feature.
+
+        The statistic is the largest difference of the empirical distribution
+        functions at the fine bin edges, which differs from the exact statistic
+        by at most the largest fine bin frequency. The p-value uses the
+        limiting distribution of the statistic for large samples.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        features: List[str]
+            Features for which the statistic is computed.
+
+        Returns
+        -------
+        dict
+            Dictionary with the ``stats`` and ``pvalue`` of each feature.
+        """
+        dists, n_effs = [], []
+        for feature in features:
+            base = self.base_counts_["bins"][feature]
+            current = current_counts["bins"][feature]
+            n_base, n_current = base.sum(), current.sum()
+            dists.append(
+                np.abs(
+                    np.cumsum(base)[:-1] / n_base - np.cumsum(current)[:-1] / n_current
+                ).max()
+            )
+            n_effs.append(n_base * n_current / (n_base + n_current))
+        p_vals = kstwobign.sf(np.sqrt(n_effs) * np.array(dists))
+        return {
+            feature: {"stats": dist, "pvalue": p_val}
+            for feature, dist, p_val in zip(features, dists, p_vals)
+        }
+
+    def chi_square(self, current_counts, features):
+        """
+        Chi-Squared test of the category frequencies of each categorical feature.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        features: List[str]
+            Features for which the test is computed.
+
+        Returns
+        -------
+        dict
+            Dictionary with the ``stats`` and ``pvalue`` of each feature.
+        """
+        values = {}
+        for feature in features:
+            table = pd.concat(
+                [
+                    self.base_counts_["categories"][feature],
+                    current_counts["categories"][feature],
+                ],
+                axis=1,
+            ).fillna(0)
+            table = table.to_numpy()
+            if len(table) < 2:
+                values[feature] = {"stats": 0.0, "pvalue": 1.0}
+                continue
+            dist, p_val, _, _ = chi2_contingency(table)
+            values[feature] = {"stats": dist, "pvalue": p_val}
+        return values
+
+    def kl(self, current_counts, features):
+        """
+        KL divergence between gamma distributions matching the moments of each feature.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        features: List[str]
+            Features for which the divergence is computed.
+
+        Returns
+        -------
+        dict
+            KL divergence of each feature.
+        """
+        values = {}
+        for feature in features:
+            n_1, mean_1, m2_1 = self.base_counts_["moments"][feature][:3]
+            n_2, mean_2, m2_2 = current_counts["moments"][feature][:3]
+            try:
+                values[feature] = _gamma_kl_divergence(
+                    mean_1, m2_1 / n_1, mean_2, m2_2 / n_2
+                )
+            except Exception:
+                values[feature] = 0
+        return values
+
+    def compute(self, current_counts, metric, features):
+        """
+        Compute a drift metric for ``features``.
+
+        Parameters
+        ----------
+        current_counts: dict
+            Counts of the current data returned by ``count``.
+        metric: str
+            One of ``ENGINE_METRICS``.
+        features: List[str]
+            Features for which the metric is computed.
+
+        Returns
+        -------
+        tuple
+            Value of the metric for each feature and the bin level dataframes
+            of each feature, ``None`` for metrics without bin level values.
+        """
+        if metric == "PSI":
+            return self.psi(current_counts, features)
+        if metric == "DSI":
+            return self.dsi(current_counts, features)
+        if metric == "KS":
+            return self.ks(current_counts, features), None
+        if metric == "ChiSquare":
+            return self.chi_square(current_counts, features), None
+        if metric == "KLDivergence":
+            return self.kl(current_counts, features), None
+        raise ValueError(f"Metric {metric} is not computed by the drift engine")
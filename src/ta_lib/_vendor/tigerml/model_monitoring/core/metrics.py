@@ -23,12 +23,24 @@ def _psi_calculation(df: pd.DataFrame):
     return df
 
 
-def _compute_gamma_parameters(data: pd.Series) -> float:
-    mean = np.mean(data)
-    variance = np.var(data)
-    alpha = (mean**2) / variance
-    beta = (mean) / (variance)
-    return alpha, beta
+def _gamma_kl_divergence(mean_1, var_1, mean_2, var_2):
+    """KL divergence between the gamma distributions with the given moments."""
+    p1 = 1
+    p2 = 1
+    alpha_1, beta_1 = (mean_1**2) / var_1, mean_1 / var_1
+    alpha_2, beta_2 = (mean_2**2) / var_2, mean_2 / var_2
+    theta_1 = 1 / beta_1
+    theta_2 = 1 / beta_2
+
+    a = p1 * (theta_2**alpha_2) * gamma(alpha_2 / p2)
+    b = p2 * (theta_1**alpha_1) * gamma(alpha_1 / p1)
+    c = (((digamma(alpha_1 / p1)) / p1) + np.log(theta_1)) * (alpha_1 - alpha_2)
+    d = gamma((alpha_1 + p2) / p1)
+    e = gamma((alpha_1 / p1))
+    f = (theta_1 / theta_2) ** (p2)
+    g = alpha_1 / p1
+
+    return np.log(a / b) + c + (d / e) * f - g
 
 
 def psi(base, current, feature_data_type, n_bins=10):
@@ -151,7 +163,7 @@ def chiSquare(base, current):
         Current Data for which drift needs to be calculated.
     """
     _, base_count, current_count = get_value_counts(base, current)
-    contingency_table = np.hstack((base_count, current_count))
+    contingency_table = np.nan_to_num(np.column_stack((base_count, current_count)))
     dist, p_val, _, _ = chi2_contingency(contingency_table)
     drift_dict = {"stats": dist, "pvalue": p_val}
     return drift_dict
@@ -190,23 +202,10 @@ def kl(base, current, approximation=None):
         approximation for converting random variable into probability distribution
     """
     random.seed(3)
-    p1 = 1
-    p2 = 1
     try:
-        alpha_1, beta_1 = _compute_gamma_parameters(base)
-        alpha_2, beta_2 = _compute_gamma_parameters(current)
-        theta_1 = 1 / beta_1
-        theta_2 = 1 / beta_2
-
-        a = p1 * (theta_2**alpha_2) * gamma(alpha_2 / p2)
-        b = p2 * (theta_1**alpha_1) * gamma(alpha_1 / p1)
-        c = (((digamma(alpha_1 / p1)) / p1) + np.log(theta_1)) * (alpha_1 - alpha_2)
-        d = gamma((alpha_1 + p2) / p1)
-        e = gamma((alpha_1 / p1))
-        f = (theta_1 / theta_2) ** (p2)
-        g = alpha_1 / p1
-
-        dist = np.log(a / b) + c + (d / e) * f - g
+        dist = _gamma_kl_divergence(
+            np.mean(base), np.var(base), np.mean(current), np.var(current)
+        )
     except Exception as e:
         dist = 0
     drift_dict = {"value": dist}
@@ -6,6 +6,7 @@ from sqlalchemy import DateTime, Float, Integer, String
 from tigerml.core.dataframe.dataframe import measure_time
 from tigerml.core.reports import create_report
 from tigerml.model_monitoring.base_drift import BaseDrift
+from tigerml.model_monitoring.core.baseline_profile import BaselineProfile
 from tigerml.model_monitoring.performance import Performance
 from tigerml.model_monitoring.utils.dao import db_connection, metadata
 from tigerml.model_monitoring.utils.data_utils import (
@@ -20,7 +21,7 @@ from tigerml.model_monitoring.utils.highlighting import (
     apply_table_formatter_to_dict,
     table_formatter,
 )
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,8 +35,8 @@ class ModelDrift(BaseDrift):
 
     Parameters
     ----------
-    base_df: pd.DataFrame
-        Base data / reference data
+    base_df: pd.DataFrame or BaselineProfile
+        Base data / reference data, or its profile built with ``BaselineProfile``
     current_df: pd.DataFrame
         Current data for which you want to calculate shift
     yhat: str
@@ -46,6 +47,8 @@ class ModelDrift(BaseDrift):
         List of features for which you want to calculate drift
     options: dict, default={}
         these options can control identification of categorical data.
+        ``data_types`` maps columns to "numerical", "categorical" or "boolean"
+        to skip the detection of their type.
     thresholds: dict, default=None
         user defined thresholds for drift metrics.
 
@@ -80,7 +83,7 @@ class ModelDrift(BaseDrift):
 
     def __init__(
         self,
-        base_df: pd.DataFrame,
+        base_df: Union[pd.DataFrame, BaselineProfile],
         current_df: pd.DataFrame,
         yhat: str,
         y: Optional[str] = None,
@@ -566,7 +569,7 @@ class ModelDrift(BaseDrift):
         """
         if (self.y_base is not None) and (self.y_curr is not None):
             self.performance = Performance(
-                self.base_df,
+                self._get_base_target_df(),
                 self.current_df,
                 self.yhat_base,
                 self.yhat_curr,
@@ -596,8 +599,9 @@ class ModelDrift(BaseDrift):
         else:
             summary_func = compare_num_stats
         target_summary = summary_func(
-            base_df=self.base_df[[self.yhat_base]],
+            base_df=self._get_base_df([self.yhat_base]),
             curr_df=self.current_df[[self.yhat_curr]],
+            base_desc=self._get_base_desc(self.target_type),
         )
 
         _LOGGER.info("Target Descriptive Stats calculated")
@@ -615,8 +619,9 @@ class ModelDrift(BaseDrift):
             summary_func = compare_num_stats
 
         actual_target = summary_func(
-            base_df=self.base_df[[self.y_base]],
+            base_df=self._get_base_df([self.y_base]),
             curr_df=self.current_df[[self.y_curr]],
+            base_desc=self._get_base_desc(self.actual_target_type),
         )
 
         _LOGGER.info("Target Actual Descriptive Stats calculated")
@@ -633,9 +638,10 @@ class ModelDrift(BaseDrift):
         """
         if len(self.num_features):
             num_summary = compare_num_stats(
-                base_df=self.base_df,
+                base_df=self._get_base_df(),
                 curr_df=self.current_df,
                 features=self.num_features,
+                base_desc=self._get_base_desc("numerical"),
             )
             _LOGGER.info("Numerical features descriptive stats calculated")
         else:
@@ -671,9 +677,10 @@ class ModelDrift(BaseDrift):
         """
         if len(self.cat_features):
             cat_summary = compare_cat_stats(
-                base_df=self.base_df,
+                base_df=self._get_base_df(),
                 curr_df=self.current_df,
                 features=self.cat_features,
+                base_desc=self._get_base_desc("categorical"),
             )
             _LOGGER.info("Categorical features descriptive stats calculated.")
         else:
@@ -700,9 +707,10 @@ class ModelDrift(BaseDrift):
         """Get boolean descriptive stats."""
         if len(self.bool_features):
             bool_summary = compare_bool_stats(
-                base_df=self.base_df,
+                base_df=self._get_base_df(),
                 curr_df=self.current_df,
                 features=self.bool_features,
+                base_desc=self._get_base_desc("boolean"),
             )
             _LOGGER.info("Boolean features descriptive stats calculated.")
         else:
@@ -739,7 +747,7 @@ class ModelDrift(BaseDrift):
         """
         if len(self.cat_features):
             cat_setanalysis = setanalyse_by_features(
-                base_df=self.base_df,
+                base_df=self._get_base_levels(),
                 curr_df=self.current_df,
                 features=self.cat_features,
                 diff_only=diff_only,
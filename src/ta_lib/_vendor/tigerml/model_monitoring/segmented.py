@@ -4,22 +4,32 @@ import pandas as pd
 import pdb
 import time
 from collections import defaultdict
+from joblib import Parallel, delayed
 from tigerml.core.reports import create_report
 from tigerml.core.utils import measure_time
-from tigerml.core.utils.segmented import (
-    calculate_all_segments,
-    get_segment_filter,
-)
+from tigerml.core.utils.segmented import calculate_all_segments
 from tigerml.model_monitoring.base_drift import BaseDrift
+from tigerml.model_monitoring.core.baseline_profile import BaselineProfile
 from tigerml.model_monitoring.model_drift import ModelDrift
 from tigerml.model_monitoring.plotters.plot import get_heatmap
-from tigerml.model_monitoring.utils.data_utils import concat_dfs
+from tigerml.model_monitoring.utils.data_utils import (
+    concat_dfs,
+    get_segment_indices,
+)
 from tigerml.model_monitoring.utils.highlighting import table_formatter
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _compute_drift_metrics(segment_drift):
+    """Compute the target, feature and concept drift metrics of a segment."""
+    segment_drift._compute_target_drift()
+    segment_drift._compute_feature_drift()
+    segment_drift._compute_concept_drift()
+    return segment_drift._drift_metrics_cache
+
+
 class SegmentedModelDrift(BaseDrift):
     """
     Segmented Class for creation of target, feature and concept Drift.
@@ -29,8 +39,9 @@ class SegmentedModelDrift(BaseDrift):
 
     Parameters
     ----------
-    base_df: pd.DataFarme
-        Base data / reference data
+    base_df: pd.DataFarme or BaselineProfile
+        Base data / reference data, or its profile built with ``BaselineProfile``
+        and the same ``segment_by``
     current_df: pd.DataFrame
         Current data for which you want to calculate shift
     yhat: str
@@ -41,6 +52,10 @@ class SegmentedModelDrift(BaseDrift):
         Actual target column name for data
     features: List[str]
         List of features for which you want to calculate drift
+    options: dict, default={}
+        these options can control identification of categorical data.
+    n_jobs: int, default=1
+        Number of processes computing the drift metrics of the segments.
 
     Examples
     --------
@@ -76,15 +91,17 @@ class SegmentedModelDrift(BaseDrift):
 
     def __init__(
         self,
-        base_df: pd.DataFrame,
+        base_df: Union[pd.DataFrame, BaselineProfile],
         current_df: pd.DataFrame,
         yhat: str,
         y: Optional[str] = None,
         features: Optional[List[str]] = None,
         segment_by: Optional[List[str]] = None,
         options: Optional[Dict] = {},
+        n_jobs: int = 1,
     ):
         self.segment_by = segment_by
+        self.n_jobs = n_jobs
         super().__init__(
             base_df=base_df,
             current_df=current_df,
@@ -94,6 +111,8 @@ class SegmentedModelDrift(BaseDrift):
             options=options,
         )
         self.each_segment_drift = {}
+        self._overall_drift = None
+        self._segment_metrics_computed = False
         self._initialise_segment_drift()
         _LOGGER.info("Initiated the SegmentedModelDrift Class")
 
@@ -184,19 +203,32 @@ class SegmentedModelDrift(BaseDrift):
             _LOGGER.error(e, "object not found")
         return drift_report
 
+    def _get_segment_options(self):
+        """Return the options of the segments, sharing the data types of the full data."""
+        return {**self.options, "data_types": self._get_data_types_option()}
+
     def _initialise_segment_drift(self):
-        self.all_segments = calculate_all_segments(self.base_df, self.segment_by)
-        self.all_segments = [tuple(segment) for segment in self.all_segments]
-        for each_segment in self.all_segments:
-            base_df_sub = self.base_df[
-                get_segment_filter(
-                    self.base_df, segment_by=self.segment_by, segment=each_segment
-                )
-            ]
-            current_df_sub = self.current_df[
-                get_segment_filter(
-                    self.current_df, segment_by=self.segment_by, segment=each_segment
+        if self.base_profile is not None:
+            if list(self.base_profile.segment_by or []) != list(self.segment_by or []):
+                raise ValueError(
+                    f"The baseline profile has no segments by {self.segment_by}"
                 )
+            self.all_segments = list(self.base_profile.segments)
+        else:
+            self.all_segments = calculate_all_segments(self.base_df, self.segment_by)
+            self.all_segments = [tuple(segment) for segment in self.all_segments]
+            base_indices = get_segment_indices(self.base_df, self.segment_by)
+        # split the data once instead of filtering it for each segment
+        current_indices = get_segment_indices(self.current_df, self.segment_by)
+        no_rows = np.array([], dtype="int64")
+        options = self._get_segment_options()
+        for each_segment in self.all_segments:
+            if self.base_profile is not None:
+                base_df_sub = self.base_profile.segments[each_segment]
+            else:
+                base_df_sub = self.base_df.iloc[base_indices.get(each_segment, no_rows)]
+            current_df_sub = self.current_df.iloc[
+                current_indices.get(each_segment, no_rows)
             ]
 
             self.each_segment_drift[each_segment] = ModelDrift(
@@ -205,13 +237,39 @@ class SegmentedModelDrift(BaseDrift):
                 yhat=self.yhat_base,
                 y=self.y_curr,
                 features=self.features,
-                options=self.options,
+                options=options,
             )
         _LOGGER.info(
             "Initiated the BaseModelDrift Class for each of the \
         segment and one for entire data"
         )
 
+    def _compute_segment_drift_metrics(self):
+        """Compute the drift metrics of all the segments, in parallel processes."""
+        if self._segment_metrics_computed:
+            return
+        caches = Parallel(n_jobs=self.n_jobs)(
+            delayed(_compute_drift_metrics)(self.each_segment_drift[each_segment])
+            for each_segment in self.all_segments
+        )
+        for each_segment, cache in zip(self.all_segments, caches):
+            self.each_segment_drift[each_segment]._drift_metrics_cache = cache
+        self._segment_metrics_computed = True
+        _LOGGER.info("Calculated the drift metrics of each segment")
+
+    def _get_overall_drift(self):
+        """Return the drift of the entire data."""
+        if self._overall_drift is None:
+            self._overall_drift = ModelDrift(
+                base_df=self.base_profile or self.base_df,
+                current_df=self.current_df,
+                yhat=self.yhat_base,
+                y=self.y_base,
+                features=self.features,
+                options=self._get_segment_options(),
+            )
+        return self._overall_drift
+
     def _get_drift_summary(self, summary_options=None):
         """
         Get Overall and Segmented drift summary.
@@ -232,14 +290,8 @@ class SegmentedModelDrift(BaseDrift):
 
         """
 
-        obj = ModelDrift(
-            base_df=self.base_df,
-            current_df=self.current_df,
-            yhat=self.yhat_base,
-            y=self.yhat_curr,
-            features=self.features,
-            options=self.options,
-        )
+        obj = self._get_overall_drift()
+        self._compute_segment_drift_metrics()
 
         drift_overall_summary = obj._get_drift_summary_legacy()
 
@@ -308,13 +360,7 @@ class SegmentedModelDrift(BaseDrift):
         """
 
         # data_summary = self._compute_data_summary()
-        data_summary = ModelDrift(
-            base_df=self.base_df,
-            current_df=self.current_df,
-            yhat=self.yhat_base,
-            y=self.y_base,
-            features=self.features,
-        )._compute_data_summary()
+        data_summary = self._get_overall_drift()._compute_data_summary()
 
         if data_summary["numerical_features"] is None:
             data_summary["numerical_features"] = "No Numerical Feature "
@@ -445,6 +491,7 @@ class SegmentedModelDrift(BaseDrift):
         report: dict
             Dictionary with target drift summary.
         """
+        self._compute_segment_drift_metrics()
         dict = {}
         for each_segment in self.all_segments:
             target_drift = self.each_segment_drift[each_segment]._compute_target_drift()
@@ -471,6 +518,7 @@ class SegmentedModelDrift(BaseDrift):
             Dictionary with concept drift summary differently for numerical
             features and categorical features.
         """
+        self._compute_segment_drift_metrics()
         dict_num = {}
         dict_cat = {}
         for each_segment in self.all_segments:
@@ -517,6 +565,7 @@ class SegmentedModelDrift(BaseDrift):
             Dictionary with concept drift summary differently for numerical
             features and categorical features.
         """
+        self._compute_segment_drift_metrics()
         dict_num = {}
         dict_cat = {}
         for each_segment in self.all_segments:
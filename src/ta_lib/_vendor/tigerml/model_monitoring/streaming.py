@@ -0,0 +1,297 @@
+import logging
+import pandas as pd
+from bisect import bisect_left, bisect_right, insort
+from tigerml.model_monitoring.config.drift_options import DRIFT_OPTIONS
+from tigerml.model_monitoring.core.baseline_profile import BaselineProfile
+from tigerml.model_monitoring.core.drift_engine import ENGINE_METRICS, merge_counts
+from tigerml.model_monitoring.utils.data_utils import concat_dfs
+from typing import Dict, Iterable, List, Optional, Union
+
+_LOGGER = logging.getLogger(__name__)
+
+# KL divergence is not part of the default drift options but is computed by the engine
+_KL_OPTIONS = {
+    "applicable_drift_type": ["target_drift", "feature_drift"],
+    "applicable_data_type": ["numerical"],
+}
+
+
+class StreamingDrift:
+    """
+    Drift of a current data consumed as a stream of chunks.
+
+    Every chunk is counted in the bins fitted on the base data, so only the
+    counts of the current data are kept in memory. The counts are kept per
+    ``step`` of time (or per chunk when ``time_col`` is not given) and merged
+    into windows when the drift is computed. A window is only recomputed when
+    one of its steps received new rows.
+
+    Once the latest step is a whole ``window`` after a step, the step cannot
+    be in a later window. The drift of the windows it is in is then computed
+    and kept, and its counts are dropped, so the memory used does not grow
+    with the length of the stream. Rows of a dropped step which arrive later
+    are ignored with a warning.
+
+    Parameters
+    ----------
+    base_df: pd.DataFrame or BaselineProfile
+        Base data / reference data, or its profile built with ``BaselineProfile``
+    yhat: str
+        Predicted target column name for data
+    features: List[str], default=None
+        List of features for which you want to calculate drift
+    metrics: List[str], default=None
+        Drift metrics to compute, any of "PSI", "DSI", "KS", "ChiSquare" and
+        "KLDivergence". Defaults to the metrics of the drift options.
+    time_col: str, default=None
+        Timestamp column used to assign the rows to windows. If None, the
+        chunks are the steps of the windows.
+    window: str or int, default=None
+        Length of the windows, a timedelta such as "7D" when ``time_col`` is
+        given and a number of chunks otherwise. If None, all the rows are in
+        a single window.
+    step: str or int, default=None
+        Interval between the starts of consecutive windows, which must divide
+        ``window``. Defaults to ``window``, i.e. tumbling windows; a shorter
+        step gives sliding windows.
+    options: dict, default={}
+        Options used to build the profile when base_df is a dataframe.
+
+    Examples
+    --------
+    >>> import pyarrow.parquet as pq
+    >>> from tigerml.model_monitoring import StreamingDrift
+    >>> drift = StreamingDrift(
+    ...     base_df=profile,
+    ...     yhat="predicted_target",
+    ...     time_col="scored_at",
+    ...     window="7D",
+    ...     step="1D",
+    ... )
+    >>> batches = pq.ParquetFile("scoring_logs.parquet").iter_batches()
+    >>> drift.consume(batch.to_pandas() for batch in batches)
+    >>> drift.get_drift_df()
+    """
+
+    def __init__(
+        self,
+        base_df: Union[pd.DataFrame, BaselineProfile],
+        yhat: str,
+        features: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None,
+        time_col: Optional[str] = None,
+        window: Optional[Union[str, int]] = None,
+        step: Optional[Union[str, int]] = None,
+        options: Optional[Dict] = {},
+    ):
+        if isinstance(base_df, BaselineProfile):
+            if base_df.yhat != yhat:
+                raise ValueError(
+                    f"The baseline profile was built for yhat {base_df.yhat}"
+                )
+            self.base_profile = base_df
+        else:
+            profile_features = features
+            if features is None:
+                profile_features = [x for x in base_df.columns if x != time_col]
+            self.base_profile = BaselineProfile(
+                base_df, yhat=yhat, features=profile_features, options=options
+            )
+        self.yhat = yhat
+        self.time_col = time_col
+        self.engine = self.base_profile.drift_engine
+
+        profile_features = (
+            self.base_profile.num_features + self.base_profile.cat_features
+        )
+        if features is None:
+            features = profile_features
+        missing = set(features) - set(self.base_profile.features)
+        if missing:
+            raise ValueError(f"Features {sorted(missing)} are not in the profile")
+        self.features = [x for x in features if x in profile_features]
+
+        if metrics is None:
+            metrics = [x for x in DRIFT_OPTIONS if x in ENGINE_METRICS]
+        unsupported = set(metrics) - set(ENGINE_METRICS)
+        if unsupported:
+            raise ValueError(f"Metrics {sorted(unsupported)} are not supported")
+        self.metrics = metrics
+
+        self.window, self.step = self._get_window(window, step)
+        # length of the windows in the unit of the step keys
+        if self.time_col is None and self.window is not None:
+            self._span = self.window // self.step
+        else:
+            self._span = self.window
+        # counts of the steps which can still be in a window and their sorted keys
+        self._buckets = {}
+        self._steps = []
+        self._n_chunks = 0
+        # keys of the windows to recompute and the drift of every window
+        self._stale = set()
+        self._results = {}
+        _LOGGER.info("Initiated the StreamingDrift Class")
+
+    def _get_window(self, window, step):
+        if window is None:
+            return None, None
+        if step is None:
+            step = window
+        if self.time_col is not None:
+            window, step = pd.Timedelta(window), pd.Timedelta(step)
+        if window % step:
+            raise ValueError("step should divide window")
+        return window, step
+
+    def _get_metric_features(self, metric):
+        """Return the features, including the target, for which a metric applies."""
+        options = DRIFT_OPTIONS.get(metric, _KL_OPTIONS)
+        data_types = options["applicable_data_type"]
+        drift_types = options["applicable_drift_type"]
+        features = []
+        if "target_drift" in drift_types and (
+            self.base_profile.target_type in data_types
+        ):
+            features.append(self.yhat)
+        if {"feature_drift", "concept_drift"} & set(drift_types):
+            features += [
+                x for x in self.features if self.base_profile.data_types[x] in data_types
+            ]
+        return features
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Add the rows of a chunk of the current data.
+
+        Parameters
+        ----------
+        chunk: pd.DataFrame
+            Chunk of the current data with the features, the yhat and the
+            ``time_col`` columns.
+        """
+        if self.window is None:
+            groups = [(0, chunk)]
+        elif self.time_col is None:
+            groups = [(self._n_chunks // self.step, chunk)]
+        else:
+            steps = pd.to_datetime(chunk[self.time_col]).dt.floor(self.step)
+            groups = chunk.groupby(steps)
+        for key, df in groups:
+            if self._is_dropped(key):
+                _LOGGER.warning(
+                    f"Ignored {len(df)} rows of the step {key} which was dropped"
+                )
+                continue
+            counts = self.engine.count(df)
+            if key in self._buckets:
+                counts = merge_counts([self._buckets[key], counts])
+            else:
+                insort(self._steps, key)
+            self._buckets[key] = counts
+            self._mark_stale(key)
+        self._n_chunks += 1
+        self._drop_old_steps()
+        return self
+
+    def _is_dropped(self, key):
+        """Return whether the step ``key`` is before the steps kept in memory."""
+        if self.window is None or key in self._buckets or not self._steps:
+            return False
+        return key <= self._steps[-1] - self._span
+
+    def _mark_stale(self, key):
+        """Mark the windows which the step ``key`` is in as to be recomputed."""
+        if self.window is None:
+            self._stale.add(None)
+            return
+        start = bisect_left(self._steps, key)
+        end = bisect_left(self._steps, key + self._span)
+        self._stale.update(self._steps[start:end])
+
+    def _drop_old_steps(self):
+        """Drop the steps which cannot be in a later window."""
+        if self.window is None or not self._steps:
+            return
+        n_old = bisect_right(self._steps, self._steps[-1] - self._span)
+        if not n_old:
+            return
+        # the windows ending before this key are the ones with an old step
+        self._compute_stale(until=self._steps[n_old - 1] + self._span)
+        for key in self._steps[:n_old]:
+            del self._buckets[key]
+        del self._steps[:n_old]
+
+    def consume(self, chunks: Iterable[pd.DataFrame]):
+        """
+        Add the rows of every chunk of an iterator of chunks.
+
+        Parameters
+        ----------
+        chunks: Iterable[pd.DataFrame]
+            Chunks of the current data, e.g. the batches of a parquet dataset.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        _LOGGER.info(f"Consumed {self._n_chunks} chunks of current data")
+        return self
+
+    def _get_window_keys(self, key):
+        """Return the steps in the window ending with the step ``key``."""
+        if self.window is None:
+            return list(self._buckets)
+        start = bisect_right(self._steps, key - self._span)
+        return self._steps[start : bisect_right(self._steps, key)]
+
+    def _get_window_bounds(self, key):
+        if self.window is None:
+            return None, None
+        if self.time_col is None:
+            end = (key + 1) * self.step
+            return end - self.window, end
+        return key + self.step - self.window, key + self.step
+
+    def _compute_window_drift(self, counts):
+        var_level = {}
+        for metric in self.metrics:
+            features = self._get_metric_features(metric)
+            if not features:
+                continue
+            values, _ = self.engine.compute(counts, metric, features)
+            for feature in features:
+                var_level.setdefault(feature, {})[metric.lower()] = values[feature]
+        var_level = {
+            feature: pd.json_normalize(value, sep="_")
+            for feature, value in var_level.items()
+        }
+        return concat_dfs(var_level, names=["variable"])
+
+    def _compute_stale(self, until=None):
+        """Compute the drift of the windows to recompute ending before ``until``."""
+        stale = [x for x in self._stale if until is None or x < until]
+        for key in stale:
+            counts = merge_counts([self._buckets[x] for x in self._get_window_keys(key)])
+            drift = self._compute_window_drift(counts)
+            start, end = self._get_window_bounds(key)
+            drift.insert(0, "window_start", start)
+            drift.insert(1, "window_end", end)
+            drift.insert(2, "n_rows", counts["n_rows"])
+            self._results[key] = drift
+        self._stale.difference_update(stale)
+
+    def get_drift_df(self):
+        """
+        Get the drift of every feature in every window.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per window and variable with the window bounds, the number
+            of current rows in the window and the value of each metric.
+        """
+        if not self._buckets:
+            raise ValueError("No current data consumed yet")
+        self._compute_stale()
+        keys = [None] if self.window is None else sorted(self._results)
+        _LOGGER.info("Calculated the drift of the current data windows")
+        return pd.concat([self._results[key] for key in keys], ignore_index=True)
@@ -10,7 +10,11 @@ from .data_utils import (
     flatten_dict,
     get_all_segment_dfs,
     get_all_segments,
+    get_bool_desc,
+    get_cat_desc,
     get_data_type,
+    get_num_desc,
+    get_segment_indices,
     setanalyse,
     setanalyse_by_features,
     sort,
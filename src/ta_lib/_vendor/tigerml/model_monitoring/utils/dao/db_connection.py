@@ -1,7 +1,12 @@
 import os
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+# pooled engines of get_db_conn_pool, keyed by connection string and pool size
+_ENGINE_POOLS = {}
 
 
 def get_db_engine(connection_string):
@@ -39,7 +44,40 @@ def get_db_conn_pool(connection_string, pool_size):
     -------
     conn_pool: Connection
         SQLAlchemy DB connection pool with specified pool_size.
+        The pooled engine is created once per connection string and pool
+        size, so repeated calls reuse its connections.
     """
-    engine = create_engine(connection_string, pool_size=pool_size)
-    conn_pool = engine.connect()
+    key = (connection_string, pool_size)
+    if key not in _ENGINE_POOLS:
+        _ENGINE_POOLS[key] = create_engine(connection_string, pool_size=pool_size)
+    conn_pool = _ENGINE_POOLS[key].connect()
     return conn_pool
+
+
+@contextmanager
+def begin_transaction(db_conn):
+    """
+    This function yields a DB connection inside a transaction.
+
+    The transaction is committed when the block exits without error and rolled
+    back otherwise. A connection which already is in a transaction is yielded
+    as is, leaving the commit to its owner.
+
+    Parameters
+    ----------
+    db_conn: SQLAlchemy Engine / SQLAlchemy DB Connection
+        Engine, e.g. from get_db_engine, or connection, e.g. from get_db_conn_pool.
+
+    Yields
+    ------
+    conn: Connection
+        SQLAlchemy DB connection in a transaction.
+    """
+    if isinstance(db_conn, Engine):
+        with db_conn.begin() as conn:
+            yield conn
+    elif db_conn.in_transaction():
+        yield db_conn
+    else:
+        with db_conn.begin():
+            yield db_conn
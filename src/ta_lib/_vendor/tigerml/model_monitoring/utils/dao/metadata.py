@@ -1,6 +1,6 @@
 import pandas as pd
 from datetime import datetime, timezone
-from sqlalchemy import DateTime, Integer, String, bindparam
+from sqlalchemy import DateTime, Integer, String, bindparam, inspect
 from sqlalchemy.sql import text
 from tigerml.model_monitoring.utils.dao import db_connection
 
@@ -29,6 +29,9 @@ class MetaData:
         Name of the Model for which you are performing the monitoring
     model_version: str
         Version of the model for which you are performing the monitoring
+    db_conn: SQLAlchemy Engine / SQLAlchemy DB Connection, default=None
+        Engine or connection to reuse, e.g. from get_db_conn_pool.
+        If None, an engine is created from db_conn_string.
     """
 
     def __init__(
@@ -39,9 +42,12 @@ class MetaData:
         y,
         model_name,
         model_version,
+        db_conn=None,
     ):
         # TODO: Can we make user give their own Metadata apart from model_name & model_version?
-        self.engine = db_connection.get_db_engine(connection_string=db_conn_string)
+        if db_conn is None:
+            db_conn = db_connection.get_db_engine(connection_string=db_conn_string)
+        self.engine = db_conn
         self.features = features
         self.yhat_base = yhat
         self.yhat_curr = yhat
@@ -70,37 +76,29 @@ class MetaData:
         TimeStamp: UTC timestamp
             This is the UTC timestamp of when the model_monitoring for the current model started.
         """
-        # create DB in SQLLite Server, if doesn't exist
-        # TODO: Make metadata_exists_query DB Agnostic. Rightnow it is specific to SQLite DB.
-        with self.engine.connect() as db_conn:
-            metadata_exists_query = text(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='metadata'"
-            )
-            metadata_exists = db_conn.execute(metadata_exists_query).fetchone()
-        if metadata_exists:
-            (
-                ModelExists,
-                RunID,
-                TimeStamp,
-            ) = self._generate_metadata_for_run()
-            self._add_metadata(
-                ModelExists=ModelExists,
-                RunID=RunID,
-                TimeStamp=TimeStamp,
-            )
-        else:
-            # Since metadata table is not there, we will CREATE metadata table and add the below metadata columns along with ModelInputs and ModelOutputs
-            ModelExists = False
-            RunID = 1
-            TimeStamp = datetime.now(tz=timezone.utc)
+        # the run is read and added in a single transaction on a single connection
+        with db_connection.begin_transaction(self.engine) as db_conn:
+            metadata_exists = inspect(db_conn).has_table("metadata")
+            if metadata_exists:
+                (
+                    ModelExists,
+                    RunID,
+                    TimeStamp,
+                ) = self._generate_metadata_for_run(db_conn)
+            else:
+                # Since metadata table is not there, we will CREATE metadata table and add the below metadata columns along with ModelInputs and ModelOutputs
+                ModelExists = False
+                RunID = 1
+                TimeStamp = datetime.now(tz=timezone.utc)
             self._add_metadata(
+                db_conn,
                 ModelExists=ModelExists,
                 RunID=RunID,
                 TimeStamp=TimeStamp,
             )
         return ModelExists, RunID, TimeStamp
 
-    def _add_metadata(self, ModelExists, RunID, TimeStamp):
+    def _add_metadata(self, db_conn, ModelExists, RunID, TimeStamp):
         row = {
             "ModelName": [self.model_name],
             "ModelVersion": [self.model_version],
@@ -110,7 +108,7 @@ class MetaData:
         metadata_df = pd.DataFrame(row)
         metadata_df.to_sql(
             name="metadata",
-            con=self.engine,
+            con=db_conn,
             dtype={
                 "ModelName": String(),
                 "ModelVersion": String(),
@@ -144,7 +142,7 @@ class MetaData:
             model_features_metadata_df["ModelVersion"] = self.model_version
             model_features_metadata_df.to_sql(
                 name="metadata_model_features",
-                con=self.engine,
+                con=db_conn,
                 dtype={
                     "ModelName": String(),
                     "ModelVersion": String(),
@@ -155,16 +153,14 @@ class MetaData:
                 if_exists="append",
             )
 
-    def _generate_metadata_for_run(self):
-        with self.engine.connect() as db_conn:
-            model_exists_query = text(
-                "SELECT RunID from metadata where ModelName= :ModelName AND ModelVersion= :ModelVersion ORDER BY RunID DESC"
-            )
-            model_exists_result = db_conn.execute(
-                model_exists_query,
-                ModelName=self.model_name,
-                ModelVersion=self.model_version,
-            ).fetchone()
+    def _generate_metadata_for_run(self, db_conn):
+        model_exists_query = text(
+            "SELECT RunID from metadata where ModelName= :ModelName AND ModelVersion= :ModelVersion ORDER BY RunID DESC"
+        )
+        model_exists_result = db_conn.execute(
+            model_exists_query,
+            {"ModelName": self.model_name, "ModelVersion": self.model_version},
+        ).fetchone()
 
         if model_exists_result:
             ModelExists = True
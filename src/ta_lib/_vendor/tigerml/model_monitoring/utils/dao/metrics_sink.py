@@ -0,0 +1,340 @@
+"""Long format store of the drift tables of the model monitoring runs.
+
+Every value of the drift tables of a run is stored as one row of a single
+metrics table keyed by model, version, run and feature, which is indexed on
+these columns so that the history of a model can be queried without scanning
+the other models and runs. All the tables of a run are written in a single
+transaction, so a failed run leaves no partial results behind. Every run is
+also registered in a runs table keyed by model, version and run, so two runs
+can never be written with the same run ID.
+"""
+import logging
+import pandas as pd
+from datetime import datetime, timezone
+from itertools import islice
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    Text,
+    func,
+    select,
+)
+from tigerml.model_monitoring.utils.dao.db_connection import begin_transaction
+from tigerml.model_monitoring.utils.data_utils import flatten_dict
+from typing import Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# columns holding the row keys of the drift tables, the first one found is the feature
+_FEATURE_COLUMNS = ["variable", "measures", "feature"]
+_SEGMENT_COLUMN = "segment"
+# columns holding the bins of the bin level drift tables, joined in the bin column
+_BIN_COLUMNS = ["bins_or_categories", "feature_bin", "target_bin"]
+_BIN_SEP = "|"
+_METRIC_COLUMNS = [
+    "table_name",
+    "segment",
+    "feature",
+    "bin",
+    "metric",
+    "value",
+    "value_text",
+]
+
+
+def get_metrics_table(table_name: str = "drift_metrics", metadata=None):
+    """
+    This function returns the SQLAlchemy Table of the long format drift metrics.
+
+    Parameters
+    ----------
+    table_name: str, default="drift_metrics"
+        Name of the DB table.
+    metadata: sqlalchemy.MetaData, default=None
+        MetaData the table is added to. If None, a new one is created.
+
+    Returns
+    -------
+    table: sqlalchemy.Table
+        Table with one row per model, version, run, table, segment, feature, bin
+        and metric.
+    """
+    if metadata is None:
+        metadata = MetaData()
+    return Table(
+        table_name,
+        metadata,
+        Column("model", String(255), nullable=False),
+        Column("version", String(255), nullable=False),
+        Column("run_id", Integer, nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        Column("table_name", String(255), nullable=False),
+        Column("segment", String(255)),
+        Column("feature", String(255)),
+        Column("bin", String(255)),
+        Column("metric", String(255), nullable=False),
+        Column("value", Float),
+        Column("value_text", Text),
+        Index(
+            f"ix_{table_name}_model_version_run_feature",
+            "model",
+            "version",
+            "run_id",
+            "feature",
+        ),
+    )
+
+
+def get_runs_table(table_name: str = "drift_metrics_runs", metadata=None):
+    """
+    This function returns the SQLAlchemy Table of the runs of the drift metrics.
+
+    Parameters
+    ----------
+    table_name: str, default="drift_metrics_runs"
+        Name of the DB table.
+    metadata: sqlalchemy.MetaData, default=None
+        MetaData the table is added to. If None, a new one is created.
+
+    Returns
+    -------
+    table: sqlalchemy.Table
+        Table with one row per model, version and run, its primary key.
+    """
+    if metadata is None:
+        metadata = MetaData()
+    return Table(
+        table_name,
+        metadata,
+        Column("model", String(255), nullable=False),
+        Column("version", String(255), nullable=False),
+        Column("run_id", Integer, nullable=False),
+        Column("timestamp", DateTime, nullable=False),
+        PrimaryKeyConstraint("model", "version", "run_id"),
+    )
+
+
+def _get_column_name(column):
+    if isinstance(column, tuple):
+        return "_".join(str(x) for x in column if x != "")
+    return str(column)
+
+
+def melt_drift_table(name: str, df: pd.DataFrame):
+    """
+    This function converts a drift table to the long format of the metrics table.
+
+    Parameters
+    ----------
+    name: str
+        Name of the drift table, stored in the table_name column.
+    df: pd.DataFrame
+        Drift table with a row per feature in its "variable" column (or per
+        measure in its "measures" column, or per feature and bin in its
+        "feature" column for the combined bin level tables) and, for segmented
+        drift, a "segment" column. The bins of the bin level tables are in
+        their "bins_or_categories" column, or "feature_bin" and "target_bin"
+        columns. The other columns are the metrics.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per feature, segment, bin and metric, the numeric values are in
+        the value column and the others in the value_text column. The bins are
+        stored as strings, the feature and target bins joined by "|".
+    """
+    df = df.reset_index(drop=True)
+    df.columns = [_get_column_name(x) for x in df.columns]
+    feature_col = next((x for x in _FEATURE_COLUMNS if x in df.columns), None)
+    bin_cols = [x for x in _BIN_COLUMNS if x in df.columns]
+    id_cols = [x for x in [feature_col, _SEGMENT_COLUMN] if x in df.columns]
+    long_df = df.melt(id_vars=id_cols + bin_cols, var_name="metric", value_name="raw")
+    long_df["table_name"] = name
+    long_df["feature"] = long_df[feature_col].astype(str) if feature_col else None
+    if _SEGMENT_COLUMN in id_cols:
+        long_df["segment"] = long_df[_SEGMENT_COLUMN].astype(str)
+    else:
+        long_df["segment"] = None
+    if bin_cols:
+        bins = long_df[bin_cols].astype(str)
+        long_df["bin"] = bins[bin_cols[0]].str.cat(bins[bin_cols[1:]], sep=_BIN_SEP)
+    else:
+        long_df["bin"] = None
+
+    value = pd.to_numeric(long_df["raw"], errors="coerce").astype(float)
+    is_text = value.isna() & long_df["raw"].notna()
+    long_df["value"] = value
+    long_df["value_text"] = long_df["raw"].astype(str).where(is_text, None)
+    return long_df[_METRIC_COLUMNS]
+
+
+class MetricsSink:
+    """
+    MetricsSink class is part of dao (data access object) module.
+
+    This class buffers the drift tables of a model monitoring run and writes
+    them to a long format metrics table in a single transaction.
+
+    Parameters
+    ----------
+    db_conn: SQLAlchemy Engine / SQLAlchemy DB Connection
+        Engine, e.g. from get_db_engine, or connection, e.g. from get_db_conn_pool.
+    model_name: str
+        Name of the Model for which you are performing the monitoring
+    model_version: str
+        Version of the model for which you are performing the monitoring
+    table_name: str, default="drift_metrics"
+        Name of the DB table, created if it does not exist. The runs are
+        registered in the "<table_name>_runs" table.
+    chunksize: int, default=10000
+        Number of rows per executemany call of the INSERT statement.
+
+    Examples
+    --------
+    >>> from tigerml.model_monitoring import ModelDrift
+    >>> from tigerml.model_monitoring.utils.dao.db_connection import get_db_engine
+    >>> from tigerml.model_monitoring.utils.dao.metrics_sink import MetricsSink
+    >>> drift = ModelDrift(base_df, current_df, yhat="predicted_target", y="target")
+    >>> sink = MetricsSink(
+    ...     get_db_engine("sqlite:///monitoring.db"),
+    ...     model_name="churn",
+    ...     model_version="1.0",
+    ... )
+    >>> sink.add_tables(drift.get_model_monitoring_dict())
+    >>> run_id = sink.flush()
+    """
+
+    def __init__(
+        self,
+        db_conn,
+        model_name: str,
+        model_version: str,
+        table_name: str = "drift_metrics",
+        chunksize: int = 10000,
+    ):
+        self.db_conn = db_conn
+        self.model_name = model_name
+        self.model_version = model_version
+        metadata = MetaData()
+        self.table = get_metrics_table(table_name, metadata)
+        self.runs_table = get_runs_table(f"{table_name}_runs", metadata)
+        self.chunksize = chunksize
+        self._tables = []
+
+    def add_table(self, name: str, df: pd.DataFrame):
+        """
+        Add a drift table to the run.
+
+        Parameters
+        ----------
+        name: str
+            Name of the drift table, stored in the table_name column.
+        df: pd.DataFrame
+            Drift table, see ``melt_drift_table``.
+        """
+        self._tables.append(melt_drift_table(name, df))
+        return self
+
+    def add_tables(self, tables: Dict):
+        """
+        Add every drift table of a nested dict of tables to the run.
+
+        Parameters
+        ----------
+        tables: dict
+            Nested dict of drift tables, e.g. from get_model_monitoring_dict.
+            The keys are joined with "." to name the tables and the values
+            which are not dataframes are ignored.
+        """
+        for name, df in flatten_dict(tables, key_sep=".").items():
+            if isinstance(df, pd.DataFrame) and not df.empty:
+                self.add_table(name, df)
+        return self
+
+    def _get_columns(self):
+        """Return the values of the added drift tables as a dict of column lists."""
+        if not self._tables:
+            return {col: [] for col in _METRIC_COLUMNS}
+        records_df = pd.concat(self._tables, ignore_index=True)
+        return {
+            col: records_df[col]
+            .astype(object)
+            .where(records_df[col].notna(), None)
+            .tolist()
+            for col in _METRIC_COLUMNS
+        }
+
+    def _insert(self, conn, columns):
+        """
+        Insert the rows with one executemany of the INSERT statement per chunk.
+
+        SQLAlchemy processes the values for the column types and batches the
+        rows of each chunk, e.g. into multi-row INSERTs, for the dialect.
+        """
+        keys = list(columns)
+        rows = (dict(zip(keys, row)) for row in zip(*columns.values()))
+        insert = self.table.insert()
+        for chunk in iter(lambda: list(islice(rows, self.chunksize)), []):
+            conn.execute(insert, chunk)
+
+    def flush(self, run_id: Optional[int] = None, timestamp=None):
+        """
+        Write the added drift tables to the DB in a single transaction.
+
+        Parameters
+        ----------
+        run_id: int, default=None
+            ID of the run, e.g. the RunID of MetaData().setup_metadate().
+            If None, the last run_id of the model and version plus one.
+        timestamp: datetime, default=None
+            Timestamp of the run. If None, the current UTC time.
+
+        Returns
+        -------
+        run_id: int
+            ID of the run the metrics were written for.
+
+        Raises
+        ------
+        sqlalchemy.exc.IntegrityError
+            If the run was already written, e.g. by a concurrent run which got
+            the same run_id. Nothing is written then.
+        """
+        if timestamp is None:
+            timestamp = datetime.now(tz=timezone.utc)
+        columns = self._get_columns()
+        n_rows = len(columns["metric"])
+        with begin_transaction(self.db_conn) as conn:
+            self.runs_table.create(conn, checkfirst=True)
+            self.table.create(conn, checkfirst=True)
+            if run_id is None:
+                last_run_id = conn.execute(
+                    select(func.max(self.runs_table.c.run_id)).where(
+                        self.runs_table.c.model == self.model_name,
+                        self.runs_table.c.version == self.model_version,
+                    )
+                ).scalar()
+                run_id = (last_run_id or 0) + 1
+            run_columns = {
+                "model": self.model_name,
+                "version": self.model_version,
+                "run_id": int(run_id),
+                "timestamp": timestamp,
+            }
+            # the primary key of the runs table rejects a run_id already written
+            conn.execute(self.runs_table.insert(), run_columns)
+            for col, value in run_columns.items():
+                columns[col] = [value] * n_rows
+            self._insert(conn, columns)
+        self._tables = []
+        _LOGGER.info(
+            f"Stored {n_rows} drift metrics of run {run_id} in {self.table.name}"
+        )
+        return run_id
@@ -1,9 +1,35 @@
 import numpy as np
 import pandas as pd
 
+# bound parameters per statement supported by every database, SQLite before
+# 3.32 has the lowest limit
+_MAX_BIND_PARAMS = 999
+
+
+def _get_insert_chunksize(n_columns):
+    """
+    This function returns the number of rows inserted per multi-row INSERT statement.
+
+    Parameters
+    ----------
+    n_columns: int
+        Number of columns of the inserted rows.
+
+    Returns
+    -------
+    chunksize: int
+        Largest number of rows keeping the statement within the bound parameter limit.
+    """
+    return max(1, _MAX_BIND_PARAMS // max(n_columns, 1))
+
 
 def store_df_in_db(
-    df: pd.DataFrame, db_conn, table_name: str, additional_columns: dict = {}
+    df: pd.DataFrame,
+    db_conn,
+    table_name: str,
+    additional_columns: dict = {},
+    method: str = None,
+    chunksize: int = None,
 ):
     """
     This function stores a pandas DataFrame to a Table.
@@ -23,31 +49,35 @@ def store_df_in_db(
     additional_columns: dict
         This dict should be of the format {"<<col_name: str>>":<<col_value>>}.
         Some good additional_columns to give are the model's MetaData info genrated by using MetaData().setup_metadata() func.
+    method: str, default=None
+        The to_sql insertion method. None batches the rows with the executemany of the DB driver,
+        "multi" inserts chunksize rows per INSERT statement which helps for remote DBs whose
+        driver runs executemany row by row.
+    chunksize: int, default=None
+        Number of rows inserted at a time.
+        If None, all rows at once, or with method="multi" the largest number within the bound parameter limit of the databases.
     """
     if isinstance(df, pd.DataFrame):
-        df_copy = df.copy()
-        if additional_columns != {}:
-            for k, v in additional_columns.items():
-                df_copy[k] = v
-
+        # assign copies the df along with adding the additional columns
         # This is a pandas inbuilt method to match the column with best possible dtype and convert it to that dtype
-        df_copy = df_copy.convert_dtypes()
+        df_copy = df.assign(**additional_columns).convert_dtypes()
 
         # Convert Object columns to str
         obj_cols = df_copy.select_dtypes(
             exclude=[np.datetime64, "string", "int64", "int", "float", "float64"]
         ).columns.values.tolist()
-        df_copy[obj_cols] = df_copy[obj_cols].applymap(lambda x: str(x))
-
-        # Repeat again after obj col conversion.
-        # This is a pandas inbuilt method to match the column with best possible dtype and convert it to that dtype
-        df_copy = df_copy.convert_dtypes()
+        if obj_cols:
+            df_copy[obj_cols] = df_copy[obj_cols].applymap(str).astype("string")
 
+        if method == "multi" and chunksize is None:
+            chunksize = _get_insert_chunksize(df_copy.shape[1])
         df_copy.to_sql(
             name=table_name,
             con=db_conn,
             if_exists="append",
             index=False,
+            method=method,
+            chunksize=chunksize,
         )
         return df_copy
     else:
@@ -25,12 +25,15 @@ def get_data_type(series_data, max_levels=0.05):
         max_levels = int(round(max_levels * len(series_data), 0))
     _LOGGER.info("Calculating max_levels value with respect to the current series_data")
 
-    is_boolean = series_data.dtype == "bool" or set(series_data.unique()) <= {0, 1}
+    n_levels = series_data.nunique()
+    is_boolean = series_data.dtype == "bool" or (
+        n_levels <= 2 and set(series_data.unique()) <= {0, 1}
+    )
     if is_boolean:
         _LOGGER.info("Column is of boolean type")
 
     is_categorical = (
-        series_data.dtype == "object" or series_data.nunique() <= max_levels
+        series_data.dtype == "object" or n_levels <= max_levels
     ) and (is_boolean is False)
     if is_categorical:
         _LOGGER.info("Column is of categorical type")
@@ -64,7 +67,21 @@ def sort(list):
     return sorted(numbers) + sorted(strings)
 
 
-def compare_num_stats(base_df, curr_df, features=None):
+def _select_desc(desc, features):
+    """Return the rows of the descriptive stats ``desc`` of ``features``, in order."""
+    desc = desc.set_index("variable")
+    return desc.loc[[x for x in features if x in desc.index]].reset_index()
+
+
+def get_num_desc(df):
+    """Descriptive stats of the numerical columns of ``df``, one row per column."""
+    desc = df.describe(percentiles=[0.5]).T
+    desc = desc.rename(columns={"50%": "median"})
+    desc = desc.reset_index().rename(columns={"index": "variable"})
+    return desc
+
+
+def compare_num_stats(base_df, curr_df, features=None, base_desc=None):
     """
     Fn to get numerical summary.
 
@@ -76,24 +93,23 @@ def compare_num_stats(base_df, curr_df, features=None):
         Current Data
     features: list
         List of Features
+    base_desc: pd.DataFrame, default=None
+        Precomputed ``get_num_desc`` of the base data, used instead of base_df.
 
     Return
     ------
     pd.DataFrame
     """
     if features is None:
-        base_features = base_df.columns.tolist()
+        base_features = curr_df.columns if base_df is None else base_df.columns
         curr_features = curr_df.columns.tolist()
         features = list(set(base_features).union(set(curr_features)))
 
-    def num_desc(df):
-        desc = df.describe(percentiles=[0.5]).T
-        desc = desc.rename(columns={"50%": "median"})
-        desc = desc.reset_index().rename(columns={"index": "variable"})
-        return desc
-
-    base_desc = num_desc(base_df[features])
-    curr_desc = num_desc(curr_df[features])
+    if base_desc is None:
+        base_desc = get_num_desc(base_df[features])
+    else:
+        base_desc = _select_desc(base_desc, features)
+    curr_desc = get_num_desc(curr_df[features])
 
     num_summary = pd.merge(
         base_desc, curr_desc, on="variable", suffixes=("_base", "_curr")
@@ -121,7 +137,19 @@ def compare_num_stats(base_df, curr_df, features=None):
     return num_summary
 
 
-def compare_cat_stats(base_df, curr_df, features=None):
+def get_cat_desc(df):
+    """Descriptive stats of the categorical columns of ``df``, one row per column."""
+    desc = (
+        df.astype("category")
+        .describe()
+        .T.rename(columns={"top": "mode", "freq": "mode_freq"})
+    )
+    desc["mode_freq_pct"] = desc["mode_freq"] / desc["count"]
+    desc = desc.reset_index().rename(columns={"index": "variable"})
+    return desc
+
+
+def compare_cat_stats(base_df, curr_df, features=None, base_desc=None):
     """
     Categorical Summary.
 
@@ -136,28 +164,23 @@ def compare_cat_stats(base_df, curr_df, features=None):
         Current Data
     features: list
         List of Features
+    base_desc: pd.DataFrame, default=None
+        Precomputed ``get_cat_desc`` of the base data, used instead of base_df.
 
     Return
     ------
     pd.DataFrame
     """
     if features is None:
-        base_features = base_df.columns.tolist()
+        base_features = curr_df.columns if base_df is None else base_df.columns
         curr_features = curr_df.columns.tolist()
         features = list(set(base_features).union(set(curr_features)))
 
-    def cat_desc(df):
-        desc = (
-            df.astype("category")
-            .describe()
-            .T.rename(columns={"top": "mode", "freq": "mode_freq"})
-        )
-        desc["mode_freq_pct"] = desc["mode_freq"] / desc["count"]
-        desc = desc.reset_index().rename(columns={"index": "variable"})
-        return desc
-
-    base_desc = cat_desc(base_df[features])
-    curr_desc = cat_desc(curr_df[features])
+    if base_desc is None:
+        base_desc = get_cat_desc(base_df[features])
+    else:
+        base_desc = _select_desc(base_desc, features)
+    curr_desc = get_cat_desc(curr_df[features])
 
     cat_summary = pd.merge(
         base_desc, curr_desc, on="variable", suffixes=("_base", "_curr")
@@ -183,7 +206,18 @@ def compare_cat_stats(base_df, curr_df, features=None):
     return cat_summary
 
 
-def compare_bool_stats(base_df, curr_df, features=None):
+def get_bool_desc(df, features):
+    """Descriptive stats of the boolean ``features`` of ``df``, one row per feature."""
+    desc = df[features].apply(lambda x: x.value_counts()).T
+    res = desc.div(desc.sum(axis=0), axis=1)
+    res = res.rename(columns={1: "Perc_1s", 0: "Perc_0s"})
+    desc = desc.rename(columns={1: "count_1s", 0: "count_0s"})
+    desc = pd.concat([desc, res], axis=1)
+    desc = desc.reset_index().rename(columns={"index": "variable"})
+    return desc
+
+
+def compare_bool_stats(base_df, curr_df, features=None, base_desc=None):
     """
     Boolean Summary.
 
@@ -198,6 +232,8 @@ def compare_bool_stats(base_df, curr_df, features=None):
         Current Data
     features: list
         List of Features
+    base_desc: pd.DataFrame, default=None
+        Precomputed ``get_bool_desc`` of the base data, used instead of base_df.
 
     Return
     ------
@@ -206,21 +242,15 @@ def compare_bool_stats(base_df, curr_df, features=None):
     bool_summary = None
 
     if features is None:
-        base_features = base_df.columns.tolist()
+        base_features = curr_df.columns if base_df is None else base_df.columns
         curr_features = curr_df.columns.tolist()
         features = list(set(base_features).union(set(curr_features)))
 
-    def bool_desc(df):
-        desc = df[features].apply(lambda x: x.value_counts()).T
-        res = desc.div(desc.sum(axis=0), axis=1)
-        res = res.rename(columns={1: "Perc_1s", 0: "Perc_0s"})
-        desc = desc.rename(columns={1: "count_1s", 0: "count_0s"})
-        desc = pd.concat([desc, res], axis=1)
-        desc = desc.reset_index().rename(columns={"index": "variable"})
-        return desc
-
-    base_desc = bool_desc(base_df)
-    curr_desc = bool_desc(curr_df)
+    if base_desc is None:
+        base_desc = get_bool_desc(base_df, features)
+    else:
+        base_desc = _select_desc(base_desc, features)
+    curr_desc = get_bool_desc(curr_df, features)
 
     bool_summary = pd.merge(
         base_desc, curr_desc, on="variable", suffixes=("_base", "_curr")
@@ -293,8 +323,8 @@ def setanalyse_by_features(base_df, curr_df, features=None, diff_only=False):
 
     Parameter
     ---------
-    base_df: pd.DataFrame
-        Base Data
+    base_df: pd.DataFrame or dict
+        Base Data, or a dictionary with the levels of each feature in the base data
     current_df: pd.DataFrame
         Current Data
     features: list
@@ -307,7 +337,7 @@ def setanalyse_by_features(base_df, curr_df, features=None, diff_only=False):
     pd.DataFrame
     """
     if features is None:
-        features = base_df.columns.tolist()
+        features = list(base_df)
     sa_list = []
     for col in features:
         set_analysis = setanalyse(base_df[col], curr_df[col])
@@ -356,6 +386,28 @@ def get_all_segments(df, segment_by):
     return all_segments
 
 
+def get_segment_indices(df, segment_by):
+    """
+    Get the row positions of each segment of a dataframe.
+
+    Parameter
+    ---------
+    df: pd.DataFrame
+        Data to split
+    segment_by: list
+        Columns defining the segments
+
+    Return
+    ------
+    dict
+        Row positions of each segment, keyed by the tuple of segment values
+    """
+    if len(segment_by) == 1:
+        indices = df.groupby(segment_by[0], sort=False).indices
+        return {(key,): value for key, value in indices.items()}
+    return df.groupby(segment_by, sort=False).indices
+
+
 def get_all_segment_dfs(df, segment_by, keep=False, reset_index=True):
     """Convert a dataframe to dict of dfs grouped by columns."""
     cols = df.columns.tolist()
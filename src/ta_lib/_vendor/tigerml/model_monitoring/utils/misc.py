@@ -137,8 +137,8 @@ def get_value_counts(base, current, data_type="categorical", n_bins=10, bins=Non
             base_bins = get_intervals(base, current, nbins=n_bins)
         base_cuts = pd.cut(base, bins=base_bins, include_lowest=True)
         current_cuts = pd.cut(current, bins=base_bins, include_lowest=True)
-        base_count = base_cuts.value_counts().reset_index().iloc[:, 1]
-        current_count = current_cuts.value_counts().reset_index().iloc[:, 1]
+        base_count = base_cuts.value_counts(sort=False).reset_index().iloc[:, 1]
+        current_count = current_cuts.value_counts(sort=False).reset_index().iloc[:, 1]
         bins_df = pd.DataFrame({"bins": base_cuts.cat.categories})
     else:
         df = pd.merge(
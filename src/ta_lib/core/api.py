@@ -18,7 +18,12 @@ from .constants import (
 from .context import create_context
 
 # data io api
-from .dataset import list_datasets, load_dataset, save_dataset
+from .dataset import (
+    get_dataset_uri,
+    list_datasets,
+    load_dataset,
+    save_dataset,
+)
 from .pipelines import job_planner, job_runner
 
 # job related api
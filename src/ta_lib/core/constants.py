@@ -9,3 +9,6 @@ DEFAULT_DATA_BASE_PATH = get_data_dir_path()
 DEFAULT_LOG_BASE_PATH = op.join(get_package_path(), "..", "logs")
 DEFAULT_ARTIFACTS_PATH = op.join(get_package_path(), "..", "artifacts")
 DEFAULT_MODEL_TRACKER_BASE_PATH = op.join(get_package_path(), "..", "mlruns")
+DEFAULT_TASK_CACHE_PATH = op.join(get_package_path(), "..", ".task_cache")
+DEFAULT_TASK_CACHE_MAX_SIZE_MB = 2048
+DEFAULT_TASK_CACHE_MAX_AGE_DAYS = 30
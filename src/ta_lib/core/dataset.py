@@ -6,6 +6,8 @@ import os
 import pandas as pd
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from openpyxl import load_workbook
 
 import ta_lib.core.io as io
@@ -75,8 +77,8 @@ def _get_uri_from_template(path, args):
         return path
 
 
-def load_dataset(context, key, skip=False, **kwargs):
-    """Return a dataset from the data_catalog."""
+def _get_dataset(context, key, **kwargs):
+    """Return the data_catalog entry for ``key`` with the uri resolved."""
     try:
         ds = _get_val(context.data_catalog["datasets"], key)
         ds["uri"] = _get_uri_from_template(ds["uri"], kwargs)
@@ -85,41 +87,291 @@ def load_dataset(context, key, skip=False, **kwargs):
         raise ValueError(
             f"Invalid dataset key: {key}. \n\nAvailable datasets: {avlb_keys}"
         )
+    return ds
 
-    load_params = ds.get("driver_params", {}).get("load", {})
-    fs = io.fs(context, ds["uri"], ds.get("credential_id"))
 
-    data_uri = fs.glob(ds["uri"])
-    df = utils.load_data(data_uri[0], fs=fs, **load_params)
-    cols = set(df.columns)
-    for uri_ in data_uri[1:]:
+def get_dataset_uri(context, key, **kwargs):
+    """Return the uri of a dataset in the data_catalog.
+
+    Useful for processors that read or write the files of a dataset (e.g.
+    model artifacts) with their own functions, so that they use the same
+    location as the data_catalog and the task cache.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    key : str
+        Dataset key in the data_catalog.
+
+    Returns
+    -------
+    string
+    """
+    return _get_dataset(context, key, **kwargs)["uri"]
+
+
+_FILTER_OPS = {
+    "=": lambda col, val: col == val,
+    "==": lambda col, val: col == val,
+    "!=": lambda col, val: col != val,
+    "<": lambda col, val: col < val,
+    "<=": lambda col, val: col <= val,
+    ">": lambda col, val: col > val,
+    ">=": lambda col, val: col >= val,
+    "in": lambda col, val: col.isin(val),
+    "not in": lambda col, val: ~col.isin(val),
+}
+
+
+def _to_dnf(filters):
+    """Return ``pyarrow`` style ``filters`` as a list of conjunctions.
+
+    ``filters`` is either a list of ``(column, op, value)`` tuples that are
+    combined with AND, or a list of such lists that are combined with OR.
+    """
+    if not filters:
+        return []
+    if not isinstance(filters[0], list):
+        filters = [filters]
+    return filters
+
+
+def _apply_filters(df, filters):
+    """Filter the rows of ``df`` using ``pyarrow`` style DNF ``filters``."""
+    filters = _to_dnf(filters)
+    if not filters:
+        return df
+
+    mask = pd.Series(False, index=df.index)
+    for conjunction in filters:
+        sub_mask = pd.Series(True, index=df.index)
+        for col, op, val in conjunction:
+            sub_mask &= _FILTER_OPS[op](df[col], val)
+        mask |= sub_mask
+    return df[mask]
+
+
+def _load_file(uri, fs, load_params, columns=None, filters=None):
+    load_params = dict(load_params)
+    if uri.endswith(".parquet"):
+        # push the projection and the predicates down to the parquet reader
+        if columns is not None:
+            load_params["columns"] = columns
+        if filters is not None:
+            load_params["filters"] = filters
+        return utils.load_data(uri, fs=fs, **load_params)
+
+    if columns is not None:
+        # filter columns need to be read to be able to apply the filters
+        filter_cols = [
+            col
+            for conjunction in _to_dnf(filters)
+            for col, _, _ in conjunction
+            if col not in columns
+        ]
+        filter_cols = list(dict.fromkeys(filter_cols))
+        load_params["usecols"] = list(columns) + filter_cols
+    df = utils.load_data(uri, fs=fs, **load_params)
+    if filters is not None:
+        df = _apply_filters(df, filters)
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def _iter_dataset(uris, fs, load_params, skip, columns, filters, executor=None):
+    args = (fs, load_params, columns, filters)
+    if executor is not None:
+        futures = [executor.submit(_load_file, uri_, *args) for uri_ in uris]
+        loaders = [future.result for future in futures]
+    else:
+        loaders = [partial(_load_file, uri_, *args) for uri_ in uris]
+
+    cols = None
+    for uri_, load in zip(uris, loaders):
         try:
-            temp_df = utils.load_data(uri_, fs=fs, **load_params)
-            if cols != set(temp_df.columns):
+            df = load()
+            if cols is None:
+                cols = set(df.columns)
+            elif cols != set(df.columns):
                 raise ValueError(f"{uri_} columns don't match.")
-            df = df.append(temp_df)
         except Exception as e:
             if skip:
                 warnings.warn(f"Error: {e}")
                 warnings.warn(f"skipping {uri_}")
                 continue
             raise e
-    return df
+        yield df
+
+
+def load_dataset(
+    context,
+    key,
+    skip=False,
+    columns=None,
+    filters=None,
+    lazy=False,
+    n_threads=None,
+    **kwargs,
+):
+    """Return a dataset from the data_catalog.
+
+    When the dataset uri matches multiple files, they are read concurrently
+    and concatenated into a single dataframe.
+
+    Datasets of type ``intermediate`` are folders written by ``save_dataset``
+    in a typed columnar ``format`` (``parquet`` or ``feather``). Their dtypes
+    are restored as saved and ``memory_map: True`` can be set in the load
+    ``driver_params`` to memory map local files.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    key : str
+        Dataset key in the data_catalog.
+    skip : bool, optional
+        Skip (with a warning) the files that fail to load or whose columns
+        don't match the first file, by default False
+    columns : list(str), optional
+        Subset of columns to load. Passed to the parquet reader and used as
+        ``usecols`` for csv files.
+    filters : list, optional
+        Row filters in the ``pyarrow`` DNF format, e.g.
+        ``[("year", ">=", 2020), ("claim_id", "in", [8, 9])]``. Pushed down to the
+        parquet reader and applied after reading for other formats.
+    lazy : bool, optional
+        If True, return a generator yielding one dataframe per file instead of
+        loading all of them in memory, by default False
+    n_threads : int, optional
+        Number of threads used to read the files, by default one per file
+        (capped at 32).
+    **kwargs
+        Values for the fields in the templated dataset uri.
+
+    Returns
+    -------
+    pd.DataFrame or generator(pd.DataFrame)
+    """
+    ds = _get_dataset(context, key, **kwargs)
+
+    load_params = ds.get("driver_params", {}).get("load", {})
+    fs = io.fs(context, ds["uri"], ds.get("credential_id"))
+
+    if ds.get("type") == "intermediate":
+        return utils.load_intermediate(
+            ds["uri"],
+            fs=fs,
+            format=ds.get("format", "parquet"),
+            columns=columns,
+            filters=filters,
+            lazy=lazy,
+            **load_params,
+        )
+
+    data_uri = sorted(fs.glob(ds["uri"]))
+    if not data_uri:
+        raise FileNotFoundError(f"No data found for dataset : {key}")
+
+    if lazy:
+        return _iter_dataset(data_uri, fs, load_params, skip, columns, filters)
+
+    if len(data_uri) == 1:
+        return _load_file(data_uri[0], fs, load_params, columns, filters)
+
+    # NOTE: reads are IO bound (and parsers release the GIL), so threads
+    # give a good speedup without having to pickle the dataframes.
+    n_threads = n_threads or min(32, len(data_uri))
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        dfs = list(
+            _iter_dataset(
+                data_uri, fs, load_params, skip, columns, filters, executor=executor
+            )
+        )
+    return pd.concat(dfs)
 
 
 def save_dataset(context, df, key, **kwargs):
     """Return a dataset from the data_catalog."""
+    ds = _get_dataset(context, key, **kwargs)
+    fs = io.fs(context, ds["uri"], ds.get("credential_id"))
+    save_params = ds.get("driver_params", {}).get("save", {})
+    if ds.get("type") == "intermediate":
+        return utils.save_intermediate(
+            df, ds["uri"], fs=fs, format=ds.get("format", "parquet"), **save_params
+        )
+    return utils.save_data(df, ds["uri"], fs=fs, **save_params)
+
+
+def _get_dataset_glob(context, key):
+    """Return the data_catalog entry with the uri template fields replaced by ``*``."""
     try:
         ds = _get_val(context.data_catalog["datasets"], key)
-        ds["uri"] = _get_uri_from_template(ds["uri"], kwargs)
     except KeyError:
         avlb_keys = list_datasets(context)
         raise ValueError(
             f"Invalid dataset key: {key}. \n\nAvailable datasets: {avlb_keys}"
         )
+    ds["uri"] = re.sub(r"\{[^\}]*\}", "*", ds["uri"])
+    return ds
+
+
+def list_dataset_files(context, key, **kwargs):
+    """Return the filesystem and the files currently backing a dataset.
+
+    For datasets with a templated uri, the files for all the values of the
+    template fields are returned when no ``kwargs`` are provided.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    key : str
+        Dataset key in the data_catalog.
+
+    Returns
+    -------
+    fsspec.FileSystem
+        Filesystem of the dataset uri
+    list(str)
+        Sorted list of files matching the dataset uri
+    """
+    if kwargs:
+        ds = _get_dataset(context, key, **kwargs)
+    else:
+        ds = _get_dataset_glob(context, key)
     fs = io.fs(context, ds["uri"], ds.get("credential_id"))
-    save_params = ds.get("driver_params", {}).get("save", {})
-    return utils.save_data(df, ds["uri"], fs=fs, **save_params)
+    paths = []
+    for path in fs.glob(ds["uri"]):
+        # datasets like the intermediate ones are stored as folders
+        paths.extend(fs.find(path) if fs.isdir(path) else [path])
+    return fs, sorted(paths)
+
+
+def get_dataset_fingerprint(context, key, **kwargs):
+    """Return a content based fingerprint of a dataset in the data_catalog.
+
+    The fingerprint changes whenever the contents of any of the files backing
+    the dataset change, and is independent of file timestamps.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    key : str
+        Dataset key in the data_catalog.
+
+    Returns
+    -------
+    string
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file matches the dataset uri.
+    """
+    fs, paths = list_dataset_files(context, key, **kwargs)
+    if not paths:
+        raise FileNotFoundError(f"No data found for dataset : {key}")
+    file_hashes = [(pp.basename(path), utils.hash_file(path, fs=fs)) for path in paths]
+    return utils.hash_object(file_hashes)
 
 
 def save_to_excel(df, path, sheet_name):
@@ -1,3 +1,5 @@
+import posixpath as pp
+
 from copy import deepcopy
 
 from ta_lib.core.tracking import is_tracker_supported
@@ -46,3 +48,111 @@ def create_job_plan(context, job_spec):
         job_plan["stages"].append(stage_plan)
 
     return job_plan
+
+
+def _normalize_dataset_key(key):
+    return pp.normpath(key).strip("/")
+
+
+def create_dag_plan(context, job_specs):
+    """Create a dependency-aware execution plan spanning one or more jobs.
+
+    Tasks may declare the dataset keys they read and write using the optional
+    ``inputs`` and ``outputs`` entries in the job specification. An edge is
+    added from every task producing a dataset to every task consuming it,
+    irrespective of the job or stage the tasks belong to. Tasks that do not
+    declare ``inputs`` fall back to the stage semantics of ``create_job_plan``
+    i.e. they depend on all the tasks of the preceding stage in their job.
+
+    The keys are only used to match producers with consumers, so they can
+    also name artifacts that are not part of the data catalog (e.g. models).
+
+    Parameters
+    ----------
+    context: Context
+        The project context object.
+    job_specs: list(dict)
+        List of job-specifications to be planned together.
+
+    Returns
+    -------
+    dict
+        Dictionary with the plan ``name`` and the ``tasks`` keyed by task id.
+        Each task plan has an additional ``upstream`` entry listing the ids of
+        the tasks it depends on.
+
+    Raises
+    ------
+    ValueError
+        If a dataset is produced by more than one task or the declared
+        dependencies have a cycle.
+    """
+    if isinstance(job_specs, dict):
+        job_specs = [job_specs]
+
+    tasks = {}
+    producers = {}
+    for job_spec in job_specs:
+        job_plan = create_job_plan(context, job_spec)
+        prev_stage_ids = []
+        for stage_plan in job_plan["stages"]:
+            stage_ids = []
+            for task_plan in stage_plan["tasks"]:
+                task_params = task_plan["params"]
+                task_id = task_params["id"]
+                inputs = task_params.get("inputs")
+                if inputs is None:
+                    task_plan["upstream"] = list(prev_stage_ids)
+                    task_plan["inputs"] = []
+                else:
+                    task_plan["upstream"] = []
+                    task_plan["inputs"] = [_normalize_dataset_key(k) for k in inputs]
+                task_plan["outputs"] = [
+                    _normalize_dataset_key(k) for k in task_params.get("outputs", [])
+                ]
+                for key in task_plan["outputs"]:
+                    if key in producers:
+                        raise ValueError(
+                            f"Dataset {key} is produced by more than one task : "
+                            f"{tasks[producers[key]]['name']}, {task_plan['name']}"
+                        )
+                    producers[key] = task_id
+                tasks[task_id] = task_plan
+                stage_ids.append(task_id)
+            prev_stage_ids = stage_ids
+
+    # infer the edges from the declared datasets. Inputs without a producer
+    # in the plan are expected to be available before the run.
+    for task_id, task_plan in tasks.items():
+        for key in task_plan["inputs"]:
+            upstream_id = producers.get(key)
+            if upstream_id is not None and upstream_id != task_id:
+                if upstream_id not in task_plan["upstream"]:
+                    task_plan["upstream"].append(upstream_id)
+
+    _validate_acyclic(tasks)
+
+    name = ",".join(job_spec["name"] for job_spec in job_specs)
+    return {"name": name, "tasks": tasks}
+
+
+def _validate_acyclic(tasks):
+    n_pending = {task_id: len(task["upstream"]) for task_id, task in tasks.items()}
+    downstream = {task_id: [] for task_id in tasks}
+    for task_id, task in tasks.items():
+        for upstream_id in task["upstream"]:
+            downstream[upstream_id].append(task_id)
+
+    ready = [task_id for task_id, n in n_pending.items() if n == 0]
+    n_visited = 0
+    while ready:
+        task_id = ready.pop()
+        n_visited += 1
+        for child_id in downstream[task_id]:
+            n_pending[child_id] -= 1
+            if n_pending[child_id] == 0:
+                ready.append(child_id)
+
+    if n_visited != len(tasks):
+        cyclic = [tasks[t]["name"] for t, n in n_pending.items() if n > 0]
+        raise ValueError(f"Tasks with cyclic or unresolved dependencies : {cyclic}")
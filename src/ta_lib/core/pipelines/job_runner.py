@@ -8,6 +8,11 @@ We will not support any recursive defn here, i.e. a task cannot have another
 stage in it. If you need more control over DAG structure, use a tool like
 ``Dask`` or ``Airflow``
 
+Alternatively, a plan created by ``job_planner.create_dag_plan`` can be run
+with ``dag_executor``. Such a plan has no stages. Every task lists the tasks
+it depends on and is submitted to the worker pool as soon as all of them
+complete successfully, irrespective of the job it belongs to.
+
 We shall assume each pipeline module will provide a function to create a
 plan (``create_job_plan``) and a ``task_runner`` function to execute tasks.
 
@@ -15,13 +20,19 @@ The data structures are as follows:
     * A ``Job Plan`` is simply a list of stages.
     * A ``Stage`` is a list of tasks.
     * A ``Task`` is a dictionary with information reqd. for the task.
+    * A ``DAG Plan`` is a dictionary of tasks keyed by task id, each with an
+      additional ``upstream`` list of task ids.
 """
 import logging
 from collections import namedtuple
-from joblib import Parallel, delayed, parallel_backend
+from concurrent.futures import FIRST_COMPLETED, wait
+from joblib import Parallel, cpu_count, delayed, parallel_backend
+from joblib.externals.loky import get_reusable_executor
 
 from ta_lib.core.tracking import is_tracker_supported
 
+from .task_runner import TaskStatus
+
 logger = logging.getLogger(__name__)
 
 # Helper cls to return job status
@@ -59,7 +70,7 @@ def _with_worker_initialization(self, custom_init_fn):
 
 def _safe_runner(func, *args, **kwargs):
     try:
-        func(*args, **kwargs)
+        return func(*args, **kwargs)
     except BaseException:
         # FIXME: use logger depending on whether local/subprocess is used
         # NOTE: This should not happen in a normal run.
@@ -123,6 +134,145 @@ def parallel_executor(
                     print(results)
 
 
+def _get_task_params(context, task, with_context=False):
+    params = task["params"]
+    params["job_name"] = task["job_name"]
+    if with_context:
+        params["context"] = context
+    if is_tracker_supported(context):
+        if "__tracker_run_id" in task:
+            params["__tracker_run_id"] = task["__tracker_run_id"]
+        params["__tracker_experiment_name"] = task["__tracker_experiment_name"]
+    return params
+
+
+def _is_success(out):
+    return out is not None and out.status == "Success"
+
+
+def _get_ready_tasks(tasks, done, submitted):
+    ready = []
+    for task_id, task in tasks.items():
+        if task_id in done or task_id in submitted:
+            continue
+        if all(upstream_id in done for upstream_id in task["upstream"]):
+            ready.append(task_id)
+    return ready
+
+
+def _get_downstream_tasks(tasks, task_id):
+    """Return ids of all the tasks that transitively depend on ``task_id``."""
+    downstream = set()
+    frontier = [task_id]
+    while frontier:
+        current = frontier.pop()
+        for child_id, task in tasks.items():
+            if current in task["upstream"] and child_id not in downstream:
+                downstream.add(child_id)
+                frontier.append(child_id)
+    return downstream
+
+
+def _record_result(tasks, statuses, done, submitted, task_id, out):
+    """Record the outcome of a task, skipping its downstream tasks on failure."""
+    logger.info(out)
+    if _is_success(out):
+        statuses[task_id] = out
+        done.add(task_id)
+        return
+    statuses[task_id] = out if out is not None else TaskStatus("Fail", "")
+    for child_id in _get_downstream_tasks(tasks, task_id):
+        if child_id not in statuses:
+            msg = f'Skipped task : {tasks[child_id]["name"]} : upstream failure'
+            logger.warning(msg)
+            statuses[child_id] = TaskStatus("Skipped", msg)
+            submitted.add(child_id)
+
+
+def _run_dag_sequential(context, tasks, statuses, done, submitted):
+    """Run the tasks of a DAG plan one at a time in the current process."""
+    ready = _get_ready_tasks(tasks, done, submitted)
+    while ready:
+        for task_id in ready:
+            task = tasks[task_id]
+            submitted.add(task_id)
+            logger.info(f'Running task : {task["name"]} : {task_id}')
+            params = _get_task_params(context, task, with_context=True)
+            out = _safe_runner(task["runner"], params)
+            _record_result(tasks, statuses, done, submitted, task_id, out)
+        ready = _get_ready_tasks(tasks, done, submitted)
+
+
+def _submit_ready_tasks(context, executor, tasks, done, submitted, futures):
+    """Submit the tasks whose upstream tasks completed to the worker pool."""
+    for task_id in _get_ready_tasks(tasks, done, submitted):
+        task = tasks[task_id]
+        logger.info(f'Running task : {task["name"]} : {task_id}')
+        params = _get_task_params(context, task)
+        futures[executor.submit(_safe_runner, task["runner"], params)] = task_id
+        submitted.add(task_id)
+
+
+def dag_executor(context, dag_plan, init_fn=None, n_workers=-1):
+    """Execute a DAG plan, starting each task as soon as its upstream tasks complete.
+
+    Tasks are submitted to a pool of ``n_workers`` processes. Whenever a task
+    finishes, the tasks whose dependencies are now satisfied are submitted
+    right away instead of waiting for the rest of the stage. Tasks depending
+    on a failed task (directly or transitively) are skipped.
+
+    Parameters
+    ----------
+    context: Context
+        The project context object.
+    dag_plan: dict
+        Plan created using ``job_planner.create_dag_plan``.
+    init_fn: callable, optional
+        Function to run on each worker process before executing tasks.
+    n_workers: int, optional
+        Number of worker processes. ``-1`` uses all the available cpus and
+        ``1`` runs the tasks in the current process.
+
+    Returns
+    -------
+    dict
+        ``TaskStatus`` of every task keyed by the task id.
+    """
+    tasks = dag_plan["tasks"]
+    statuses = {}
+    done = set()
+    submitted = set()
+
+    if n_workers == 1:
+        if init_fn is not None:
+            raise RuntimeError(
+                "Initialization function is not expected for" " Sequential Executor"
+            )
+        _run_dag_sequential(context, tasks, statuses, done, submitted)
+        return statuses
+
+    n_workers = cpu_count() if n_workers < 0 else n_workers
+    executor = get_reusable_executor(max_workers=n_workers, initializer=init_fn)
+    futures = {}
+    _submit_ready_tasks(context, executor, tasks, done, submitted, futures)
+    while futures:
+        completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in completed:
+            task_id = futures.pop(future)
+            _record_result(tasks, statuses, done, submitted, task_id, future.result())
+        _submit_ready_tasks(context, executor, tasks, done, submitted, futures)
+
+    return statuses
+
+
+def execute_dag_plan(context, dag_plan, init_fn=None, n_workers=1):
+    statuses = dag_executor(context, dag_plan, init_fn=init_fn, n_workers=n_workers)
+    n_failed = sum(1 for out in statuses.values() if not _is_success(out))
+    if n_failed:
+        logger.warning(f'{n_failed} task(s) did not complete : {dag_plan["name"]}')
+    return statuses
+
+
 def execute_job_plan(
     context, job_plan, init_fn=None, n_workers=1, n_threads_per_worker=-1
 ):
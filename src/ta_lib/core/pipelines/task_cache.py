@@ -0,0 +1,270 @@
+"""Content addressed cache for the outputs of pipeline tasks.
+
+A task is cacheable when its specification declares the datasets it reads
+(``inputs``) and writes (``outputs``). The cache key of a task is a hash of
+the task parameters, the source code of its processor, of its module and of
+the modules it imports from the same folder, and the content fingerprints of
+its input datasets. When a task with the same key has completed before, the
+files of its output datasets are restored from the cache instead of running
+the processor again.
+
+Each cache entry is a folder named after the cache key holding a copy of the
+output files and a ``manifest.yml`` recording where they are to be restored.
+Entries older than ``task_cache_max_age_days`` are evicted and the least
+recently used entries are evicted once the cache grows beyond
+``task_cache_max_size_mb``. Both the settings and the cache location
+(``task_cache_path``) are read from the ``core`` section of the project config.
+"""
+import posixpath as pp
+
+import inspect
+import logging
+import os
+import os.path as op
+import shutil
+import time
+from uuid import uuid4
+
+from ta_lib.core import constants
+from ta_lib.core.dataset import (
+    _get_dataset_glob,
+    get_dataset_fingerprint,
+    list_dataset_files,
+)
+from ta_lib.core.utils import create_yml, hash_object, load_yml
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_FILE = "manifest.yml"
+_GLOB_CHARS = "*?["
+
+
+def _get_cache_setting(context, name):
+    val = context.config["core"].get(name)
+    if val is None:
+        val = getattr(constants, f"DEFAULT_{name.upper()}")
+    return val
+
+
+def get_cache_dir(context):
+    """Return the folder used to store the task cache."""
+    return op.abspath(_get_cache_setting(context, "task_cache_path"))
+
+
+def is_cacheable(task_spec):
+    """Return ``True`` if the outputs of the task can be cached."""
+    if not task_spec.get("use_cache", True):
+        return False
+    return ("inputs" in task_spec) and bool(task_spec.get("outputs"))
+
+
+def _get_source_files(processor):
+    """Return the source files the processor depends on.
+
+    These are the file defining the processor and, transitively, the modules
+    it imports from the same folder (e.g. a ``feature_engineering`` module
+    next to ``training``). Installed packages are not included. The processor
+    module is found from the processor globals since the processor files are
+    loaded with ``import_python_file`` and not registered in ``sys.modules``.
+    """
+    path = inspect.getsourcefile(processor)
+    if path is None:
+        return []
+    path = op.abspath(path)
+    folder = op.dirname(path)
+    files = {path}
+    frontier = [processor.__globals__]
+    while frontier:
+        namespace = frontier.pop()
+        for value in list(namespace.values()):
+            dep = value if inspect.ismodule(value) else inspect.getmodule(value)
+            dep_file = getattr(dep, "__file__", None)
+            if dep_file is None:
+                continue
+            dep_file = op.abspath(dep_file)
+            if dep_file in files or op.dirname(dep_file) != folder:
+                continue
+            files.add(dep_file)
+            frontier.append(vars(dep))
+    return sorted(files)
+
+
+def _read_source(path):
+    with open(path, encoding="utf-8") as fp:
+        return fp.read()
+
+
+def get_cache_key(context, task_spec, processor):
+    """Return the cache key of a task.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    task_spec : dict
+        Task specification as passed to ``run_task``.
+    processor : callable
+        The processor function registered for the task.
+
+    Returns
+    -------
+    string
+    """
+    fingerprints = {
+        key: get_dataset_fingerprint(context, key) for key in task_spec["inputs"]
+    }
+    key_info = {
+        "job_name": task_spec["job_name"],
+        "task_name": task_spec["name"],
+        "params": task_spec["params"],
+        "source": inspect.getsource(processor),
+        # edits to the helpers called by the processor must change the key too
+        "module_sources": {
+            op.basename(path): _read_source(path)
+            for path in _get_source_files(processor)
+        },
+        "inputs": fingerprints,
+    }
+    return hash_object(key_info)
+
+
+def _get_base_dir(uri):
+    """Return the folder containing all the files matching the ``uri``."""
+    idx = min([uri.find(c) for c in _GLOB_CHARS if c in uri] or [len(uri)])
+    if idx == len(uri):
+        return pp.dirname(uri)
+    return pp.dirname(uri[:idx])
+
+
+def _get_dataset_files(context, key):
+    """Return the filesystem, base folder and files of a dataset."""
+    ds = _get_dataset_glob(context, key)
+    fs, paths = list_dataset_files(context, key)
+    return fs, _get_base_dir(fs._strip_protocol(ds["uri"])), paths
+
+
+def save_to_cache(context, cache_key, outputs):
+    """Copy the files of the ``outputs`` datasets into the cache.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    cache_key : str
+        Key returned by ``get_cache_key``.
+    outputs : list(str)
+        Dataset keys written by the task.
+    """
+    cache_dir = get_cache_dir(context)
+    entry_dir = op.join(cache_dir, cache_key)
+    if op.exists(entry_dir):
+        return
+
+    # write to a temporary folder first so that a partially written entry
+    # is never picked up by a concurrently running task.
+    tmp_dir = op.join(cache_dir, f".tmp-{uuid4()}")
+    os.makedirs(tmp_dir)
+    manifest = {"created_at": time.time(), "datasets": {}}
+    try:
+        for key in outputs:
+            fs, base_dir, paths = _get_dataset_files(context, key)
+            if not paths:
+                raise FileNotFoundError(f"No data found for dataset : {key}")
+            files = []
+            for path in paths:
+                fname = f"{len(manifest['datasets'])}-{len(files)}"
+                fs.get_file(path, op.join(tmp_dir, fname))
+                files.append({"file": fname, "rel_path": pp.relpath(path, base_dir)})
+            manifest["datasets"][key] = files
+        create_yml(op.join(tmp_dir, _MANIFEST_FILE), manifest)
+        os.replace(tmp_dir, entry_dir)
+    except (OSError, ValueError):
+        # another worker populated the same entry or the outputs were not
+        # found. Either way the run itself is not affected.
+        logger.warning(f"Unable to cache task outputs : {cache_key}", exc_info=True)
+    finally:
+        if op.exists(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def restore_from_cache(context, cache_key):
+    """Restore the output datasets of a task from the cache.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    cache_key : str
+        Key returned by ``get_cache_key``.
+
+    Returns
+    -------
+    bool
+        ``True`` if the outputs were restored, ``False`` on a cache miss.
+    """
+    entry_dir = op.join(get_cache_dir(context), cache_key)
+    manifest_path = op.join(entry_dir, _MANIFEST_FILE)
+    if not op.exists(manifest_path):
+        return False
+
+    manifest = load_yml(manifest_path)
+    try:
+        for key, files in manifest["datasets"].items():
+            fs, base_dir, _ = _get_dataset_files(context, key)
+            for item in files:
+                path = pp.join(base_dir, item["rel_path"])
+                if "file" in fs.protocol:
+                    fs.makedirs(pp.dirname(path), exist_ok=True)
+                fs.put_file(op.join(entry_dir, item["file"]), path)
+    except (OSError, ValueError):
+        # e.g. the entry was evicted by another worker while restoring
+        logger.warning(f"Unable to restore task outputs : {cache_key}", exc_info=True)
+        return False
+
+    # the modification time of the manifest tracks the last use of the entry
+    os.utime(manifest_path)
+    return True
+
+
+def evict_cache(context, max_size_mb=None, max_age_days=None):
+    """Remove stale entries from the task cache.
+
+    Parameters
+    ----------
+    context : ta_lib.core.context.Context
+    max_size_mb : float, optional
+        Maximum size of the cache. Least recently used entries are removed
+        until the cache fits. Defaults to ``task_cache_max_size_mb``.
+    max_age_days : float, optional
+        Entries created before this many days are removed.
+        Defaults to ``task_cache_max_age_days``.
+    """
+    if max_size_mb is None:
+        max_size_mb = _get_cache_setting(context, "task_cache_max_size_mb")
+    if max_age_days is None:
+        max_age_days = _get_cache_setting(context, "task_cache_max_age_days")
+
+    cache_dir = get_cache_dir(context)
+    if not op.exists(cache_dir):
+        return
+
+    now = time.time()
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_dir = op.join(cache_dir, name)
+        manifest_path = op.join(entry_dir, _MANIFEST_FILE)
+        if not op.exists(manifest_path):
+            continue
+        created_at = load_yml(manifest_path)["created_at"]
+        if (now - created_at) > max_age_days * 86400:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            continue
+        size = sum(
+            op.getsize(op.join(entry_dir, fname)) for fname in os.listdir(entry_dir)
+        )
+        entries.append((op.getmtime(manifest_path), size, entry_dir))
+
+    total_size = sum(size for _, size, _ in entries)
+    max_size = max_size_mb * 2**20
+    for _, size, entry_dir in sorted(entries):
+        if total_size <= max_size:
+            break
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total_size -= size
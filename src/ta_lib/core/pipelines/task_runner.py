@@ -8,6 +8,13 @@ from ta_lib.core.tracking import start_experiment, tracker
 
 from .exceptions import PipelineError
 from .processors import get_job_processors
+from .task_cache import (
+    evict_cache,
+    get_cache_key,
+    is_cacheable,
+    restore_from_cache,
+    save_to_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +42,11 @@ def run_task(task_spec):
     This function should be able to run in a different process than the main
     application. ``task_spec`` should have all the information required to
     initialize context and complete the task.
+
+    When the task declares its ``inputs`` and ``outputs`` datasets, the outputs
+    are cached and restored on subsequent runs with identical parameters,
+    processor code and input data. Set ``use_cache`` to ``False`` in the
+    ``task_spec`` to always run the processor.
     """
     # create the context object, and initialize
     if "context" in task_spec:
@@ -65,6 +77,25 @@ def run_task(task_spec):
             f"Must be one of {job_processors.keys()}"
         )
 
+    cache_key = None
+    if is_cacheable(task_spec):
+        try:
+            cache_key = get_cache_key(context, task_spec, processor)
+        except (ValueError, OSError):
+            logger.warning(
+                f"Unable to compute the cache key, running without cache : {task_id}",
+                exc_info=True,
+            )
+        else:
+            if restore_from_cache(context, cache_key):
+                t1 = time.time()
+                msg = (
+                    f"Restored outputs from cache for task : {task_id} : "
+                    f"{t1-t0} seconds"
+                )
+                logger.info(msg)
+                return TaskStatus("Success", msg)
+
     try:
         # execute the task
         processor(context, task_params)
@@ -78,6 +109,9 @@ def run_task(task_spec):
         logger.exception(msg)
         return TaskStatus("Fail", msg)
     else:
+        if cache_key is not None:
+            save_to_cache(context, cache_key, task_spec["outputs"])
+            evict_cache(context)
         t1 = time.time()
         msg = f"Successfully completed task : {task_id} : {t1-t0} seconds"
         logger.info(msg)
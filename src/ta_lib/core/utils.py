@@ -467,6 +467,167 @@ def save_data(data, path, *, fs=None, **kwargs):
         raise NotImplementedError()
 
 
+_INTERMEDIATE_SCHEMA_FILE = "_schema.arrow"
+_PARTITION_COLS_KEY = b"ta_lib.partition_cols"
+
+
+def save_intermediate(df, path, *, fs=None, format="parquet", index=False, **kwargs):
+    """Save a dataframe as a typed, columnar dataset in the folder ``path``.
+
+    The data is written as ``parquet`` or ``feather`` (arrow IPC) files along
+    with the arrow schema of the dataframe. Unlike csv files, dtypes like
+    ``datetime`` and ``category`` are preserved when the data is loaded back
+    using ``load_intermediate``. Any existing data in ``path`` is replaced.
+    The categories of categorical partition columns are not stored, these
+    are loaded back as categoricals of the values found in the data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or pd.Series
+    path : string
+        Absolute or relative folder path, URL (may include protocols like
+        ``s3://``).
+    fs : fsspec.filesystem, optional
+        Filesystem of the url, by default ``None``
+    format : str, optional
+        One of ``parquet`` or ``feather``, by default ``parquet``
+    index : bool, optional
+        Whether to save the index of the dataframe, by default False
+    partition_cols : list(str), optional
+        Columns used to partition the data into sub-folders.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+
+    fs = fs or fsspec.filesystem("file")
+    if isinstance(df, pd.Series):
+        df = pd.DataFrame(df)
+
+    partition_cols = kwargs.pop("partition_cols", None) or []
+    table = pa.Table.from_pandas(df, preserve_index=index)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_PARTITION_COLS_KEY] = ",".join(partition_cols).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    if fs.exists(path):
+        fs.rm(path, recursive=True)
+    fs.makedirs(path, exist_ok=True)
+    pads.write_dataset(
+        table,
+        path,
+        format=format,
+        filesystem=fs,
+        partitioning=partition_cols or None,
+        partitioning_flavor="hive" if partition_cols else None,
+        existing_data_behavior="overwrite_or_ignore",
+        **kwargs,
+    )
+    with fs.open(op.join(path, _INTERMEDIATE_SCHEMA_FILE), mode="wb") as fp:
+        fp.write(table.schema.serialize().to_pybytes())
+
+
+def load_intermediate(
+    path,
+    *,
+    fs=None,
+    format="parquet",
+    columns=None,
+    filters=None,
+    memory_map=False,
+    lazy=False,
+):
+    """Load a dataset saved using ``save_intermediate``.
+
+    Parameters
+    ----------
+    path : string
+        Absolute or relative folder path, URL (may include protocols like
+        ``s3://``).
+    fs : fsspec.filesystem, optional
+        Filesystem of the url, by default ``None``
+    format : str, optional
+        One of ``parquet`` or ``feather``, by default ``parquet``
+    columns : list(str), optional
+        Subset of columns to load.
+    filters : list, optional
+        Row filters in the ``pyarrow`` DNF format.
+    memory_map : bool, optional
+        Memory map the files instead of reading them into memory. Applicable
+        only for the local filesystem, by default False
+    lazy : bool, optional
+        If True, return a generator yielding the data in record batches,
+        by default False
+
+    Returns
+    -------
+    pd.DataFrame or generator(pd.DataFrame)
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+
+    fs = fs or fsspec.filesystem("file")
+    with fs.open(op.join(path, _INTERMEDIATE_SCHEMA_FILE), mode="rb") as fp:
+        schema = pa.ipc.read_schema(pa.py_buffer(fp.read()))
+
+    partition_cols = schema.metadata.get(_PARTITION_COLS_KEY, b"").decode()
+    partition_cols = partition_cols.split(",") if partition_cols else []
+    # categorical partition columns are read from the folder names, and
+    # categoricals of non string values are stored by parquet as plain values,
+    # so these are read with their value type and encoded back after reading
+    decoded_cols = [
+        field.name
+        for field in schema
+        if pa.types.is_dictionary(field.type)
+        and (
+            field.name in partition_cols
+            or (
+                format == "parquet" and not pa.types.is_string(field.type.value_type)
+            )
+        )
+    ]
+    for col in decoded_cols:
+        field = schema.field(col)
+        schema = schema.set(
+            schema.get_field_index(col), field.with_type(field.type.value_type)
+        )
+
+    partitioning = None
+    if partition_cols:
+        partition_schema = pa.schema([schema.field(col) for col in partition_cols])
+        partitioning = pads.partitioning(partition_schema, flavor="hive")
+
+    filesystem = fs
+    if memory_map and ("file" in fs.protocol):
+        filesystem = pafs.LocalFileSystem(use_mmap=True)
+
+    dataset = pads.dataset(
+        fs._strip_protocol(path),
+        schema=schema,
+        format=format,
+        filesystem=filesystem,
+        partitioning=partitioning,
+    )
+    expr = pq.filters_to_expression(filters) if filters else None
+    if lazy:
+        return (
+            _encode_columns(pa.Table.from_batches([batch]), decoded_cols).to_pandas()
+            for batch in dataset.to_batches(columns=columns, filter=expr)
+        )
+    table = dataset.to_table(columns=columns, filter=expr)
+    return _encode_columns(table, decoded_cols).to_pandas()
+
+
+def _encode_columns(table, columns):
+    """Dictionary encode the ``columns`` of an arrow table, if present."""
+    for col in columns:
+        idx = table.schema.get_field_index(col)
+        if idx >= 0:
+            table = table.set_column(idx, col, table.column(idx).dictionary_encode())
+    return table
+
+
 def df_to_X_y(df, target_col):
     """Create X and y training variables from the provided dataframe.
 
@@ -996,6 +1157,34 @@ def hash_object(obj, expensive=False, block_size=4096):
     return hasher.hexdigest()
 
 
+def hash_file(path, *, fs=None, block_size=2**20):
+    """Return a hash of the contents of the file at ``path``.
+
+    Parameters
+    ----------
+    path : string
+        Absolute or relative filepath, URL (may include protocols like
+        ``s3://``).
+    fs : fsspec.filesystem, optional
+        Filesystem of the url, by default ``None``
+    block_size : int, optional
+        Number of bytes read at a time, by default 1MB
+
+    Returns
+    -------
+    string
+    """
+    fs = fs or fsspec.filesystem("file")
+    hasher = hashlib.sha256()
+    with fs.open(path, mode="rb") as fp:
+        while True:
+            data = fp.read(block_size)
+            if len(data) <= 0:
+                break
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
 def configure_logger(
     logger=None, cfg=None, log_file=None, console=True, log_level="DEBUG"
 ):
@@ -1,6 +1,10 @@
 from .calculate_attributions import (
     calculate_efficiency,
     calculate_roas,
+    calculate_scenario_efficiency,
+    calculate_scenario_roas,
     get_additive_attribution,
     get_multiplicative_attribution,
+    get_multiplicative_attribution_draws,
+    get_period_buckets,
 )
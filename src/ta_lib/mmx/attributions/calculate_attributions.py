@@ -289,6 +289,248 @@ def calculate_efficiency(
     return effi_df
 
 
+_PERIOD_FREQS = {"quarter": "Q", "year": "Y"}
+
+
+def get_period_buckets(dates, time_periods: List[str] = None) -> dict:
+    """Precompute the bucketing of the rows into time periods.
+
+    The buckets only depend on the dates of the rows, so they can be computed
+    once and reused for all the models and scenarios sharing the same rows.
+
+    Parameters
+    ----------
+    dates : array-like
+        Date of each row of the attribution matrices, i.e. the date column of
+        the attribution frame. The attribution frames are sorted by date, so
+        their rows are not in the order of the input data in general.
+    time_periods : List[str], optional
+        Time periods to bucket the rows into. Defaults to ["quarter", "year"].
+
+    Returns
+    -------
+    dict
+        For each time period, a tuple with the period labels and a
+        (n_periods, n_rows) indicator matrix of the rows in each period.
+
+    Raises
+    ------
+    ValueError
+        If a time period is not "quarter" or "year".
+    """
+    if time_periods is None:
+        time_periods = list(_PERIOD_FREQS)
+    dates = pd.Series(pd.to_datetime(np.asarray(dates)))
+
+    buckets = {}
+    for time_period in time_periods:
+        if time_period not in _PERIOD_FREQS:
+            raise ValueError("time_period must be 'quarter' or 'year'")
+        codes, labels = pd.factorize(
+            dates.dt.to_period(_PERIOD_FREQS[time_period]), sort=True
+        )
+        indicator = np.zeros((len(labels), len(codes)))
+        indicator[codes, np.arange(len(codes))] = 1
+        buckets[time_period] = (pd.Index(labels, name=time_period), indicator)
+    return buckets
+
+
+def _scenario_frame(
+    values: np.ndarray, labels: pd.Index, channels: List[str]
+) -> pd.DataFrame:
+    """Flatten a (scenario, period, channel) array into a DataFrame."""
+    index = pd.MultiIndex.from_product(
+        [np.arange(values.shape[0]), labels], names=["scenario", labels.name]
+    )
+    return pd.DataFrame(
+        values.reshape(-1, values.shape[-1]), index=index, columns=channels
+    )
+
+
+def _get_spend_buckets(period_buckets: dict, spend_dates) -> dict:
+    """Bucket the spend rows by their own dates into the periods of the attributions."""
+    if spend_dates is None:
+        return period_buckets
+    spend_buckets = get_period_buckets(spend_dates, list(period_buckets))
+    for time_period, (labels, _) in period_buckets.items():
+        if not spend_buckets[time_period][0].equals(labels):
+            raise ValueError(
+                f"spend and attribution dates do not span the same {time_period}s."
+            )
+    return spend_buckets
+
+
+def _aggregate_scenarios(
+    spends: np.ndarray,
+    attributions: np.ndarray,
+    period_buckets: dict,
+    spend_dates=None,
+):
+    """Sum the spends and attributions of every scenario by period and overall."""
+    spends = np.asarray(spends, dtype=float)
+    attributions = np.asarray(attributions, dtype=float)
+    if spends.shape[-2:] != attributions.shape[-2:]:
+        raise ValueError("spend and attribution matrices shape is not equal.")
+    if any(x.shape[1] != attributions.shape[-2] for _, x in period_buckets.values()):
+        raise ValueError("period buckets and attribution matrices rows are not equal.")
+    spend_buckets = _get_spend_buckets(period_buckets, spend_dates)
+    # a matrix shared by all the scenarios is broadcast with the others
+    spends = spends[None] if spends.ndim == 2 else spends
+    attributions = attributions[None] if attributions.ndim == 2 else attributions
+    aggregates = {
+        time_period: (
+            labels,
+            spend_buckets[time_period][1] @ spends,
+            indicator @ attributions,
+        )
+        for time_period, (labels, indicator) in period_buckets.items()
+    }
+    return aggregates, spends.sum(axis=1), attributions.sum(axis=1)
+
+
+def calculate_scenario_roas(
+    spends: np.ndarray,
+    attributions: np.ndarray,
+    period_buckets: dict,
+    channels: List[str] = None,
+    spend_dates=None,
+) -> dict:
+    """Calculate the ROAS of each marketing variable for many scenarios at once.
+
+    Parameters
+    ----------
+    spends : np.ndarray
+        Spends of shape (n_scenarios, n_rows, n_channels).
+    attributions : np.ndarray
+        Attributions of the marketing variables of shape
+        (n_scenarios, n_rows, n_channels) or (n_rows, n_channels) when shared
+        by all the scenarios.
+    period_buckets : dict
+        Bucketing of the rows returned by ``get_period_buckets``.
+    channels : List[str], optional
+        Names of the channels e.g. ``mapping["variable_description"]``.
+        Defaults to the channel positions.
+    spend_dates : array-like, optional
+        Date of each row of the spend matrices, e.g. ``data[date_col]``, when
+        their rows are not in the order of the attribution frame, which is
+        sorted by date. The spends are then bucketed by these dates. Defaults
+        to the rows being in the order of ``period_buckets``.
+
+    Returns
+    -------
+    dict
+        A DataFrame indexed by scenario and period with the ROAS of each
+        channel for every time period in ``period_buckets``, and one indexed
+        by scenario for the overall ROAS under the "overall" key.
+
+    Raises
+    ------
+    ValueError
+        If the shapes of the spend and attribution matrices are not equal, if
+        the rows of the attribution matrices are not those of
+        ``period_buckets`` or if ``spend_dates`` spans other periods.
+
+    Examples
+    --------
+    >>> buckets = get_period_buckets(attribution_df[date_col])
+    >>> spends = np.stack([data[spend_cols].values * scale for scale in scales])
+    >>> roas = calculate_scenario_roas(
+    ...     spends,
+    ...     attribution_df[ac_cols].values,
+    ...     buckets,
+    ...     spend_dates=data[date_col],
+    ... )
+    >>> roas["quarter"].loc[0]
+    """
+    aggregates, total_spent, total_attribution = _aggregate_scenarios(
+        spends, attributions, period_buckets, spend_dates
+    )
+    if channels is None:
+        channels = list(range(total_spent.shape[-1]))
+    n_scenarios = max(total_spent.shape[0], total_attribution.shape[0])
+
+    result = {
+        time_period: _scenario_frame(
+            np.divide(attribution_agg, spend_agg), labels, channels
+        )
+        for time_period, (labels, spend_agg, attribution_agg) in aggregates.items()
+    }
+    result["overall"] = pd.DataFrame(
+        np.divide(total_attribution, total_spent),
+        index=pd.RangeIndex(n_scenarios, name="scenario"),
+        columns=channels,
+    )
+    return result
+
+
+def calculate_scenario_efficiency(
+    spends: np.ndarray,
+    attributions: np.ndarray,
+    period_buckets: dict,
+    channels: List[str] = None,
+    spend_dates=None,
+) -> dict:
+    """Calculate the efficiency of each marketing variable for many scenarios at once.
+
+    The efficiency of a channel is its share of the attribution divided by its
+    share of the spend, see ``calculate_efficiency``.
+
+    Parameters
+    ----------
+    spends : np.ndarray
+        Spends of shape (n_scenarios, n_rows, n_channels).
+    attributions : np.ndarray
+        Attributions of the marketing variables of shape
+        (n_scenarios, n_rows, n_channels) or (n_rows, n_channels) when shared
+        by all the scenarios.
+    period_buckets : dict
+        Bucketing of the rows returned by ``get_period_buckets``.
+    channels : List[str], optional
+        Names of the channels. Defaults to the channel positions.
+    spend_dates : array-like, optional
+        Date of each row of the spend matrices, e.g. ``data[date_col]``, when
+        their rows are not in the order of the attribution frame, which is
+        sorted by date. The spends are then bucketed by these dates. Defaults
+        to the rows being in the order of ``period_buckets``.
+
+    Returns
+    -------
+    dict
+        A DataFrame indexed by scenario and period with the efficiency of each
+        channel for every time period in ``period_buckets``, and one indexed
+        by scenario for the overall efficiency under the "overall" key.
+
+    Raises
+    ------
+    ValueError
+        If the shapes of the spend and attribution matrices are not equal, if
+        the rows of the attribution matrices are not those of
+        ``period_buckets`` or if ``spend_dates`` spans other periods.
+    """
+    aggregates, total_spent, total_attribution = _aggregate_scenarios(
+        spends, attributions, period_buckets, spend_dates
+    )
+    if channels is None:
+        channels = list(range(total_spent.shape[-1]))
+    n_scenarios = max(total_spent.shape[0], total_attribution.shape[0])
+
+    def _share(values):
+        return values / values.sum(axis=-1, keepdims=True)
+
+    result = {
+        time_period: _scenario_frame(
+            np.divide(_share(attribution_agg), _share(spend_agg)), labels, channels
+        )
+        for time_period, (labels, spend_agg, attribution_agg) in aggregates.items()
+    }
+    result["overall"] = pd.DataFrame(
+        np.divide(_share(total_attribution), _share(total_spent)),
+        index=pd.RangeIndex(n_scenarios, name="scenario"),
+        columns=channels,
+    )
+    return result
+
+
 def _combine_marketing_and_control_vars(
     transformed_data: pd.DataFrame, marketing_vars: List[str], control_vars: List[str]
 ) -> pd.DataFrame:
@@ -527,6 +769,152 @@ def _calculate_actual_contributions(
     return final_contrib_df
 
 
+def _multiplicative_attribution_block(
+    x: np.ndarray,
+    beta: np.ndarray,
+    e_intercept: np.ndarray,
+    preds: np.ndarray,
+    actuals: np.ndarray,
+    n_marketing: int,
+) -> np.ndarray:
+    """
+    Calculate the actual contributions of a block of rows.
+
+    This is the NumPy equivalent of ``_calculate_beta_into_x``,
+    ``_calculate_y_values``, ``_calculate_raw_contributions`` and
+    ``_calculate_actual_contributions``. Leading dimensions, e.g. posterior
+    draws, are broadcast.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Transformed values of the marketing then control variables of shape
+        (n_rows, n_variables).
+    beta : np.ndarray
+        Coefficients of the variables for each row of shape (..., n_rows, n_variables).
+    e_intercept : np.ndarray
+        Exponentiated intercept of each row of shape (..., n_rows).
+    preds : np.ndarray
+        Predictions of each row in the log scale of shape (..., n_rows).
+    actuals : np.ndarray
+        Actuals of each row in the log scale of shape (n_rows,).
+    n_marketing : int
+        Number of marketing variables.
+
+    Returns
+    -------
+    np.ndarray
+        Actual contributions of the marketing then control variables of shape
+        (..., n_rows, n_variables).
+    """
+    e_beta_into_x = np.exp(np.multiply(beta, x))
+    preds = np.exp(preds)
+    actuals = np.exp(actuals)
+    y_control = np.nanprod(e_beta_into_x[..., n_marketing:], axis=-1) * e_intercept
+    y_mkt = preds - y_control
+
+    y = np.empty_like(e_beta_into_x)
+    y[..., :n_marketing] = y_mkt[..., None]
+    y[..., n_marketing:] = y_control[..., None]
+    rc = y * (1 - 1 / e_beta_into_x)
+
+    total = np.empty_like(rc)
+    total[..., :n_marketing] = np.nansum(rc[..., :n_marketing], axis=-1)[..., None]
+    total[..., n_marketing:] = np.nansum(rc[..., n_marketing:], axis=-1)[..., None]
+    ac = rc * y / total
+
+    actuals_without_intercept = actuals - e_intercept
+    return ac * actuals_without_intercept[..., None] / preds[..., None]
+
+
+# memory budget of a block of rows of get_multiplicative_attribution_draws and
+# the number of (draw, row, variable) float arrays alive at once in a block
+_DRAWS_MEMORY_BYTES = 512 * 2**20
+_DRAWS_BLOCK_ARRAYS = 8
+
+
+def _get_draws_chunk_size(n_draws: int, n_variables: int) -> int:
+    """Return the number of rows of a block of draws fitting in the memory budget."""
+    row_bytes = _DRAWS_BLOCK_ARRAYS * n_draws * (n_variables + 1) * 8
+    return max(1, _DRAWS_MEMORY_BYTES // row_bytes)
+
+
+def _get_attribution_row_order(data: pd.DataFrame, date_col: str) -> np.ndarray:
+    """Return the row order of the merged and sorted frame of the in-memory path."""
+    return (
+        data[[date_col]].reset_index(drop=True).sort_values(by=date_col).index.values
+    )
+
+
+def _get_row_lookup(keys: pd.DataFrame, values: np.ndarray):
+    """
+    Index ``values`` by the rows of ``keys`` for lookups of many rows at once.
+
+    Rows that are not found get NaN values, like a left merge.
+    """
+    if keys.shape[1] == 1:
+        index = pd.Index(keys.iloc[:, 0])
+    else:
+        index = pd.MultiIndex.from_frame(keys)
+    values = np.concatenate(
+        [values, np.full((1,) + values.shape[1:], np.nan)], axis=0
+    )
+
+    def lookup(rows: pd.DataFrame) -> np.ndarray:
+        if rows.shape[1] == 1:
+            return values[index.get_indexer(rows.iloc[:, 0])]
+        return values[index.get_indexer(pd.MultiIndex.from_frame(rows))]
+
+    return lookup
+
+
+def _iter_multiplicative_attribution(
+    data: pd.DataFrame,
+    coeff_matrix: pd.DataFrame,
+    act_vs_preds: pd.DataFrame,
+    date_col: str,
+    marketing_vars: List[str],
+    control_vars: List[str],
+    chunk_size: int,
+):
+    """Yield the final contributions of ``get_multiplicative_attribution`` in row blocks."""
+    group_col = coeff_matrix.columns[0]
+    all_idvs = marketing_vars + control_vars
+    ac_cols = [f"ac_{col}" for col in all_idvs]
+
+    order = _get_attribution_row_order(data, date_col)
+    x_idx = data.columns.get_indexer(all_idvs)
+    key_idx = data.columns.get_indexer([date_col, group_col])
+
+    coeff_lookup = _get_row_lookup(
+        coeff_matrix[[group_col]],
+        coeff_matrix[
+            [f"beta_{col}" for col in all_idvs] + ["e_intercept"]
+        ].to_numpy(dtype=float),
+    )
+    avp_lookup = _get_row_lookup(
+        act_vs_preds[[date_col, group_col]],
+        act_vs_preds[["preds", "actuals"]].to_numpy(dtype=float),
+    )
+
+    for start in range(0, len(order), chunk_size):
+        rows = order[start : start + chunk_size]
+        keys = data.iloc[rows, key_idx].reset_index(drop=True)
+        coeff_rows = coeff_lookup(keys[[group_col]])
+        avp_rows = avp_lookup(keys)
+
+        ac = _multiplicative_attribution_block(
+            data.iloc[rows, x_idx].to_numpy(dtype=float),
+            coeff_rows[:, :-1],
+            coeff_rows[:, -1],
+            avp_rows[:, 0],
+            avp_rows[:, 1],
+            len(marketing_vars),
+        )
+        keys["base"] = coeff_rows[:, -1]
+        yield pd.concat([keys, pd.DataFrame(ac, columns=ac_cols)], axis=1)
+
+
 def get_multiplicative_attribution(
     data: pd.DataFrame,
     coeff_matrix: pd.DataFrame,
@@ -534,10 +922,17 @@ def get_multiplicative_attribution(
     date_col: str,
     marketing_vars: List[str],
     control_vars: List[str],
+    chunk_size: int = None,
+    path: str = None,
 ) -> pd.DataFrame:
     """
     Compute multiplicative attribution.
 
+    By default the attribution is computed on a single frame holding all the
+    intermediate columns. With ``chunk_size`` the rows are processed in blocks
+    using NumPy only, and with ``path`` the blocks are written to a parquet file
+    as they are computed so that only one block is held in memory.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -552,12 +947,56 @@ def get_multiplicative_attribution(
         List of marketing variables.
     control_vars : List[str]
         List of control variables.
+    chunk_size : int, optional
+        Number of rows processed at once. Defaults to all the rows, or to
+        100000 rows when ``path`` is given.
+    path : str, optional
+        If given, the contributions are written to this parquet file and the
+        path is returned. Defaults to None.
 
     Returns
     -------
     pd.DataFrame
-        DataFrame with the final contributions.
+        DataFrame with the final contributions, or the path of the parquet file
+        if ``path`` is given.
     """
+    if path is not None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        chunks = _iter_multiplicative_attribution(
+            data,
+            coeff_matrix,
+            act_vs_preds,
+            date_col,
+            marketing_vars,
+            control_vars,
+            chunk_size or 100000,
+        )
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    if chunk_size is not None:
+        chunks = _iter_multiplicative_attribution(
+            data,
+            coeff_matrix,
+            act_vs_preds,
+            date_col,
+            marketing_vars,
+            control_vars,
+            chunk_size,
+        )
+        return pd.concat(chunks, ignore_index=True)
+
     group_col = coeff_matrix.columns[0]
     contribution_df = _combine_marketing_and_control_vars(
         data, marketing_vars, control_vars
@@ -578,3 +1017,130 @@ def get_multiplicative_attribution(
         contribution_df, marketing_vars, control_vars, date_col, group_col
     )
     return final_contrib_df
+
+
+def get_multiplicative_attribution_draws(
+    data: pd.DataFrame,
+    coeff_draws: pd.DataFrame,
+    act_vs_preds: pd.DataFrame,
+    date_col: str,
+    marketing_vars: List[str],
+    control_vars: List[str],
+    quantiles: List[float] = (0.05, 0.5, 0.95),
+    thin: int = 1,
+    chunk_size: int = None,
+):
+    """
+    Compute the multiplicative attribution for every posterior draw at once.
+
+    The contributions of all the draws are computed together by broadcasting
+    the (draw, row, variable) coefficient arrays, one block of ``chunk_size``
+    rows at a time, and summarised with quantiles over the draws. The
+    predictions of each draw are recomputed from its coefficients while the
+    actuals are read from ``act_vs_preds``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data used to train the model.
+    coeff_draws : pd.DataFrame
+        Coefficient matrix of every posterior draw, as returned by
+        ``get_posterior_coefficient_matrix(..., draws=True)``.
+    act_vs_preds : pd.DataFrame
+        DataFrame containing actual vs predicted values.
+    date_col : str
+        Name of the date column.
+    marketing_vars : List[str]
+        List of marketing variables.
+    control_vars : List[str]
+        List of control variables.
+    quantiles : List[float], optional
+        Quantiles of the contributions to compute. Defaults to (0.05, 0.5, 0.95).
+    thin : int, optional
+        Only every ``thin``-th draw is used. Defaults to 1.
+    chunk_size : int, optional
+        Number of rows processed at once. A block holds about 8 arrays of
+        ``n_draws * chunk_size * n_variables`` floats at once. Defaults to the
+        number of rows fitting in about 512 MB.
+
+    Returns
+    -------
+    pd.DataFrame
+        The quantiles of the final contributions of each row, with the same
+        columns as ``get_multiplicative_attribution`` and a "quantile" column.
+    pd.DataFrame
+        The quantiles of the total contributions over all the rows, indexed by
+        quantile.
+    """
+    group_col = coeff_draws.columns[1]
+    all_idvs = marketing_vars + control_vars
+    ac_cols = [f"ac_{col}" for col in all_idvs]
+    quantiles = list(quantiles)
+
+    # (group, draw, variable) array of the coefficients with the intercept last
+    draw_ids = coeff_draws["draw"].unique()[::thin]
+    coeff_draws = coeff_draws[coeff_draws["draw"].isin(draw_ids)].sort_values(
+        by=["draw"], kind="stable"
+    )
+    groups = coeff_draws[group_col].iloc[: len(coeff_draws) // len(draw_ids)]
+    coefficients = coeff_draws[
+        [f"beta_{col}" for col in all_idvs] + ["Intercept"]
+    ].to_numpy(dtype=float)
+    coefficients = coefficients.reshape(len(draw_ids), len(groups), -1).transpose(
+        1, 0, 2
+    )
+
+    if chunk_size is None:
+        chunk_size = _get_draws_chunk_size(len(draw_ids), len(all_idvs))
+    order = _get_attribution_row_order(data, date_col)
+    x_idx = data.columns.get_indexer(all_idvs)
+    key_idx = data.columns.get_indexer([date_col, group_col])
+    coeff_lookup = _get_row_lookup(groups.to_frame(), coefficients)
+    actuals_lookup = _get_row_lookup(
+        act_vs_preds[[date_col, group_col]],
+        act_vs_preds["actuals"].to_numpy(dtype=float),
+    )
+
+    total_base = np.zeros(len(draw_ids))
+    total_ac = np.zeros((len(draw_ids), len(all_idvs)))
+    row_quantiles = []
+    for start in range(0, len(order), chunk_size):
+        rows = order[start : start + chunk_size]
+        keys = data.iloc[rows, key_idx].reset_index(drop=True)
+        x = data.iloc[rows, x_idx].to_numpy(dtype=float)
+
+        coeff_rows = coeff_lookup(keys[[group_col]]).transpose(1, 0, 2)
+        beta, intercept = coeff_rows[..., :-1], coeff_rows[..., -1]
+        e_intercept = np.exp(intercept)
+        preds = intercept + np.sum(beta * x, axis=-1)
+
+        ac = _multiplicative_attribution_block(
+            x, beta, e_intercept, preds, actuals_lookup(keys), len(marketing_vars)
+        )
+        total_base += e_intercept.sum(axis=1)
+        total_ac += np.nansum(ac, axis=1)
+
+        base_q = np.quantile(e_intercept, quantiles, axis=0)
+        ac_q = np.nanquantile(ac, quantiles, axis=0)
+        for idx, q in enumerate(quantiles):
+            chunk = keys.assign(quantile=q, base=base_q[idx])
+            row_quantiles.append(
+                pd.concat([chunk, pd.DataFrame(ac_q[idx], columns=ac_cols)], axis=1)
+            )
+
+    row_quantiles = (
+        pd.concat(row_quantiles, ignore_index=True)
+        .sort_values(by="quantile", kind="stable")
+        .reset_index(drop=True)
+    )
+    total_quantiles = pd.DataFrame(
+        np.column_stack(
+            [
+                np.quantile(total_base, quantiles),
+                np.quantile(total_ac, quantiles, axis=0),
+            ]
+        ),
+        index=pd.Index(quantiles, name="quantile"),
+        columns=["base"] + ac_cols,
+    )
+    return row_quantiles, total_quantiles
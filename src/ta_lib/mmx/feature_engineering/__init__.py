@@ -1,5 +1,11 @@
-from .data_cleaning import missing_value_impute, outlier_treatment
+from .data_cleaning import (
+    Imputer,
+    OutlierTreater,
+    missing_value_impute,
+    outlier_treatment,
+)
 from .data_preprocessing import (
+    MediaTransformPipeline,
     add_fiscal_calendar,
     add_holidays,
     add_linear_trend,
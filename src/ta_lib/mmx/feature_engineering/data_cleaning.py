@@ -1,193 +1,220 @@
 import logging
 import numpy as np
 import pandas as pd
-from sklearn.impute import SimpleImputer
 from typing import Dict, List, Optional, Union
 
 logging.basicConfig(level=logging.INFO)
 
 
-def _get_outlier_IQR_bounds(data: pd.DataFrame, columns: List) -> pd.DataFrame:
-    """Calculate the lower and upper bounds of columns using the Interquartile Range (IQR) method.
+OUTLIER_METHODS = ["IQR", "ZSCORE"]
+OUTLIER_TREATMENTS = [None, "remove", "cap"]
+IMPUTE_METHODS = [
+    "mean",
+    "median",
+    "most_frequent",
+    "constant",
+    "ffill",
+    "bfill",
+    "custom",
+]
 
-    Parameters
-    ----------
-    data : pd.DataFrame
-        The input DataFrame.
-    columns : List[str]
-        The list of column names on which outlier detection should be performed.
-
-    Returns
-    -------
-    pd.DataFrame
-        DataFrame with bounds of all required columns.
-    """
-    bounds = data[columns].quantile([0.25, 0.75])
-    IQR = (
-        bounds.diff()
-        .reset_index()
-        .drop("index", axis=1)
-        .drop(0, axis=0)
-        .rename(index={1: "IQR"})
-    )
-    bounds = pd.concat([bounds, IQR]).T
 
-    bounds["lower_bound"] = bounds[0.25] - (1.5 * bounds["IQR"])
-    bounds["upper_bound"] = bounds[0.75] + (1.5 * bounds["IQR"])
+def _get_group_keys(data: pd.DataFrame, group_cols: Optional[List]):
+    """Return the group keys of the rows as an index, None if not grouped."""
+    if group_cols is None:
+        return None
+    if len(group_cols) == 1:
+        return pd.Index(data[group_cols[0]])
+    return pd.MultiIndex.from_frame(data[group_cols])
 
-    return bounds.T
 
-
-def _get_outlier_ZSCORE_bounds(data: pd.DataFrame, columns: List) -> pd.DataFrame:
-    """Calculate the lower and upper bounds of columns using the Z-score method.
+def _get_row_stats(
+    data: pd.DataFrame,
+    group_cols: Optional[List],
+    by_group: Optional[pd.DataFrame],
+    overall: pd.Series,
+) -> np.ndarray:
+    """
+    Return the statistics of the group of each row of ``data``.
 
     Parameters
     ----------
     data : pd.DataFrame
-        The input DataFrame.
-    columns : List[str]
-        The list of column names on which outlier detection should be performed.
+        The input dataframe.
+    group_cols : List, optional
+        The columns identifying the groups.
+    by_group : pd.DataFrame, optional
+        The statistics of the columns with one row per group.
+    overall : pd.Series
+        The statistics of the columns fitted on all the data, used for the
+        rows of groups without statistics.
 
     Returns
     -------
-    pd.DataFrame
-        DataFrame with bounds of all required columns.
+    np.ndarray
+        The (n_rows, n_columns) statistics of the rows.
     """
-
-    bounds = data[columns].describe().loc[["mean", "std"], :].T
-
-    bounds["lower_bound"] = bounds["mean"] - 3 * bounds["std"]
-    bounds["upper_bound"] = bounds["mean"] + 3 * bounds["std"]
-
-    return bounds.T
-
-
-def _cap_outliers(
-    df_treat: pd.DataFrame,
-    columns: List,
-    outlier_direction: int,
-    bounds: pd.DataFrame,
-) -> pd.DataFrame:
-    """Cap outliers in the input DataFrame by applying capping treatment.
+    overall = overall.to_numpy()[None]
+    keys = _get_group_keys(data, group_cols)
+    if keys is None or by_group is None:
+        return np.repeat(overall, len(data), axis=0)
+    stats = np.concatenate([by_group.to_numpy(), overall])
+    # -1 (not found) picks the last row i.e. the overall statistics
+    return stats[by_group.index.get_indexer(keys)]
+
+
+class OutlierTreater:
+    """Detect, remove or cap outliers using bounds fitted once per group.
+
+    The lower and upper bounds of all the columns are computed in a single
+    grouped pass when fitting and stored in ``lower_bounds_`` and
+    ``upper_bounds_`` with one row per group. The bounds fitted on all the
+    data, in ``bounds_``, are used when not grouped and for the groups not
+    seen when fitting. Transforming applies
+    the bounds of every row's group at once, so that the fitted object can be
+    persisted (e.g. using ``save_pipeline``) and reused on scoring data.
 
     Parameters
     ----------
-    df_treat : pd.DataFrame
-        Input DataFrame.
-    columns : List[str]
-        The list of column names on which outlier detection should be performed.
-    outlier_direction : int
-        The direction in which outlier treatment should be performed.
-        Acceptable inputs are 1, 0, and -1.
-        If 0, performs outlier detection for both upper and lower bounds.
-        If 1, performs outlier detection for the upper bound only.
-        If -1, performs outlier detection for the lower bound only.
-    bounds : pd.DataFrame
-        DataFrame with bounds of all columns.
+    columns : List
+        The columns on which outlier treatment is to be performed.
+    outlier_direction : int, optional
+        The direction in which outlier treatment is to be performed.
 
-    Raises
-    ------
-    ValueError
-        If an invalid outlier detection direction is provided. Available options are 1, 0, -1.
+        - 0: Performs outlier treatment for both upper and lower bounds.
+        - 1: Performs outlier treatment for the upper bound only.
+        - -1: Performs outlier treatment for the lower bound only.
 
-    Returns
-    -------
-    pd.DataFrame
-        DataFrame with capped outlier samples.
+        Defaults to 0.
+    method : str, optional
+        The method used for outlier detection.
+        Acceptable inputs are "IQR" and "ZSCORE".
+        Defaults to "IQR".
+    treatment : str, optional
+        The outlier treatment method, see ``outlier_treatment``. Defaults to "cap".
+    group_cols : List, optional
+        The columns by which the bounds are computed. Defaults to None.
+
+    Examples
+    --------
+    >>> treater = OutlierTreater(["A", "B"], group_cols=["geo"]).fit(train)
+    >>> capped_train = treater.transform(train)
+    >>> capped_test = treater.transform(test)
     """
-    for col in columns:
-        if outlier_direction == 0:
-            df_treat[col] = np.where(
-                df_treat[col] > bounds.loc["upper_bound", col],
-                bounds.loc["upper_bound", col],
-                np.where(
-                    df_treat[col] < bounds.loc["lower_bound", col],
-                    bounds.loc["lower_bound", col],
-                    df_treat[col],
-                ),
-            )
-        elif outlier_direction == 1:
-            df_treat[col] = np.where(
-                df_treat[col] > bounds.loc["upper_bound", col],
-                bounds.loc["upper_bound", col],
-                df_treat[col],
+
+    def __init__(
+        self,
+        columns: List,
+        outlier_direction: int = 0,
+        method: str = "IQR",
+        treatment: Optional[str] = "cap",
+        group_cols: Optional[List] = None,
+    ):
+        if method not in OUTLIER_METHODS:
+            raise ValueError(
+                "Invalid Outlier detection method. Acceptable inputs are IQR or ZSCORE."
             )
-        elif outlier_direction == -1:
-            df_treat[col] = np.where(
-                df_treat[col] < bounds.loc["lower_bound", col],
-                bounds.loc["lower_bound", col],
-                df_treat[col],
+        if outlier_direction not in [0, 1, -1]:
+            raise ValueError(
+                "Invalid outlier detection direction. Available options are 1, 0, -1."
             )
-        else:
+        if treatment not in OUTLIER_TREATMENTS:
             raise ValueError(
-                "Invalid outlier detection direction . Available options are 1,0,-1 ."
+                "Invalid outlier treatment method. Available options are 'remove', 'cap', or None."
             )
-
-    return df_treat
-
-
-def _identify_outliers(
-    data: pd.DataFrame,
-    columns: List,
-    outlier_direction: int,
-    bounds: pd.DataFrame,
-    bool_val: bool,
-) -> pd.DataFrame:
-    """Identify outliers in the input DataFrame based on the provided bounds.
-
-    Parameters
-    ----------
-    data : pd.DataFrame
-        Input DataFrame.
-    columns : List
-        The list of columns on which outlier detection should be performed.
-    outlier_direction : int
-        The direction in which outlier treatment should be performed.
-        Acceptable inputs are 1, 0, and -1.
-        If 0, performs outlier detection for both upper and lower bounds.
-        If 1, performs outlier detection for the upper bound only.
-        If -1, performs outlier detection for the lower bound only.
-    bounds : pd.DataFrame
-        DataFrame with bounds of all columns.
-    bool_val : bool
-        Pass False if resulting data needed is outlier-free data, else pass True.
-        Acceptable inputs are True or False.
-
-    Raises
-    ------
-    ValueError
-        If an invalid outlier detection direction is provided. Available options are 1, 0, -1.
-
-    Returns
-    -------
-    pd.DataFrame
-        DataFrame with outlier samples.
-    """
-
-    if outlier_direction == 0:
-        outliers = data[columns].apply(
-            lambda x: (x < bounds.loc["lower_bound", x.name])
-            | (x > bounds.loc["upper_bound", x.name])
+        self.columns = list(columns)
+        self.outlier_direction = outlier_direction
+        self.method = method
+        self.treatment = treatment
+        self.group_cols = group_cols
+
+    def _get_bounds(self, data: pd.DataFrame, group_cols: Optional[List] = None):
+        """Return the lower and upper bounds of the columns, by group if grouped."""
+        values = data[self.columns]
+        if group_cols is not None:
+            values = data.groupby(group_cols)[self.columns]
+
+        if self.method == "IQR":
+            quartiles = values.quantile([0.25, 0.75])
+            if group_cols is None:
+                q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+            else:
+                q1 = quartiles.xs(0.25, level=-1)
+                q3 = quartiles.xs(0.75, level=-1)
+            iqr = q3 - q1
+            return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+        mean, std = values.mean(), values.std()
+        return mean - 3 * std, mean + 3 * std
+
+    def fit(self, data: pd.DataFrame):
+        """
+        Compute the bounds of the columns.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The input dataframe.
+
+        Returns
+        -------
+        OutlierTreater
+            The fitted object.
+        """
+        lower, upper = self._get_bounds(data)
+        self.bounds_ = pd.DataFrame(
+            [lower, upper], index=["lower_bound", "upper_bound"]
         )
-    elif outlier_direction == 1:
-        outliers = data[columns].apply(
-            lambda x: (x > bounds.loc["upper_bound", x.name])
-        )
-    elif outlier_direction == -1:
-        outliers = data[columns].apply(
-            lambda x: (x < bounds.loc["lower_bound", x.name])
-        )
-    else:
-        raise ValueError(
-            "Invalid outlier detection direction. Available options are 1, 0, -1."
-        )
-
-    outliers = outliers.any(axis=1)
-
-    outliers_rem = data.copy()
-    outliers_rem["_BOOL"] = outliers
-    out = outliers_rem[outliers_rem["_BOOL"] == bool_val].drop(["_BOOL"], axis=1)
-    return out
+        self.lower_bounds_ = self.upper_bounds_ = None
+        if self.group_cols is not None:
+            self.lower_bounds_, self.upper_bounds_ = self._get_bounds(
+                data, self.group_cols
+            )
+        return self
+
+    def _get_row_bounds(self, data: pd.DataFrame):
+        """Return the (n_rows, n_columns) lower and upper bounds of the rows."""
+        lower = _get_row_stats(
+            data, self.group_cols, self.lower_bounds_, self.bounds_.loc["lower_bound"]
+        ).astype(float)
+        upper = _get_row_stats(
+            data, self.group_cols, self.upper_bounds_, self.bounds_.loc["upper_bound"]
+        ).astype(float)
+        # missing bounds and the untreated direction never flag a value
+        lower[np.isnan(lower) | (self.outlier_direction == 1)] = -np.inf
+        upper[np.isnan(upper) | (self.outlier_direction == -1)] = np.inf
+        return lower, upper
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the outlier treatment using the fitted bounds.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The input dataframe.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataframe with outliers or the dataframe after outlier treatment, depending on the treatment.
+        """
+        lower, upper = self._get_row_bounds(data)
+        values = data[self.columns].to_numpy(dtype=float)
+
+        if self.treatment == "cap":
+            df = data.copy()
+            df[self.columns] = np.clip(values, lower, upper)
+            return df
+
+        outliers = ((values < lower) | (values > upper)).any(axis=1)
+        if self.treatment == "remove":
+            return data[~outliers]
+        return data[outliers]
+
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Fit the bounds on the data and apply the outlier treatment to it."""
+        return self.fit(data).transform(data)
 
 
 def outlier_treatment(
@@ -196,10 +223,13 @@ def outlier_treatment(
     outlier_direction: int = 0,
     method: str = "IQR",
     treatment: Optional[str] = None,
+    group_cols: Optional[List] = None,
 ) -> pd.DataFrame:
     """
     Perform outlier detection or treatment on a dataframe by removing or capping the outliers.
 
+    Use ``OutlierTreater`` to apply the same bounds to new data.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -226,6 +256,8 @@ def outlier_treatment(
         - "cap": Caps the outliers within the specified bounds.
 
         Defaults to None.
+    group_cols : List, optional
+        The columns by which the bounds are computed. Defaults to None.
 
     Returns
     -------
@@ -247,52 +279,187 @@ def outlier_treatment(
     >>> print(result)
     """
 
-    if method == "IQR":
-        bounds = _get_outlier_IQR_bounds(data, columns)
+    return OutlierTreater(
+        columns,
+        outlier_direction=outlier_direction,
+        method=method,
+        treatment=treatment,
+        group_cols=group_cols,
+    ).fit_transform(data)
 
-    elif method == "ZSCORE":
-        bounds = _get_outlier_ZSCORE_bounds(data, columns)
 
-    else:
+def _check_impute_method(method, numerical_cols):
+    if isinstance(method, str):
+        method = {method: numerical_cols}
+    elif not isinstance(method, dict):
         raise ValueError(
-            "Invalid Outlier detection method. Acceptable inputs are IQR or ZSCORE."
+            "Invalid imputation method. The method parameter should be a string or a dictionary."
         )
+    return method
 
-    if treatment is None:
-        outliers = _identify_outliers(data, columns, outlier_direction, bounds, True)
 
-    elif treatment == "remove":
-        outliers = _identify_outliers(data, columns, outlier_direction, bounds, False)
+def _most_frequent(values: pd.Series):
+    """Return the most frequent value, the smallest one in case of ties."""
+    counts = values.value_counts()
+    if counts.empty:
+        return np.nan
+    return counts.index[counts.values == counts.values.max()].min()
 
-    elif treatment == "cap":
-        outliers = _cap_outliers(data.copy(), columns, outlier_direction, bounds)
 
-    else:
-        raise ValueError(
-            "Invalid outlier treatment method. Available options are 'remove', 'cap', or None."
-        )
+class Imputer:
+    """Replace missing values using statistics fitted once per group.
 
-    return outliers
+    The "mean", "median" and "most_frequent" statistics of all the columns
+    are computed in a single grouped pass when fitting and stored in
+    ``group_statistics_`` with one row per group. The statistics fitted on all
+    the data, in ``statistics_``, are used when not grouped and for the groups
+    not seen when fitting. "ffill", "bfill" and "custom" interpolation are
+    applied within each group and "constant" uses ``value``. The fitted
+    object can be persisted (e.g. using ``save_pipeline``) and reused on
+    scoring data.
 
+    Parameters
+    ----------
+    method : Union[str, Dict[str, list]]
+        The imputation method or a dictionary mapping imputation methods to
+        the corresponding columns, see ``missing_value_impute``.
+    value : Union[int, float, dict, pd.Series, pd.DataFrame], optional
+        Value used by the "constant" imputation method. Defaults to 0.
+    group_cols : List, optional
+        The columns by which the statistics are computed and the values are
+        filled or interpolated. Defaults to None.
 
-def _check_impute_method(method, numerical_cols):
-    if isinstance(method, str):
-        method = {method: numerical_cols}
-    elif not isinstance(method, dict):
-        raise ValueError(
-            "Invalid imputation method. The method parameter should be a string or a dictionary."
+    Examples
+    --------
+    >>> imputer = Imputer({"mean": ["A", "B"], "ffill": ["C"]}, group_cols=["geo"])
+    >>> train = imputer.fit_transform(train)
+    >>> test = imputer.transform(test)
+    """
+
+    _STAT_METHODS = {
+        "mean": "mean",
+        "median": "median",
+        "most_frequent": _most_frequent,
+    }
+
+    def __init__(
+        self,
+        method: Union[str, Dict[str, list]],
+        value: Union[int, float, dict, pd.Series, pd.DataFrame] = 0,
+        group_cols: Optional[List] = None,
+    ):
+        self.method = method
+        self.value = value
+        self.group_cols = group_cols
+
+    def fit(self, data: pd.DataFrame):
+        """
+        Compute the statistics used to fill the missing values.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The input DataFrame.
+
+        Returns
+        -------
+        Imputer
+            The fitted object.
+
+        Raises
+        ------
+        ValueError
+            If an invalid imputation method is provided.
+            If the method parameter is neither a string nor a dictionary.
+        """
+        numerical_cols = data.select_dtypes(include="number").columns.tolist()
+        self.method_ = _check_impute_method(self.method, numerical_cols)
+        for strategy in self.method_:
+            if strategy not in IMPUTE_METHODS:
+                raise ValueError(
+                    "Invalid imputation method. Available methods are {}".format(
+                        IMPUTE_METHODS
+                    )
+                )
+
+        statistics, group_statistics = [], []
+        for strategy, cols in self.method_.items():
+            if strategy not in self._STAT_METHODS or not cols:
+                continue
+            func = self._STAT_METHODS[strategy]
+            statistics.append(data[cols].agg(func))
+            if self.group_cols is not None:
+                group_statistics.append(data.groupby(self.group_cols)[cols].agg(func))
+
+        self.statistics_ = pd.concat(statistics) if statistics else pd.Series(dtype=float)
+        self.group_statistics_ = (
+            pd.concat(group_statistics, axis=1) if group_statistics else None
         )
-    return method
+        return self
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the missing values of the data.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The input DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            The DataFrame with imputed values.
+        """
+        df = data.copy()
+        grouped = df.groupby(self.group_cols) if self.group_cols is not None else None
+        for strategy, cols in self.method_.items():
+            if not cols:
+                continue
+            if strategy in self._STAT_METHODS:
+                fill = _get_row_stats(
+                    df,
+                    self.group_cols,
+                    None
+                    if self.group_statistics_ is None
+                    else self.group_statistics_[cols],
+                    self.statistics_[cols],
+                )
+                df[cols] = df[cols].fillna(
+                    pd.DataFrame(fill, index=df.index, columns=cols)
+                )
+            elif strategy in ["ffill", "bfill"]:
+                if grouped is None:
+                    df[cols] = df[cols].fillna(method=strategy)
+                else:
+                    df[cols] = getattr(grouped[cols], strategy)()
+            elif strategy == "custom":
+                if grouped is None:
+                    df[cols] = df[cols].interpolate(axis=0, limit_direction="both")
+                else:
+                    df[cols] = grouped[cols].transform(
+                        lambda x: x.interpolate(axis=0, limit_direction="both")
+                    )
+            else:
+                df[cols] = df[cols].fillna(value=self.value)
+        return df
+
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Fit the statistics on the data and replace its missing values."""
+        return self.fit(data).transform(data)
 
 
 def missing_value_impute(
     data: pd.DataFrame,
     method: Union[str, Dict[str, list]],
     value: Union[int, float, dict, pd.Series, pd.DataFrame] = 0,
+    group_cols: Optional[List] = None,
 ) -> pd.DataFrame:
     """
     Replace missing values in the DataFrame based on the specified imputation strategies.
 
+    Use ``Imputer`` to apply the same statistics to new data.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -308,6 +475,9 @@ def missing_value_impute(
         If a dictionary is provided, the keys should be column names, and the values should be the imputation values for each column.
         Values not in the dictionary will not be filled. This value cannot be a list.
         Default value is 0.
+    group_cols : List, optional
+        The columns by which the statistics are computed and the values are
+        filled or interpolated. Defaults to None.
 
     Returns
     -------
@@ -395,36 +565,4 @@ def missing_value_impute(
     >>> print(result)
     """
 
-    df = data.copy()
-    numerical_cols = df.select_dtypes(include="number").columns.tolist()
-    method = _check_impute_method(method, numerical_cols)
-    method_list = [
-        "mean",
-        "median",
-        "most_frequent",
-        "constant",
-        "ffill",
-        "bfill",
-        "custom",
-    ]
-
-    for strategy, cols_to_impute in method.items():
-        if strategy not in method_list:
-            raise ValueError(
-                "Invalid imputation method. Available methods are {}".format(
-                    method_list
-                )
-            )
-        if strategy in ["ffill", "bfill"]:
-            df[cols_to_impute] = df[cols_to_impute].fillna(method=strategy)
-        elif strategy == "custom":
-            df[cols_to_impute] = df[cols_to_impute].interpolate(
-                axis=0, limit_direction="both"
-            )
-        elif strategy == "constant":
-            df[cols_to_impute] = df[cols_to_impute].fillna(value=value)
-        else:
-            imputer = SimpleImputer(strategy=strategy)
-            df[cols_to_impute] = imputer.fit_transform(df[cols_to_impute])
-
-    return df
+    return Imputer(method, value=value, group_cols=group_cols).fit_transform(data)
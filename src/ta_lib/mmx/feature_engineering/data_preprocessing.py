@@ -1,7 +1,9 @@
 import logging
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 from math import exp, log
+from scipy.signal import lfilter
 from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.tsatools import add_trend
 from typing import List
@@ -445,6 +447,111 @@ def _s_curve_values(alpha: float, beta: float, x: float) -> float:
     return alpha * (1 - np.exp(-1 * beta * x))
 
 
+def _scurve_block(
+    x: np.ndarray, alpha: np.ndarray, beta: np.ndarray
+) -> np.ndarray:
+    """
+    Apply the S-curve transform for all the alpha and beta values at once.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        2-D array of shape (n_rows, n_columns).
+    alpha : np.ndarray
+        The alpha values.
+    beta : np.ndarray
+        The beta values.
+
+    Returns
+    -------
+    np.ndarray
+        2-D array of shape (n_rows, len(alpha) * len(beta) * n_columns) with the
+        columns ordered by alpha, then beta, then input column.
+    """
+    curve = _s_curve_values(
+        alpha=alpha[:, None, None, None], beta=beta[None, :, None, None], x=x
+    )
+    return curve.transpose(2, 0, 1, 3).reshape(x.shape[0], -1)
+
+
+def _scurve_column_names(columns: List, n_alpha: int, n_beta: int) -> List:
+    return [
+        f"{col}_alpha{idx_al}_beta{idx_beta}"
+        for idx_al in range(n_alpha)
+        for idx_beta in range(n_beta)
+        for col in columns
+    ]
+
+
+def _iter_scurve_blocks(
+    keys: pd.DataFrame,
+    x: np.ndarray,
+    columns: List,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    chunk_size: int,
+):
+    """Yield the key columns with the S-curved columns of each block of columns."""
+    for start in range(0, len(columns), chunk_size):
+        end = start + chunk_size
+        yield pd.concat(
+            [
+                keys,
+                pd.DataFrame(
+                    _scurve_block(x[:, start:end], alpha, beta),
+                    columns=_scurve_column_names(
+                        columns[start:end], len(alpha), len(beta)
+                    ),
+                ),
+            ],
+            axis=1,
+        )
+
+
+# default number of S-curved values per parquet row group written with ``path``,
+# about 8MB of float64 values
+_SCURVE_ROW_GROUP_VALUES = 2**20
+
+
+def _write_scurve_parquet(
+    path: str,
+    keys: pd.DataFrame,
+    x: np.ndarray,
+    columns: List,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    chunk_size: int = None,
+):
+    """Write the S-curved columns to a parquet file one row group at a time."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = _scurve_column_names(columns, len(alpha), len(beta))
+    if chunk_size is None:
+        n_rows = max(1, _SCURVE_ROW_GROUP_VALUES // len(names))
+    else:
+        # a row group holds about as many values as a block of ``chunk_size`` columns
+        n_rows = max(1, (chunk_size * x.shape[0]) // len(columns))
+    writer = None
+    try:
+        for start in range(0, x.shape[0], n_rows):
+            end = start + n_rows
+            chunk = pd.concat(
+                [
+                    keys.iloc[start:end].reset_index(drop=True),
+                    pd.DataFrame(_scurve_block(x[start:end], alpha, beta), columns=names),
+                ],
+                axis=1,
+            )
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
 def get_scurve_transform(
     data: pd.DataFrame,
     date_col: str,
@@ -452,9 +559,16 @@ def get_scurve_transform(
     beta: List,
     group_cols: List = None,
     columns: List = None,
+    dtype: str = "float64",
+    chunk_size: int = None,
+    lazy: bool = False,
+    path: str = None,
 ) -> pd.DataFrame:
     """Apply the S-curve transform to the specified columns in the input DataFrame.
 
+    The curves of all the alpha and beta values are computed at once by
+    broadcasting, one block of ``chunk_size`` columns at a time.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -471,69 +585,142 @@ def get_scurve_transform(
         A list of column names for which the S-curve transform has to be created.
         By default, it takes the list of all columns excluding group_cols and date_col.
         Defaults to None.
+    dtype : str, optional
+        The dtype of the S-curved columns, e.g. "float32" to halve the memory.
+        Defaults to "float64".
+    chunk_size : int, optional
+        The number of input columns transformed at once. Defaults to all the columns,
+        or with ``path`` to row groups of about a million S-curved values.
+    lazy : bool, optional
+        If True, an iterator over DataFrames with the key columns and the
+        S-curved columns of each block of ``chunk_size`` columns is returned
+        instead of a single DataFrame. Defaults to False.
+    path : str, optional
+        If given, the S-curved DataFrame is written to this parquet file without
+        being held in memory at once and the path is returned. Defaults to None.
 
     Returns
     -------
     pd.DataFrame
-        The DataFrame with the S-curved columns.
+        The DataFrame with the S-curved columns. An iterator of DataFrames if
+        ``lazy`` is True or the path of the parquet file if ``path`` is given.
+    pd.DataFrame
+        The mapping of the alpha and beta names used in the columns to their values.
     """
     if columns is None:
         if group_cols is not None:
             columns = [e for e in data.columns if e not in (*group_cols, date_col)]
         else:
             columns = [e for e in data.columns if e not in date_col]
+    columns = list(columns)
+
+    data_res, _ = _get_group_blocks(data, date_col, group_cols)
+    key_cols = [*group_cols, date_col] if group_cols is not None else [date_col]
+    keys = data_res[key_cols].reset_index(drop=True)
+    x = data_res[columns].to_numpy(dtype=dtype)
+    alpha_values = np.asarray(alpha, dtype=dtype)
+    beta_values = np.asarray(beta, dtype=dtype)
+
+    alpha_map = [[f"alpha{idx}", i] for idx, i in enumerate(alpha)]
+    beta_map = [[f"beta{idx}", i] for idx, i in enumerate(beta)]
+    for i in beta_map:
+        alpha_map.append(i)
+    map_df = pd.DataFrame(alpha_map, columns=["Name", "Value"])
+
+    if path is not None:
+        _write_scurve_parquet(
+            path, keys, x, columns, alpha_values, beta_values, chunk_size
+        )
+        return path, map_df
+
+    if chunk_size is None:
+        chunk_size = max(len(columns), 1)
+
+    if lazy:
+        blocks = _iter_scurve_blocks(
+            keys, x, columns, alpha_values, beta_values, chunk_size
+        )
+        return blocks, map_df
+
+    # fill a single preallocated array instead of concatenating the blocks
+    values = np.empty(
+        (x.shape[0], len(alpha_values), len(beta_values), len(columns)), dtype=dtype
+    )
+    for start in range(0, len(columns), chunk_size):
+        end = start + chunk_size
+        values[..., start:end] = _scurve_block(
+            x[:, start:end], alpha_values, beta_values
+        ).reshape(x.shape[0], len(alpha_values), len(beta_values), -1)
+    data_curve = pd.concat(
+        [
+            keys,
+            pd.DataFrame(
+                values.reshape(x.shape[0], -1),
+                columns=_scurve_column_names(columns, len(alpha), len(beta)),
+            ),
+        ],
+        axis=1,
+    )
+    return data_curve, map_df
+
+
+def _get_group_blocks(data: pd.DataFrame, date_col: str, group_cols: List = None):
+    """
+    Sort the data by group and date and locate the contiguous block of each group.
 
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The input DataFrame.
+    date_col : str
+        The name of the column in the data containing the dates.
+    group_cols : List[str], optional
+        A list of column names by which data has to be grouped. Defaults to None.
+
+    Returns
+    -------
+    pd.DataFrame
+        The sorted DataFrame.
+    np.ndarray
+        The boundaries of the group blocks in the sorted DataFrame i.e. rows
+        ``bounds[i]:bounds[i + 1]`` belong to the i-th group.
+    """
     if group_cols is not None:
         data_res = data.sort_values([*group_cols, date_col])
-        data_res["id"] = data_res.groupby(group_cols).ngroup()
+        ids = data_res.groupby(group_cols, sort=False, dropna=False).ngroup().values
+        starts = np.flatnonzero(np.diff(ids)) + 1
     else:
         data_res = data.sort_values([date_col])
-        data_res["id"] = 0
+        starts = np.array([], dtype=int)
+    bounds = np.concatenate([[0], starts, [len(data_res)]]).astype(int)
+    return data_res, bounds
 
-    ids = data_res["id"].unique()
 
-    data_curve = pd.DataFrame()
-    for id in ids:
-        # Dataframe with columns to curve and group var filtering
-        temp_data = data_res[data_res["id"] == id][columns]
+def _adstock_filter(x: np.ndarray, max_memory: int, decay: float) -> np.ndarray:
+    """
+    Apply the adstock transformation along the first axis of ``x``.
 
-        # Dataframe with curveed columns for single group var
-        tmp_curve = pd.DataFrame()
-        for idx_al, al in enumerate(alpha):
-            for idx_beta, be in enumerate(beta):
-                ad_dr = pd.DataFrame()
-                for i in temp_data.columns:
-                    ad_dr[i] = _s_curve_values(alpha=al, beta=be, x=temp_data[i])
-                ad_dr = ad_dr.add_suffix(f"_alpha{idx_al}_beta{idx_beta}")
-                tmp_curve = pd.concat([tmp_curve, ad_dr], axis=1)
+    With ``max_memory`` set to 0 the transformation is the recursive filter
+    ``y[t] = x[t] + decay * y[t-1]``, otherwise a FIR filter with the weights
+    ``decay**j`` for ``j`` in ``range(max_memory)``.
 
-        if group_cols is not None:
-            tmp_curve = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[*group_cols, date_col]].reset_index(
-                        drop=True
-                    ),
-                    tmp_curve.reset_index(drop=True),
-                ],
-                axis=1,
-            )
-        else:
-            tmp_curve = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[date_col]].reset_index(drop=True),
-                    tmp_curve.reset_index(drop=True),
-                ],
-                axis=1,
-            )
-        data_curve = pd.concat([data_curve, tmp_curve], ignore_index=True)
-
-    alpha_map = [[f"alpha{idx}", i] for idx, i in enumerate(alpha)]
-    beta_map = [[f"beta{idx}", i] for idx, i in enumerate(beta)]
-    for i in beta_map:
-        alpha_map.append(i)
-    map_df = pd.DataFrame(alpha_map, columns=["Name", "Value"])
+    Parameters
+    ----------
+    x : np.ndarray
+        The input array of shape (n_rows,) or (n_rows, n_columns).
+    max_memory : int
+        The cutoff for the adstock transformation.
+    decay : float
+        The decay factor for the feature.
 
-    return data_curve, map_df
+    Returns
+    -------
+    np.ndarray
+        The adstocked array with the same shape as ``x``.
+    """
+    if max_memory != 0:
+        return lfilter(decay ** np.arange(max_memory), [1.0], x, axis=0)
+    return lfilter([1.0], [1.0, -decay], x, axis=0)
 
 
 def _apply_adstock(x: List, max_memory: int, decay: float) -> pd.Series:
@@ -555,30 +742,42 @@ def _apply_adstock(x: List, max_memory: int, decay: float) -> pd.Series:
         The adstocked column.
     """
     # code reference from https://github.com/sibylhe/mmm_stan/blob/main/mmm_stan.py
+    x = np.asarray(x, dtype=float)
+    return pd.Series(_adstock_filter(x, max_memory, decay), copy=False)
 
-    adstocked_x = []
-
-    if max_memory != 0:
-        x = np.append(np.zeros(max_memory - 1), x)
-
-        weights = np.zeros(max_memory)
-        for j in range(max_memory):
-            weight = decay**j
-            weights[max_memory - 1 - j] = weight
 
-        for i in range(max_memory - 1, len(x)):
-            x_array = x[i - max_memory + 1 : i + 1]
-            xi = sum(x_array * weights)
-            adstocked_x.append(xi)
+def _adstock_blocks(
+    x: np.ndarray, bounds: np.ndarray, decays: List, max_memory: int
+) -> np.ndarray:
+    """
+    Adstock every group block of ``x`` for all the decays at once.
 
-    else:
-        for i in x:
-            if len(adstocked_x) == 0:
-                adstocked_x.append(i)
-            else:
-                adstocked_x.append(i + decay * adstocked_x[-1])
+    Parameters
+    ----------
+    x : np.ndarray
+        2-D array of shape (n_rows, n_columns) sorted by group and date.
+    bounds : np.ndarray
+        The boundaries of the group blocks in ``x``.
+    decays : List[float]
+        The decay factors.
+    max_memory : int
+        The cutoff for the adstock transformation.
 
-    return pd.Series(adstocked_x, copy=False)
+    Returns
+    -------
+    np.ndarray
+        2-D array of shape (n_rows, len(decays) * n_columns) with the adstocked
+        columns of each decay next to each other.
+    """
+    n_cols = x.shape[1]
+    out = np.empty((x.shape[0], len(decays) * n_cols))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        block = x[start:end]
+        for idx, decay in enumerate(decays):
+            out[start:end, idx * n_cols : (idx + 1) * n_cols] = _adstock_filter(
+                block, max_memory, decay
+            )
+    return out
 
 
 def create_adstock(
@@ -589,10 +788,15 @@ def create_adstock(
     group_cols: List = None,
     suffix: str = "",
     columns: List = None,
+    n_jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Create Adstock transformation for specified columns in the DataFrame.
 
+    All the columns of a group are transformed at once using a linear filter,
+    recursive (``scipy.signal.lfilter``) when the memory is infinite and a
+    FIR convolution otherwise.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -611,6 +815,8 @@ def create_adstock(
     columns : List[str], optional
         A list of column names for which Adstock transformation has to be created.
         By default, it takes the list of all columns excluding group_cols and date_col. Defaults to None.
+    n_jobs : int, optional
+        The number of processes across which the groups are split. Defaults to 1.
 
     Returns
     -------
@@ -625,53 +831,78 @@ def create_adstock(
         else:
             columns = [e for e in data.columns if e not in date_col]
 
-    if group_cols is not None:
-        data_res = data.sort_values([*group_cols, date_col])
-        data_res["id"] = data_res.groupby(group_cols).ngroup()
-    else:
-        data_res = data.sort_values([date_col])
-        data_res["id"] = 0
-
-    ids = data_res["id"].unique()
-
-    data_adstock = pd.DataFrame()
-    for id in ids:
-        # Dataframe with columns to adstock and group var filtering
-        temp_data = data_res[data_res["id"] == id][columns]
-
-        # Dataframe with adstocked columns for single group var
-        tmp_adstock = pd.DataFrame()
-        for n in half_lives:
-            decay_rate = exp(log(0.5) / n)
-            ad_dr = pd.DataFrame()
-            for i in temp_data.columns:
-                ad_dr[i] = _apply_adstock(
-                    temp_data[i], max_memory=max_memory, decay=decay_rate
-                )
-            ad_dr = ad_dr.add_suffix(f"_{n}").add_suffix(suffix)
-            tmp_adstock = pd.concat([tmp_adstock, ad_dr], axis=1)
+    data_res, bounds = _get_group_blocks(data, date_col, group_cols)
+    x = data_res[columns].to_numpy(dtype=float)
+    decays = [exp(log(0.5) / n) for n in half_lives]
 
-        if group_cols is not None:
-            tmp_adstock = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[*group_cols, date_col]].reset_index(
-                        drop=True
-                    ),
-                    tmp_adstock.reset_index(drop=True),
-                ],
-                axis=1,
-            )
-        else:
-            tmp_adstock = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[date_col]].reset_index(drop=True),
-                    tmp_adstock.reset_index(drop=True),
-                ],
-                axis=1,
+    if n_jobs == 1 or len(bounds) <= 2:
+        values = _adstock_blocks(x, bounds, decays, max_memory)
+    else:
+        # split the groups into contiguous chunks, one per job
+        n_chunks = min(len(bounds) - 1, effective_n_jobs(n_jobs))
+        cuts = np.unique(np.linspace(0, len(bounds) - 1, n_chunks + 1).astype(int))
+        chunks = Parallel(n_jobs=n_jobs)(
+            delayed(_adstock_blocks)(
+                x[bounds[lo] : bounds[hi]],
+                bounds[lo : hi + 1] - bounds[lo],
+                decays,
+                max_memory,
             )
-        data_adstock = pd.concat([data_adstock, tmp_adstock], ignore_index=True)
+            for lo, hi in zip(cuts[:-1], cuts[1:])
+        )
+        values = np.concatenate(chunks)
+
+    key_cols = [*group_cols, date_col] if group_cols is not None else [date_col]
+    adstock_cols = [f"{col}_{n}{suffix}" for n in half_lives for col in columns]
+    return pd.concat(
+        [
+            data_res[key_cols].reset_index(drop=True),
+            pd.DataFrame(values, columns=adstock_cols),
+        ],
+        axis=1,
+    )
 
-    return data_adstock
+
+def _lag_blocks(
+    x: np.ndarray, bounds: np.ndarray, lag: int, dtype: str = "float64"
+) -> np.ndarray:
+    """
+    Lag every group block of ``x`` and backfill the rows without a lagged value.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        2-D array of shape (n_rows, n_columns) sorted by group and date.
+    bounds : np.ndarray
+        The boundaries of the group blocks in ``x``.
+    lag : int
+        The number of rows to shift the values by.
+    dtype : str, optional
+        The dtype of the returned array. Defaults to "float64".
+
+    Returns
+    -------
+    np.ndarray
+        The lagged array with the same shape as ``x``.
+    """
+    n_rows = x.shape[0]
+    # first and last+1 row of the group each row belongs to
+    block_sizes = np.diff(bounds)
+    block_start = np.repeat(bounds[:-1], block_sizes)
+    block_end = np.repeat(bounds[1:], block_sizes)
+
+    src = np.arange(n_rows) - lag
+    valid = (src >= block_start) & (src < block_end)
+    out = np.full(x.shape, np.nan, dtype=dtype)
+    out[valid] = x[src[valid]]
+
+    # backfill within the group: index of the next non-missing row at or after
+    # each row, discarded if it falls in the next group.
+    row_idx = np.where(np.isnan(out), n_rows, np.arange(n_rows)[:, None])
+    next_idx = np.minimum.accumulate(row_idx[::-1], axis=0)[::-1]
+    fill = np.isnan(out) & (next_idx < block_end[:, None])
+    out[fill] = out[next_idx[fill], np.nonzero(fill)[1]]
+    return out
 
 
 def create_lag(
@@ -681,10 +912,14 @@ def create_lag(
     group_cols: List = None,
     suffix: str = "",
     columns: List = None,
+    dtype: str = "float64",
 ) -> pd.DataFrame:
     """
     Create lagged columns for specified columns in the DataFrame.
 
+    The lags of all the columns and groups are created together using a
+    single index shift per lag over the data sorted by group and date.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -700,6 +935,9 @@ def create_lag(
     columns : List[str], optional
         A list of column names for which lagged columns are to be created.
         By default, it takes the list of all columns excluding group_cols and date_col. Defaults to None.
+    dtype : str, optional
+        The dtype of the lagged columns. Use "float32" to halve the memory
+        on wide data. Defaults to "float64".
 
     Returns
     -------
@@ -714,50 +952,25 @@ def create_lag(
         else:
             columns = [e for e in data.columns if e not in date_col]
 
-    if group_cols is not None:
-        data_res = data.sort_values([*group_cols, date_col])
-        data_res["id"] = data_res.groupby(group_cols).ngroup()
-    else:
-        data_res = data.sort_values([date_col])
-        data_res["id"] = 0
-
-    ids = data_res["id"].unique()
-
-    data_lag = pd.DataFrame()
-    for id in ids:
-        # Dataframe with columns to lag and group var filtering
-        temp_data = data_res[data_res["id"] == id][columns]
+    data_res, bounds = _get_group_blocks(data, date_col, group_cols)
+    x = data_res[columns].to_numpy(dtype=dtype)
 
-        # Dataframe with lag columns for single group var
-        tmp_lag = pd.DataFrame()
-        for n in lags:
-            ad_dr = pd.DataFrame()
-            for i in temp_data.columns:
-                ad_dr[i] = temp_data[i].shift(n).fillna(method="bfill")
-            ad_dr = ad_dr.add_suffix(f"_{n}").add_suffix(suffix)
-            tmp_lag = pd.concat([tmp_lag, ad_dr], axis=1)
-
-        if group_cols is not None:
-            tmp_lag = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[*group_cols, date_col]].reset_index(
-                        drop=True
-                    ),
-                    tmp_lag.reset_index(drop=True),
-                ],
-                axis=1,
-            )
-        else:
-            tmp_lag = pd.concat(
-                [
-                    data_res[data_res["id"] == id][[date_col]].reset_index(drop=True),
-                    tmp_lag.reset_index(drop=True),
-                ],
-                axis=1,
-            )
-        data_lag = pd.concat([data_lag, tmp_lag], ignore_index=True)
+    n_cols = len(columns)
+    values = np.empty((len(data_res), len(lags) * n_cols), dtype=dtype)
+    for idx, n in enumerate(lags):
+        values[:, idx * n_cols : (idx + 1) * n_cols] = _lag_blocks(
+            x, bounds, n, dtype=dtype
+        )
 
-    return data_lag
+    key_cols = [*group_cols, date_col] if group_cols is not None else [date_col]
+    lag_cols = [f"{col}_{n}{suffix}" for n in lags for col in columns]
+    return pd.concat(
+        [
+            data_res[key_cols].reset_index(drop=True),
+            pd.DataFrame(values, columns=lag_cols),
+        ],
+        axis=1,
+    )
 
 
 def add_rolling_average(
@@ -817,3 +1030,193 @@ def add_rolling_average(
         raise ValueError(
             "Invalid remove_rows option . Accepatable inputs are keep ,drop and append"
         )
+
+
+def _rolling_mean_blocks(x: np.ndarray, bounds: np.ndarray, window: int) -> np.ndarray:
+    """
+    Compute the moving average of every group block of ``x``.
+
+    Rows with less than ``window`` values in their group up to and including
+    the row, or with a missing value within the window, are set to NaN.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        2-D array of shape (n_rows, n_columns) sorted by group and date.
+    bounds : np.ndarray
+        The boundaries of the group blocks in ``x``.
+    window : int
+        The size of the moving window.
+
+    Returns
+    -------
+    np.ndarray
+        The moving averages with the same shape as ``x``.
+    """
+    valid = ~np.isnan(x)
+    zeros = np.zeros((1, x.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, x, 0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+
+    rows = np.arange(x.shape[0])
+    block_start = np.repeat(bounds[:-1], np.diff(bounds))
+    window_start = np.maximum(rows - window + 1, block_start)
+    out = (sums[rows + 1] - sums[window_start]) / window
+    n_valid = counts[rows + 1] - counts[window_start]
+    out[(n_valid < window) | (rows - window + 1 < block_start)[:, None]] = np.nan
+    return out
+
+
+class MediaTransformPipeline:
+    """Chain of media transformations sharing a single sort and group index.
+
+    The data is sorted by group and date and the boundaries of the groups are
+    located once. Every step then transforms the output columns of the
+    previous step (the input ``columns`` for the first step) over the same
+    contiguous blocks, and the columns generated by all the steps are written
+    into a single array.
+
+    Parameters
+    ----------
+    date_col : str
+        The name of the column in the data containing the dates.
+    group_cols : List[str], optional
+        A list of column names by which data has to be grouped. Defaults to None.
+    columns : List[str], optional
+        A list of column names to transform.
+        By default, it takes the list of all columns excluding group_cols and date_col.
+        Defaults to None.
+    dtype : str, optional
+        The dtype of the generated columns. Defaults to "float64".
+
+    Examples
+    --------
+    >>> pipeline = (
+    ...     MediaTransformPipeline("date", group_cols=["geo"], columns=["tv", "search"])
+    ...     .add_adstock(half_lives=[2, 4])
+    ...     .add_scurve(alpha=[1.0], beta=[0.5, 1.0])
+    ...     .add_lag(lags=[1, 2])
+    ...     .add_rolling_average(windows=[4])
+    ... )
+    >>> features = pipeline.transform(data)
+    """
+
+    def __init__(
+        self,
+        date_col: str,
+        group_cols: List = None,
+        columns: List = None,
+        dtype: str = "float64",
+    ):
+        self.date_col = date_col
+        self.group_cols = group_cols
+        self.columns = columns
+        self.dtype = dtype
+        self.steps = []
+
+    def add_adstock(self, half_lives: List, max_memory: int = 0, suffix: str = ""):
+        """Add an adstock step, see ``create_adstock``."""
+        decays = [exp(log(0.5) / n) for n in half_lives]
+        self.steps.append(
+            (
+                lambda x, bounds: _adstock_blocks(x, bounds, decays, max_memory),
+                lambda cols: [f"{col}_{n}{suffix}" for n in half_lives for col in cols],
+            )
+        )
+        return self
+
+    def add_scurve(self, alpha: List, beta: List):
+        """Add a S-curve saturation step, see ``get_scurve_transform``."""
+        alpha_values = np.asarray(alpha, dtype=self.dtype)
+        beta_values = np.asarray(beta, dtype=self.dtype)
+        self.steps.append(
+            (
+                lambda x, bounds: _scurve_block(x, alpha_values, beta_values),
+                lambda cols: _scurve_column_names(cols, len(alpha), len(beta)),
+            )
+        )
+        return self
+
+    def add_lag(self, lags: List, suffix: str = ""):
+        """Add a lag step, see ``create_lag``."""
+        dtype = self.dtype
+        self.steps.append(
+            (
+                lambda x, bounds: np.concatenate(
+                    [_lag_blocks(x, bounds, n, dtype=dtype) for n in lags], axis=1
+                ),
+                lambda cols: [f"{col}_{n}{suffix}" for n in lags for col in cols],
+            )
+        )
+        return self
+
+    def add_rolling_average(self, windows: List):
+        """Add a moving average step computed within each group."""
+        self.steps.append(
+            (
+                lambda x, bounds: np.concatenate(
+                    [_rolling_mean_blocks(x, bounds, n) for n in windows], axis=1
+                ),
+                lambda cols: [f"{col}_roll{n}" for n in windows for col in cols],
+            )
+        )
+        return self
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply all the steps to the data.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The input DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the group and date columns followed by the columns
+            generated by every step, sorted by group and date.
+
+        Raises
+        ------
+        ValueError
+            If no steps have been added to the pipeline.
+        """
+        if not self.steps:
+            raise ValueError("No transformation steps added to the pipeline")
+
+        date_col, group_cols, columns = self.date_col, self.group_cols, self.columns
+        if columns is None:
+            if group_cols is not None:
+                columns = [e for e in data.columns if e not in (*group_cols, date_col)]
+            else:
+                columns = [e for e in data.columns if e not in date_col]
+
+        data_res, bounds = _get_group_blocks(data, date_col, group_cols)
+
+        step_cols = []
+        cols = list(columns)
+        for _, get_names in self.steps:
+            cols = get_names(cols)
+            step_cols.append(cols)
+
+        values = np.empty(
+            (len(data_res), sum(len(cols) for cols in step_cols)), dtype=self.dtype
+        )
+        x = data_res[columns].to_numpy(dtype=self.dtype)
+        start = 0
+        for (apply_step, _), cols in zip(self.steps, step_cols):
+            end = start + len(cols)
+            values[:, start:end] = apply_step(x, bounds)
+            # the next step transforms the columns generated by this one
+            x = values[:, start:end]
+            start = end
+
+        key_cols = [*group_cols, date_col] if group_cols is not None else [date_col]
+        return pd.concat(
+            [
+                data_res[key_cols].reset_index(drop=True),
+                pd.DataFrame(values, columns=[c for cols in step_cols for c in cols]),
+            ],
+            axis=1,
+        )
@@ -1,5 +1,6 @@
 from .bayesian_modelling import (
     create_model_equation,
+    get_posterior_coefficient_matrix,
     load_bambi_model,
     process_input_priors,
     save_bambi_model,
@@ -10,6 +10,9 @@ from typing import Tuple
 from .data_preparation import prepare_train_test_data
 from .evaluation_utils import get_act_vs_preds_df
 
+# decimals of the posterior means reported by az.summary
+_SUMMARY_DECIMALS = 2
+
 
 def process_input_priors(pr_cfg_df: pd.DataFrame, data: pd.DataFrame) -> dict:
     """
@@ -246,36 +249,32 @@ def _get_coefficient_matrix_bayesian(
         Coefficient matrix.
     """
 
-    # Initialize the output matrix with zeros
-    output_matrix = pd.DataFrame(
-        0, index=group_values, columns=feature_cols + [intercept_col]
+    columns = feature_cols + [intercept_col]
+    output_matrix = pd.DataFrame(0.0, index=group_values, columns=columns)
+    names = input_df["feature names"].astype(str).reset_index(drop=True)
+    coefficients = input_df["feature coefficients"].reset_index(drop=True)
+
+    # fixed intercept and slopes, the last coefficient of a feature wins
+    is_fixed = names.isin(columns)
+    fixed = coefficients[is_fixed].groupby(names[is_fixed].values).last()
+    output_matrix.loc[:, fixed.index] = np.broadcast_to(
+        fixed.values, (len(group_values), len(fixed))
     )
 
-    # Calculate the final coefficients for each feature
-    for i, row in input_df.iterrows():
-        feature_name = row["feature names"]
-        feature_coefficient = row["feature coefficients"]
-
-        # fixed intercept
-        if feature_name == intercept_col:
-            output_matrix.loc[:, intercept_col] = feature_coefficient
-
-        # fixed slopes
-        elif feature_name in feature_cols:
-            output_matrix.loc[:, feature_name] = feature_coefficient
-
-        # random intercept and slopes
-        else:
-            # we want to extract feature_name and group_value
-            # from this string ----> feature_name|group_col[group_value]
-            pattern = r"^(.*)\|.*\[(.*)\]$"
-            matches = re.match(pattern, feature_name)
-            if matches:
-                column_name = (
-                    intercept_col if matches.group(1) == "1" else matches.group(1)
-                )
-                group_index = matches.group(2)
-                output_matrix.loc[group_index, column_name] += feature_coefficient
+    # random intercept and slopes
+    # we want to extract feature_name and group_value
+    # from this string ----> feature_name|group_col[group_value]
+    random = names[~is_fixed].str.extract(r"^(.*)\|.*\[(.*)\]$")
+    random.columns = ["column_name", "group_value"]
+    random["coefficient"] = coefficients[~is_fixed]
+    random = random.dropna(subset=["column_name", "group_value"])
+    random["column_name"] = random["column_name"].where(
+        random["column_name"] != "1", intercept_col
+    )
+    random = random.pivot_table(
+        index="group_value", columns="column_name", values="coefficient", aggfunc="sum"
+    ).reindex(index=[str(val) for val in group_values], columns=columns)
+    output_matrix += random.fillna(0).values
 
     output_matrix.columns = [f"beta_{col}" for col in feature_cols] + [intercept_col]
     output_matrix = output_matrix.reset_index()
@@ -286,6 +285,156 @@ def _get_coefficient_matrix_bayesian(
     return output_matrix
 
 
+def _get_posterior_coefficients(
+    posterior, feature_cols: list, intercept_col: str, group_values: list, draws: bool
+) -> np.ndarray:
+    """
+    Sum the fixed and random effects of the posterior for each group.
+
+    Parameters
+    ----------
+    posterior : xarray.Dataset
+        The posterior group of the InferenceData returned by the bambi model.
+    feature_cols : list
+        List of feature columns which were used to train the model.
+    intercept_col : str
+        Name of the intercept variable.
+    group_values : list
+        List of unique values present in the group column of the data.
+    draws : bool
+        If True, the coefficients of every draw are returned, otherwise those
+        of the posterior means rounded to 2 decimals.
+
+    Returns
+    -------
+    np.ndarray
+        Coefficients of shape (n_draws, n_groups, n_features + 1) with the
+        intercept last. n_draws is 1 for the posterior mean.
+    """
+    columns = feature_cols + [intercept_col]
+    sample_dims = ["chain", "draw"]
+    if draws:
+        posterior = posterior.stack(sample=sample_dims)
+        n_samples = posterior.sizes["sample"]
+    else:
+        # the coefficients are linear in the effects so the mean of their sum
+        # is the sum of their means, rounded as the means of ``az.summary``
+        posterior = (
+            posterior.mean(dim=sample_dims)
+            .round(_SUMMARY_DECIMALS)
+            .expand_dims("sample")
+        )
+        n_samples = 1
+
+    group_index = pd.Index([str(val) for val in group_values])
+    coefficients = np.zeros((n_samples, len(group_values), len(columns)))
+    for name, var in posterior.data_vars.items():
+        extra_dims = [dim for dim in var.dims if dim != "sample"]
+        if name in columns and not extra_dims:
+            coefficients[:, :, columns.index(name)] = var.values[:, None]
+            continue
+
+        # random effects are named feature_name|group_col with a group dimension
+        matches = re.match(r"^(.*)\|(.*)$", name)
+        if not matches or len(extra_dims) != 1:
+            continue
+        column_name = intercept_col if matches.group(1) == "1" else matches.group(1)
+        if column_name not in columns:
+            continue
+        values = var.transpose("sample", extra_dims[0]).values
+        groups = group_index.get_indexer(
+            [str(val) for val in var[extra_dims[0]].values]
+        )
+        found = groups >= 0
+        coefficients[:, groups[found], columns.index(column_name)] += values[:, found]
+    return coefficients
+
+
+def get_posterior_coefficient_matrix(
+    inference_data: az.InferenceData,
+    feature_cols: list,
+    group_col: str,
+    group_values: list,
+    intercept_col: str = "Intercept",
+    draws: bool = False,
+) -> pd.DataFrame:
+    """
+    Generate a coefficient matrix straight from the posterior of a bambi model.
+
+    This gives the same matrix as ``_get_coefficient_matrix_bayesian`` on the
+    posterior means without computing ``az.summary``, whose rounding of the
+    means to 2 decimals is kept, and optionally the matrix of every posterior
+    draw to propagate the uncertainty.
+
+    Parameters
+    ----------
+    inference_data : az.InferenceData
+        Inference data returned by the bambi model.
+    feature_cols : list
+        List of feature columns which were used to train the model.
+    group_col : str
+        Column name of the group variable.
+    group_values : list
+        List of unique values present in the group column of the data.
+    intercept_col : str, optional
+        Name of the intercept variable. Defaults to "Intercept".
+    draws : bool, optional
+        If True, the coefficient matrix of every posterior draw is returned with
+        an additional "draw" column. Defaults to False.
+
+    Returns
+    -------
+    pd.DataFrame
+        Coefficient matrix.
+    """
+    coefficients = _get_posterior_coefficients(
+        inference_data.posterior, feature_cols, intercept_col, group_values, draws
+    )
+    n_samples, n_groups, _ = coefficients.shape
+    output_matrix = pd.DataFrame(
+        coefficients.reshape(n_samples * n_groups, -1),
+        columns=[f"beta_{col}" for col in feature_cols] + [intercept_col],
+    )
+    output_matrix.insert(0, group_col, np.tile(group_values, n_samples))
+    if draws:
+        output_matrix.insert(0, "draw", np.repeat(np.arange(n_samples), n_groups))
+    output_matrix["e_intercept"] = np.exp(output_matrix[intercept_col])
+    return output_matrix
+
+
+def _get_posterior_means(inference_data: az.InferenceData) -> pd.DataFrame:
+    """
+    Get the posterior means of the model variables named and rounded as in ``az.summary``.
+
+    Parameters
+    ----------
+    inference_data : az.InferenceData
+        Inference data returned by the bambi model.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with the "feature names" and "feature coefficients" columns.
+    """
+    means = inference_data.posterior.mean(dim=["chain", "draw"]).round(
+        _SUMMARY_DECIMALS
+    )
+    names, values = [], []
+    for name, var in means.data_vars.items():
+        if "y_mean" in name:
+            continue
+        if var.ndim == 0:
+            names.append(name)
+            values.append(float(var.values))
+            continue
+        flat = var.stack(flat=var.dims)
+        for idx in flat["flat"].values:
+            idx = idx if isinstance(idx, tuple) else (idx,)
+            names.append(f"{name}[{', '.join(str(val) for val in idx)}]")
+        values.extend(flat.values.tolist())
+    return pd.DataFrame({"feature names": names, "feature coefficients": values})
+
+
 def train_bayesian_model(
     data: pd.DataFrame,
     idv_cols: list,
@@ -374,21 +523,16 @@ def train_bayesian_model(
             inference_object=trace,
         )
 
-    # Get the posterior distribution of the model coefficients
-    feature_df = (
-        az.summary(trace)["mean"].reset_index().query("~index.str.contains('y_mean')")
-    )
-    feature_df = feature_df.rename(
-        columns={"index": "feature names", "mean": "feature coefficients"}
-    )
+    # Get the posterior means of the model coefficients
+    feature_df = _get_posterior_means(trace)
 
     group_values = data[group_col].unique().tolist()
-    coeff_matrix = _get_coefficient_matrix_bayesian(
-        input_df=feature_df,
+    coeff_matrix = get_posterior_coefficient_matrix(
+        inference_data=trace,
         feature_cols=idv_cols,
-        intercept_col="Intercept",
         group_col=group_col,
         group_values=group_values,
+        intercept_col="Intercept",
     )
 
     # Make predictions on the training and test data
@@ -0,0 +1 @@
+from .budget_optimization import get_response, optimize_budget
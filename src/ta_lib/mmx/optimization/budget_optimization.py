@@ -0,0 +1,342 @@
+import numpy as np
+import pandas as pd
+import time
+from joblib import Parallel, delayed
+from math import exp, log
+from scipy.optimize import minimize
+from typing import Dict, Union
+
+MODEL_TYPES = ["additive", "multiplicative"]
+
+
+def _adstock_multiplier(half_life: float, max_memory: int) -> float:
+    """
+    Return the steady state gain of the adstock transformation.
+
+    A constant spend ``x`` per period is adstocked to ``x * multiplier`` once
+    the carry over has built up, see ``create_adstock``.
+
+    Parameters
+    ----------
+    half_life : float
+        The half-life of the adstock. No adstock is applied when it is missing or 0.
+    max_memory : int
+        The number of periods after which the decay effect stops, 0 for no limit.
+
+    Returns
+    -------
+    float
+        The adstock multiplier.
+    """
+    if pd.isna(half_life) or half_life == 0:
+        return 1.0
+    decay = exp(log(0.5) / half_life)
+    if pd.isna(max_memory) or max_memory == 0:
+        return 1 / (1 - decay)
+    return float(np.sum(decay ** np.arange(int(max_memory))))
+
+
+def _get_curve_params(channel_params: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Get the response curve parameters of the channels as arrays.
+
+    Parameters
+    ----------
+    channel_params : pd.DataFrame
+        The response curve parameters of the channels, see ``optimize_budget``.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The adstock multipliers and the S-curve alpha and beta of the channels.
+        Channels without S-curve parameters respond linearly.
+    """
+    params = channel_params.reindex(
+        columns=["half_life", "max_memory", "alpha", "beta"]
+    )
+    multiplier = np.array(
+        [
+            _adstock_multiplier(hl, mm)
+            for hl, mm in zip(params["half_life"], params["max_memory"])
+        ]
+    )
+    return {
+        "multiplier": multiplier,
+        "alpha": params["alpha"].to_numpy(dtype=float),
+        "beta": params["beta"].to_numpy(dtype=float),
+    }
+
+
+def _channel_response(spend: np.ndarray, curves: Dict[str, np.ndarray]):
+    """
+    Evaluate the transformed value of the spends and its derivative.
+
+    Parameters
+    ----------
+    spend : np.ndarray
+        Spend per period of shape (..., n_channels).
+    curves : Dict[str, np.ndarray]
+        Parameters returned by ``_get_curve_params``.
+
+    Returns
+    -------
+    np.ndarray
+        The S-curved adstock of the spends.
+    np.ndarray
+        The derivative of the S-curved adstock with respect to the spends.
+    """
+    multiplier, alpha, beta = curves["multiplier"], curves["alpha"], curves["beta"]
+    linear = np.isnan(alpha) | np.isnan(beta)
+    alpha = np.where(linear, 1.0, alpha)
+    beta = np.where(linear, 0.0, beta)
+
+    adstock = spend * multiplier
+    decay = np.exp(-beta * adstock)
+    value = np.where(linear, adstock, alpha * (1 - decay))
+    gradient = np.where(linear, multiplier, alpha * beta * multiplier * decay)
+    return value, gradient
+
+
+def get_response(
+    spend: np.ndarray,
+    coeffs: np.ndarray,
+    channel_params: pd.DataFrame,
+    model_type: str = "additive",
+    e_intercept: float = 1.0,
+):
+    """
+    Compute the response to the spends and its gradient in closed form.
+
+    Parameters
+    ----------
+    spend : np.ndarray
+        Spend per period of shape (..., n_channels), e.g. a grid of spends to
+        plot the response curves.
+    coeffs : np.ndarray
+        The model coefficients of the channels.
+    channel_params : pd.DataFrame
+        The response curve parameters of the channels, see ``optimize_budget``.
+    model_type : str, optional
+        Either "additive" for a linear model or "multiplicative" for a
+        log-linear model. Defaults to "additive".
+    e_intercept : float, optional
+        The exponentiated intercept of a multiplicative model. Defaults to 1.
+
+    Returns
+    -------
+    np.ndarray
+        The response of shape (...,).
+    np.ndarray
+        The gradient of the response with respect to the spends of shape
+        (..., n_channels).
+
+    Raises
+    ------
+    ValueError
+        If the model_type is not "additive" or "multiplicative".
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError("model_type must be one of {}".format(MODEL_TYPES))
+    return _response(
+        np.asarray(spend, dtype=float),
+        np.asarray(coeffs, dtype=float),
+        _get_curve_params(channel_params),
+        model_type,
+        e_intercept,
+    )
+
+
+def _response(spend, coeffs, curves, model_type, e_intercept):
+    value, gradient = _channel_response(spend, curves)
+    if model_type == "additive":
+        return (coeffs * value).sum(axis=-1), coeffs * gradient
+    response = e_intercept * np.exp((coeffs * value).sum(axis=-1))
+    return response, response[..., None] * coeffs * gradient
+
+
+def _solve_group(
+    coeffs: np.ndarray,
+    e_intercept: float,
+    curves: Dict[str, np.ndarray],
+    budget: float,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    model_type: str,
+) -> dict:
+    """
+    Find the split of the budget maximizing the response of a group.
+
+    Parameters
+    ----------
+    coeffs : np.ndarray
+        The model coefficients of the channels for the group.
+    e_intercept : float
+        The exponentiated intercept of the group.
+    curves : Dict[str, np.ndarray]
+        Parameters returned by ``_get_curve_params``.
+    budget : float
+        The total spend per period to allocate.
+    lower : np.ndarray
+        The minimum spend of each channel.
+    upper : np.ndarray
+        The maximum spend of each channel.
+    model_type : str
+        Either "additive" or "multiplicative".
+
+    Returns
+    -------
+    dict
+        The optimal spends, their response and the solver status and time.
+    """
+    start_time = time.perf_counter()
+
+    # start from the bounds filled in proportion to their width
+    room = np.minimum(upper, budget) - lower
+    x0 = lower.copy()
+    if room.sum() > 0:
+        x0 += (budget - lower.sum()) * room / room.sum()
+
+    # the log of a multiplicative response is the additive response, which has
+    # the same maximum without the exponential growth of the values and their
+    # gradients. It is scaled by its initial value to keep the problem well
+    # conditioned for any currency or KPI units
+    scale = abs(_response(x0, coeffs, curves, "additive", e_intercept)[0]) or 1.0
+
+    def objective(x):
+        value, gradient = _response(x, coeffs, curves, "additive", e_intercept)
+        return -value / scale, -gradient / scale
+
+    result = minimize(
+        objective,
+        x0,
+        jac=True,
+        method="SLSQP",
+        options={"ftol": 1e-10, "maxiter": 500},
+        bounds=list(zip(lower, upper)),
+        constraints=[
+            {
+                "type": "eq",
+                "fun": lambda x: x.sum() - budget,
+                "jac": lambda x: np.ones_like(x),
+            }
+        ],
+    )
+    spend = np.clip(result.x, lower, upper)
+    value, _ = _response(spend, coeffs, curves, model_type, e_intercept)
+    return {
+        "spend": spend,
+        "response": value,
+        "initial_response": _response(x0, coeffs, curves, model_type, e_intercept)[0],
+        "success": result.success,
+        "message": result.message,
+        "solve_time": time.perf_counter() - start_time,
+    }
+
+
+def optimize_budget(
+    coeff_matrix: pd.DataFrame,
+    channel_params: pd.DataFrame,
+    budget: Union[float, Dict],
+    model_type: str = "additive",
+    n_jobs: int = 1,
+):
+    """
+    Allocate the budget of each group across the marketing channels.
+
+    The response of a channel to a constant spend ``x`` per period is the model
+    coefficient times the S-curve of the steady state adstock of ``x``.
+    The responses and their gradients are evaluated in closed form, so that
+    each group is solved with SLSQP in milliseconds.
+
+    Parameters
+    ----------
+    coeff_matrix : pd.DataFrame
+        Coefficient matrix with the group column first, as returned by
+        ``_get_coefficient_matrix_linear`` or ``_get_coefficient_matrix_bayesian``.
+    channel_params : pd.DataFrame
+        One row per marketing channel with the columns:
+
+        - 'variable_name': name of the channel variable in the model (``beta_<variable_name>``).
+        - 'half_life', 'max_memory': adstock parameters, see ``create_adstock``. Optional.
+        - 'alpha', 'beta': S-curve parameters, see ``get_scurve_transform``.
+          Channels without them respond linearly. Optional.
+        - 'min_spend', 'max_spend': bounds of the spend per period. Optional,
+          defaults to 0 and the budget.
+    budget : float or dict
+        The total spend per period to allocate, for all the groups or by group.
+    model_type : str, optional
+        Either "additive" for a linear model or "multiplicative" for a
+        log-linear model. Defaults to "additive".
+    n_jobs : int, optional
+        The number of groups solved in parallel. Defaults to 1.
+
+    Returns
+    -------
+    pd.DataFrame
+        The optimal spend of each channel for each group and its response, i.e.
+        the coefficient times the S-curved adstock (the contribution to the log
+        of the KPI for a multiplicative model).
+    pd.DataFrame
+        The budget, the initial and optimal total response, the solver status
+        and the solve time in seconds of each group.
+
+    Raises
+    ------
+    ValueError
+        If the model_type is not valid or if the bounds of the channels cannot
+        meet the budget of a group.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError("model_type must be one of {}".format(MODEL_TYPES))
+
+    group_col = coeff_matrix.columns[0]
+    groups = coeff_matrix[group_col].tolist()
+    channels = channel_params["variable_name"].tolist()
+    coeffs = coeff_matrix[[f"beta_{col}" for col in channels]].to_numpy(dtype=float)
+    if "e_intercept" in coeff_matrix:
+        e_intercepts = coeff_matrix["e_intercept"].to_numpy(dtype=float)
+    else:
+        e_intercepts = np.ones(len(groups))
+    curves = _get_curve_params(channel_params)
+
+    budgets = [budget[group] if isinstance(budget, dict) else budget for group in groups]
+    spend_bounds = channel_params.reindex(columns=["min_spend", "max_spend"])
+    lower = spend_bounds["min_spend"].fillna(0.0).to_numpy(dtype=float)
+    bounds = []
+    for group, group_budget in zip(groups, budgets):
+        upper = spend_bounds["max_spend"].fillna(group_budget).to_numpy(dtype=float)
+        if lower.sum() > group_budget or upper.sum() < group_budget:
+            raise ValueError(
+                f"Channel spend bounds cannot meet the budget of group {group}"
+            )
+        bounds.append((lower, upper))
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_solve_group)(
+            coeffs[i], e_intercepts[i], curves, budgets[i], *bounds[i], model_type
+        )
+        for i in range(len(groups))
+    )
+
+    spends = np.stack([res["spend"] for res in results])
+    channel_response, _ = _channel_response(spends, curves)
+    allocation = pd.DataFrame(
+        {
+            group_col: np.repeat(groups, len(channels)),
+            "variable_name": np.tile(channels, len(groups)),
+            "spend": spends.ravel(),
+            "response": (coeffs * channel_response).ravel(),
+        }
+    )
+    summary = pd.DataFrame(
+        {
+            group_col: groups,
+            "budget": budgets,
+            "initial_response": [res["initial_response"] for res in results],
+            "optimal_response": [res["response"] for res in results],
+            "success": [res["success"] for res in results],
+            "message": [res["message"] for res in results],
+            "solve_time": [res["solve_time"] for res in results],
+        }
+    )
+    return allocation, summary
@@ -3,12 +3,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from sklearn.cluster import KMeans
+from collections.abc import Mapping
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_samples, silhouette_score
-from sklearn.metrics.pairwise import euclidean_distances
 
-from ta_lib.rtm.dunn import dunn  # noqa
+from ta_lib.rtm.dunn import dunn
 
 
 def pca_plot(dataframe, label, reverse=False, palette="coolwarm"):
@@ -51,6 +52,62 @@ def pca_plot(dataframe, label, reverse=False, palette="coolwarm"):
     plt.legend(loc="right", title="No of clusters")
 
 
+def _compact_labels(labels, n_clusters):
+    """Return the cluster labels in the smallest integer dtype that holds them."""
+    dtype = np.int8 if n_clusters <= np.iinfo(np.int8).max + 1 else np.int16
+    return labels.astype(dtype)
+
+
+def _fit_n_clusters(X, n_clusters, estimator, sample_idx, random_state, batch_size):
+    """Fit a clustering with ``n_clusters`` clusters and score it."""
+    if estimator == "minibatch":
+        model = MiniBatchKMeans(
+            n_clusters=n_clusters, random_state=random_state, batch_size=batch_size
+        )
+    else:
+        model = KMeans(n_clusters=n_clusters, random_state=random_state)
+    model.fit(X)
+    labels = model.predict(X)
+
+    X_sample, labels_sample = X, labels
+    if sample_idx is not None:
+        X_sample, labels_sample = X[sample_idx], labels[sample_idx]
+    return {
+        "model": model,
+        "inertia": model.inertia_,
+        "labels": _compact_labels(labels, n_clusters),
+        "sc_score": silhouette_score(X_sample, labels_sample),
+        "dunn": dunn(labels_sample, X=X_sample),
+    }
+
+
+class _LabelledData(Mapping):
+    """Labelled dataframes of a fitted `KMeansClustering` by number of clusters, built on first lookup."""
+
+    def __init__(self, df, predicted, low, high):
+        self._df = df
+        self._predicted = predicted
+        self._low = low
+        self._high = high
+        self._data = {}
+
+    def __getitem__(self, cluster_no):
+        if cluster_no not in self._data:
+            if not (self._low <= cluster_no <= self._high):
+                raise KeyError(cluster_no)
+            labels = self._predicted[cluster_no - self._low]
+            self._data[cluster_no] = pd.concat(
+                [self._df, pd.DataFrame(labels, columns=["Label"])], axis=1
+            )
+        return self._data[cluster_no]
+
+    def __iter__(self):
+        return iter(range(self._low, self._high + 1))
+
+    def __len__(self):
+        return self._high - self._low + 1
+
+
 class KMeansClustering:
     """Class allows to get the cluster metrics by building clusters on KMeansClustering++ algorithm.
 
@@ -80,8 +137,18 @@ class KMeansClustering:
         self.high = high
         self.df = df
         self.METHODS = ["scaled", "pca"]
-
-    def fit(self, method="pca", pc_var=0.95):
+        self.ESTIMATORS = ["kmeans", "minibatch"]
+
+    def fit(
+        self,
+        method="pca",
+        pc_var=0.95,
+        estimator="kmeans",
+        sample_size=None,
+        random_state=42,
+        batch_size=1024,
+        n_jobs=1,
+    ):
         """Fits the KMeansClustering clustering model with the specified method.
 
         This method fits a KMeans clustering model on the data stored in the `self.df` attribute.
@@ -89,10 +156,13 @@ class KMeansClustering:
         which can be either 'pca' or 'scaled'.
         For each number of clusters in the range from `self.low` to `self.high`,
         the sum of squared distances of samples to their closest cluster center (inertia),
-        predicted labels for each sample,
-        and the silhouette score of the clustering are calculated and stored in the `inertia`,
-        `predicted`, and `sc_score` instance variables, respectively.
-        A labelled dataframe is also created for each number of clusters and stored in the `labelled_df` instance variable. The labelled dataframe contains the original data plus a column indicating the predicted cluster label for each sample.
+        predicted labels for each sample, the silhouette score and the dunn index
+        of the clustering are calculated and stored in the `inertia`,
+        `predicted`, `sc_score` and `dunn_val` instance variables, respectively.
+        The predicted labels are stored as compact int8/int16 arrays and the labelled dataframe of each number of clusters is only built on its first lookup in `labelled_df` or by `get_lablled_data`.
+
+        For large datasets, `estimator='minibatch'`, a `sample_size` and `n_jobs` keep
+        the memory and the time of the sweep bounded.
 
         Parameters
         ----------
@@ -100,13 +170,22 @@ class KMeansClustering:
         The method used for clustering. Must be one of {'pca', 'scaled'} (default is 'pca').
         pc_var : float, optional
         The minimum variance of PCA to get at least two components (default is 0.95)."
+        estimator : str, optional
+        The clustering estimator. Must be one of {'kmeans', 'minibatch'} (default is 'kmeans').
+        sample_size : int, optional
+        Number of samples used to compute the silhouette score and the dunn index.
+        All the samples are used by default.
+        random_state : int, optional
+        Seed of the estimators and of the samples used for the scores (default is 42).
+        batch_size : int, optional
+        Size of the mini batches when `estimator='minibatch'` (default is 1024).
+        n_jobs : int, optional
+        Number of values of k fitted in parallel (default is 1).
         """
         if method not in self.METHODS:
             raise ValueError("method must be one of {}".format(self.METHODS))
-        self.inertia = []
-        self.predicted = []
-        self.sc_score = []
-        self.dunn_val = []
+        if estimator not in self.ESTIMATORS:
+            raise ValueError("estimator must be one of {}".format(self.ESTIMATORS))
 
         pca = PCA(n_components=1)
         pca.fit_transform(self.df)
@@ -123,33 +202,26 @@ class KMeansClustering:
             pc.fit_transform(self.df),
             columns=["PC" + str(i) for i in range(pc.n_components_)],
         )
-        if method == "pca":
-            d = euclidean_distances(self.pca_fd)
-            for i in range(self.low, self.high + 1):
-                self.cluster = KMeans(n_clusters=i, random_state=42).fit(self.pca_fd)
-                k = self.cluster.predict(self.pca_fd)
-                self.inertia.append(self.cluster.inertia_)
-                self.predicted.append(k)
-                self.sc_score.append(
-                    silhouette_score(self.pca_fd, self.cluster.labels_)
-                )
-                # self.dunn_val.append(dunn(k, d))
-        if method == "scaled":
-            d = euclidean_distances(self.df)  # noqa
-            for i in range(self.low, self.high + 1):
-                self.cluster = KMeans(n_clusters=i, random_state=42).fit(self.df)
-                k = self.cluster.predict(self.df)
-                self.inertia.append(self.cluster.inertia_)
-                self.predicted.append(k)
-                self.sc_score.append(silhouette_score(self.df, self.cluster.labels_))
-                # self.dunn_val.append(dunn(k, d))
-        self.labelled_df = dict()
-        j = 0
-        for i in range(self.low, self.high + 1):
-            self.labelled_df[i] = pd.concat(
-                [self.df, pd.DataFrame(self.predicted[j], columns=["Label"])], axis=1
+        X = self.pca_fd if method == "pca" else self.df
+
+        # the same sample is used to score every k so that the scores are comparable
+        sample_idx = None
+        if sample_size is not None and sample_size < len(X):
+            rng = np.random.RandomState(random_state)
+            sample_idx = np.sort(rng.choice(len(X), sample_size, replace=False))
+
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_n_clusters)(
+                X.values, i, estimator, sample_idx, random_state, batch_size
             )
-            j = j + 1
+            for i in range(self.low, self.high + 1)
+        )
+        self.cluster = results[-1]["model"]
+        self.inertia = [res["inertia"] for res in results]
+        self.predicted = [res["labels"] for res in results]
+        self.sc_score = [res["sc_score"] for res in results]
+        self.dunn_val = [res["dunn"] for res in results]
+        self.labelled_df = _LabelledData(self.df, self.predicted, self.low, self.high)
 
     def elbow_plot(self):
         """Generate elbow plot for the KMeansClustering model.
@@ -273,7 +345,7 @@ class KMeansClustering:
     def get_lablled_data(self, cluster_no):
         """Return the labelled data for a specific number of clusters.
 
-        The labelled data is a pandas DataFrame that contains the original data along with a column of predicted cluster labels for each sample. The DataFrame is created for each number of clusters in the range from `self.low` to `self.high` when the `fit` method is called. Use this method to retrieve the labelled data for a specific number of clusters.
+        The labelled data is a pandas DataFrame that contains the original data along with a column of predicted cluster labels for each sample. The DataFrame is built from the labels predicted by the `fit` method for any number of clusters in the range from `self.low` to `self.high`. Use this method to retrieve the labelled data for a specific number of clusters.
 
         Parameters
         ----------
@@ -1,4 +1,6 @@
 import numpy as np
+from sklearn import get_config
+from sklearn.metrics import pairwise_distances_chunked
 from sklearn.metrics.pairwise import euclidean_distances  # noqa
 from sklearn.preprocessing import LabelEncoder
 
@@ -6,7 +8,100 @@ DIAMETER_METHODS = ["mean_cluster", "farthest"]
 CLUSTER_DISTANCE_METHODS = ["nearest", "farthest"]
 
 
-def inter_cluster_distances(labels, distances, method="nearest"):
+def _iter_distance_chunks(
+    order, distances=None, X=None, metric="euclidean", working_memory=None
+):
+    """Yield row blocks of the distance matrix with rows and columns in ``order``.
+
+    The blocks are sliced from ``distances`` when given, otherwise they are
+    computed from the data ``X`` so that the full n x n matrix is never held
+    in memory.
+    """
+    if distances is None:
+        if X is None:
+            raise ValueError("Either distances or X must be given")
+        yield from pairwise_distances_chunked(
+            np.asarray(X)[order], metric=metric, working_memory=working_memory
+        )
+        return
+
+    distances = np.asarray(distances)
+    if working_memory is None:
+        working_memory = get_config()["working_memory"]
+    row_bytes = distances.shape[1] * distances.itemsize
+    n_rows = max(int(working_memory * 2**20 // row_bytes), 1)
+    for start in range(0, distances.shape[0], n_rows):
+        yield distances[order[start : start + n_rows]][:, order]
+
+
+def _reduce_cluster_pairs(labels, reducers, **kwargs):
+    """Reduce the distances of all pairs of points by pair of clusters.
+
+    Parameters
+    ----------
+    labels : numpy.array
+        Cluster labels encoded as ``0..n_clusters - 1``.
+    reducers : list
+        ``(ufunc, initial)`` pairs, e.g. ``(np.minimum, np.inf)``.
+    kwargs : dict
+        ``distances``, ``X``, ``metric`` and ``working_memory`` passed on to
+        ``_iter_distance_chunks``.
+
+    Returns
+    -------
+    list
+        A n_clusters x n_clusters numpy.array for every reducer.
+    """
+    n_clusters = labels.max() + 1
+    # the points are ordered by label so that every cluster is a contiguous
+    # block of rows and columns that can be reduced with ``ufunc.reduceat``
+    order = np.argsort(labels, kind="stable")
+    labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, np.diff(labels) != 0])
+
+    results = [np.full((n_clusters, n_clusters), initial) for _, initial in reducers]
+    offset = 0
+    for chunk in _iter_distance_chunks(order, **kwargs):
+        rows = labels[offset : offset + len(chunk)]
+        offset += len(chunk)
+        row_starts = np.flatnonzero(np.r_[True, np.diff(rows) != 0])
+        present = rows[row_starts]
+        for (ufunc, _), out in zip(reducers, results):
+            reduced = ufunc.reduceat(chunk, starts, axis=1)
+            reduced = ufunc.reduceat(reduced, row_starts, axis=0)
+            out[present] = ufunc(out[present], reduced)
+    return results
+
+
+def _cluster_reducer(method):
+    return (np.maximum, 0.0) if method == "farthest" else (np.minimum, np.inf)
+
+
+def _diameter_reducer(method):
+    return (np.maximum, 0.0) if method == "farthest" else (np.add, 0.0)
+
+
+def _finalize_cluster_distances(cluster_distances):
+    np.fill_diagonal(cluster_distances, 0)
+    return cluster_distances
+
+
+def _finalize_diameters(labels, cluster_distances, method):
+    diameters = np.diag(cluster_distances).copy()
+    if method == "mean_cluster":
+        # every pair within a cluster is counted twice in the full matrix
+        diameters /= 2 * np.bincount(labels, minlength=len(diameters))
+    return diameters
+
+
+def inter_cluster_distances(
+    labels,
+    distances=None,
+    method="nearest",
+    X=None,
+    metric="euclidean",
+    working_memory=None,
+):
     """Calculate the distances between the two nearest points or the two farthest points for each cluster, depending on the method specified.
 
     The input `distances` should be a symmetric matrix. This function only considers the upper triangle of the matrix (i.e., the distances above the main diagonal). If a distance matrix is not given, Euclidean distance is used.
@@ -17,12 +112,20 @@ def inter_cluster_distances(labels, distances, method="nearest"):
     ----------
     labels : list
              A list containing cluster labels for each of the n elements
-    distances : numpy.array
+    distances : numpy.array, optional
                 An n x n numpy.array containing the pairwise distances between elements
     method : str, optional (default='nearest')
              The method to use for calculating inter-cluster distances.
              'nearest' calculates the distances between the two nearest points in each cluster,
              while 'farthest' calculates the distances between the two farthest points.
+    X : array-like, optional
+        An n x m data matrix used to compute the distances in row blocks when
+        `distances` is not given.
+    metric : str, optional (default='euclidean')
+             The metric used to compute the distances from `X`.
+    working_memory : int, optional
+                     Memory in MiB used for each block of distances. Defaults to the
+                     sklearn `working_memory` setting.
 
     Returns
     -------
@@ -31,39 +134,32 @@ def inter_cluster_distances(labels, distances, method="nearest"):
     if method not in CLUSTER_DISTANCE_METHODS:
         raise ValueError("method must be one of {}".format(CLUSTER_DISTANCE_METHODS))
 
-    if method == "nearest":
-        return __cluster_distances_by_points(labels, distances)
-    elif method == "farthest":
-        return __cluster_distances_by_points(labels, distances, farthest=True)
-
-
-def __cluster_distances_by_points(labels, distances, farthest=False):
-    n_unique_labels = len(np.unique(labels))
-    cluster_distances = np.full(
-        (n_unique_labels, n_unique_labels), float("inf") if not farthest else 0
+    return __cluster_distances_by_points(
+        np.asarray(labels),
+        farthest=(method == "farthest"),
+        distances=distances,
+        X=X,
+        metric=metric,
+        working_memory=working_memory,
     )
 
-    np.fill_diagonal(cluster_distances, 0)
 
-    for i in np.arange(0, len(labels) - 1):
-        for ii in np.arange(i, len(labels)):
-            if labels[i] != labels[ii] and (
-                (
-                    not farthest
-                    and distances[i, ii] < cluster_distances[labels[i], labels[ii]]
-                )
-                or (
-                    farthest
-                    and distances[i, ii] > cluster_distances[labels[i], labels[ii]]
-                )
-            ):
-                cluster_distances[labels[i], labels[ii]] = cluster_distances[
-                    labels[ii], labels[i]
-                ] = distances[i, ii]
-    return cluster_distances
+def __cluster_distances_by_points(labels, farthest=False, **kwargs):
+    method = "farthest" if farthest else "nearest"
+    (cluster_distances,) = _reduce_cluster_pairs(
+        labels, [_cluster_reducer(method)], **kwargs
+    )
+    return _finalize_cluster_distances(cluster_distances)
 
 
-def diameter(labels, distances, method="farthest"):
+def diameter(
+    labels,
+    distances=None,
+    method="farthest",
+    X=None,
+    metric="euclidean",
+    working_memory=None,
+):
     """Calculate diameter for clusters.
 
     Parameters
@@ -74,6 +170,8 @@ def diameter(labels, distances, method="farthest"):
 
     method : either `mean_cluster` for the mean distance between all elements in each cluster, or `farthest` for the distance between the two points furthest from each other
 
+    X, metric, working_memory : see :py:function:`inter_cluster_distances`
+
     Returns
     -------
     diameters :
@@ -82,27 +180,27 @@ def diameter(labels, distances, method="farthest"):
     if method not in DIAMETER_METHODS:
         raise ValueError("method must be one of {}".format(DIAMETER_METHODS))
 
-    n_clusters = len(np.unique(labels))
-    diameters = np.zeros(n_clusters)
-
-    if method == "mean_cluster":
-        for i in range(0, len(labels) - 1):
-            for ii in range(i + 1, len(labels)):
-                if labels[i] == labels[ii]:
-                    diameters[labels[i]] += distances[i, ii]
-
-        for i in range(len(diameters)):
-            diameters[i] /= sum(labels == i)
-
-    elif method == "farthest":
-        for i in range(0, len(labels) - 1):
-            for ii in range(i + 1, len(labels)):
-                if labels[i] == labels[ii] and distances[i, ii] > diameters[labels[i]]:
-                    diameters[labels[i]] = distances[i, ii]
-    return diameters
-
-
-def dunn(labels, distances, diameter_method="farthest", cdist_method="nearest"):
+    labels = np.asarray(labels)
+    (cluster_distances,) = _reduce_cluster_pairs(
+        labels,
+        [_diameter_reducer(method)],
+        distances=distances,
+        X=X,
+        metric=metric,
+        working_memory=working_memory,
+    )
+    return _finalize_diameters(labels, cluster_distances, method)
+
+
+def dunn(
+    labels,
+    distances=None,
+    diameter_method="farthest",
+    cdist_method="nearest",
+    X=None,
+    metric="euclidean",
+    working_memory=None,
+):
     """Dunn index for cluster validation (larger is better).
 
     min_inter_distance: The minimum distance between any two cluster centroids.
@@ -122,13 +220,32 @@ def dunn(labels, distances, diameter_method="farthest", cdist_method="nearest"):
 
     cdist_method: see : py:function:`diameter` `method` parameter
 
+    X, metric, working_memory : see :py:function:`inter_cluster_distances`.
+    Passing the data `X` instead of `distances` computes the distances in row
+    blocks, so that large datasets can be evaluated without the n x n matrix.
 
     """
+    if diameter_method not in DIAMETER_METHODS:
+        raise ValueError("method must be one of {}".format(DIAMETER_METHODS))
+    if cdist_method not in CLUSTER_DISTANCE_METHODS:
+        raise ValueError("method must be one of {}".format(CLUSTER_DISTANCE_METHODS))
 
     labels = LabelEncoder().fit(labels).transform(labels)
 
-    ic_distances = inter_cluster_distances(labels, distances, cdist_method)
+    # both the inter cluster distances and the diameters are reduced in a
+    # single pass over the distances
+    ic_distances, cluster_diameters = _reduce_cluster_pairs(
+        labels,
+        [_cluster_reducer(cdist_method), _diameter_reducer(diameter_method)],
+        distances=distances,
+        X=X,
+        metric=metric,
+        working_memory=working_memory,
+    )
+    ic_distances = _finalize_cluster_distances(ic_distances)
     min_distance = min(ic_distances[ic_distances.nonzero()])
-    max_diameter = max(diameter(labels, distances, diameter_method))
+    max_diameter = max(
+        _finalize_diameters(labels, cluster_diameters, diameter_method)
+    )
 
     return min_distance / max_diameter
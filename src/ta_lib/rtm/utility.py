@@ -8,6 +8,9 @@ import re  # noqa
 import seaborn as sns
 import statsmodels.api as sm  # noqa
 import statsmodels.formula.api as smf
+from joblib import Parallel, delayed
+from scipy import stats
+from scipy.linalg import solve_triangular
 from sklearn.impute import SimpleImputer
 from sklearn.metrics import (
     accuracy_score,
@@ -23,6 +26,15 @@ from ta_lib.regression.api import SKLStatsmodelOLS
 # sales impact modelling related functions
 
 
+def _get_expected_signs(names, neg_impact_vars):
+    """Return the expected sign (-1 or 1) of the coefficients of the features in ``names``."""
+    names = pd.Series(names, dtype="object")
+    negative = np.zeros(len(names), dtype=bool)
+    for col in neg_impact_vars:
+        negative |= names.str.contains(col).to_numpy(dtype=bool)
+    return np.where(negative, -1, 1)
+
+
 def coefficient_check(formula, data, neg_impact_vars, response, correl_data):
     """Compute a coefficient table for a linear regression model and adjusts the signs of the coefficients based on some rules.
 
@@ -55,30 +67,96 @@ def coefficient_check(formula, data, neg_impact_vars, response, correl_data):
         smf.ols(formula, data).fit().params.reset_index().rename(columns={0: "coef"})
     )
     coeff_table = coeff_table.drop(0, axis=0)
-    coeff_table["sign"] = 1
+    coeff_table["sign"] = _get_expected_signs(coeff_table["index"], neg_impact_vars)
     coeff_table["corr_sign"] = coeff_table["index"].map(
         dict(zip(correl_data["index"][1:], correl_data[response][1:]))
     )
 
-    for col in neg_impact_vars:
-        neg_coef = coeff_table["index"][coeff_table["index"].str.contains(col)].tolist()
-        pos_coef = coeff_table["index"][  # noqa
-            ~coeff_table["index"].str.contains(col)
-        ].tolist()[1:]
-        # print(coeff_table)
-        coeff_table["sign"] = np.where(coeff_table["index"].isin(neg_coef), -1, 1)
-
     return coeff_table
 
 
+def _score_candidates(Q, R, y, candidates):
+    """Fit the models adding each candidate column to a fitted least squares model.
+
+    The fitted model is given by the thin QR decomposition ``Q @ R`` of its
+    design matrix. Each candidate
+    is orthogonalised against ``Q``, which is a rank-one update of the
+    decomposition, so that the coefficients and p-values of all the augmented
+    models follow from a few matrix products instead of a refit per candidate.
+
+    Parameters
+    ----------
+    Q : numpy.ndarray
+        ``(n, p)`` orthonormal factor of the design matrix.
+    R : numpy.ndarray
+        ``(p, p)`` upper triangular factor of the design matrix.
+    y : numpy.ndarray
+        ``(n,)`` response.
+    candidates : numpy.ndarray
+        ``(n, k)`` candidate columns.
+
+    Returns
+    -------
+    coefs : numpy.ndarray
+        ``(p + 1, k)`` coefficients of the augmented models, the candidate last.
+    pvalues : numpy.ndarray
+        ``(p + 1, k)`` p-values of the coefficients. Candidates collinear with
+        the design matrix get ``NaN`` p-values.
+    """
+    n_obs, n_params = Q.shape
+    dof = n_obs - n_params - 1
+
+    qty = Q.T @ y
+    beta = solve_triangular(R, qty)
+    resid = y - Q @ qty
+
+    proj = Q.T @ candidates
+    ortho = candidates - Q @ proj
+    ortho_ss = np.einsum("ij,ij->j", ortho, ortho)
+    collinear = ortho_ss <= 1e-10 * np.einsum("ij,ij->j", candidates, candidates)
+    ortho_ss = np.where(collinear, np.nan, ortho_ss)
+
+    # coefficients of the candidate and the update of the existing coefficients
+    beta_new = (resid @ ortho) / ortho_ss
+    gain = solve_triangular(R, proj)
+    coefs = np.vstack([beta[:, None] - gain * beta_new, beta_new])
+
+    # diagonal of the inverse gram matrix of the augmented models
+    r_inv = solve_triangular(R, np.eye(n_params))
+    inv_diag = np.einsum("ij,ij->i", r_inv, r_inv)
+    inv_diag = np.vstack([inv_diag[:, None] + gain**2 / ortho_ss, 1 / ortho_ss])
+
+    rss = resid @ resid - beta_new**2 * ortho_ss
+    if dof <= 0:
+        return coefs, np.full_like(coefs, np.nan)
+    tvalues = coefs / np.sqrt(inv_diag * rss / dof)
+    pvalues = 2 * stats.t.sf(np.abs(tvalues), dof)
+    return coefs, pvalues
+
+
+def _qr_append(Q, R, column):
+    """Update the thin QR decomposition of a design matrix with a new last column."""
+    proj = Q.T @ column
+    ortho = column - Q @ proj
+    norm = np.sqrt(ortho @ ortho)
+    n_params = R.shape[0]
+    R_new = np.zeros((n_params + 1, n_params + 1))
+    R_new[:n_params, :n_params] = R
+    R_new[:n_params, -1] = proj
+    R_new[-1, -1] = norm
+    return np.column_stack([Q, ortho / norm]), R_new
+
+
 def stepwise_regression(
-    data, response, neg_coeff_columns, necessary_col, correlation_data
+    data, response, neg_coeff_columns, necessary_col, correlation_data, n_jobs=1
 ):
     """Perform a stepwise regression on the data, selecting features based on their p-value and the sign of their coefficient.
 
     The function performs a stepwise regression on the data, starting with the features specified in necessary_col. At each step, it considers adding a new candidate feature to the model, and computes the p-value of the model fit with that candidate feature. If the p-value is significant (less than or equal to 0.1), and if the signs of the coefficient and correlation of the candidate feature are intuitive (i.e. negative for features in neg_coeff_columns, and the same sign as the correlation with the response variable), the candidate feature is added to the selected features.
     The function stops adding features to the model when all remaining candidates have a p-value greater than 0.1, or when no candidate features remain. The final model is fit using the selected features, and the result is returned.
 
+    The candidates are not refit one formula at a time. The design matrix is built once and the QR decomposition of the selected features is updated with a rank-one update per step, so that the p-values and coefficient signs of the models adding every candidate are computed together. Candidates with missing values in the rows used by the model are fit on their own rows, as ``smf.ols`` would. Only the numeric and boolean columns of the data are candidates.
+
     Parameters
     ----------
     data : pandas.DataFrame
@@ -91,86 +169,100 @@ def stepwise_regression(
                     A list of column names for features that should be included in the model at the start of the selection process.
     correlation_data : pandas.DataFrame
                        A correlation matrix of the features in the data."
+    n_jobs : int, default=1
+             Number of processes used to score the candidates of each step.
 
     Returns
     -------
     model : statsmodels.regression.linear_model.RegressionResultsWrapper
             The result of fitting a linear regression model on the selected features.
+
+    Raises
+    ------
+    ValueError
+               If the response or a column of necessary_col is not numeric.
     """
-    remaining = set(data.columns)
-    remaining.remove(response)
-    # remaining.remove()
+    numeric = set(data.select_dtypes(include=["number", "bool"]).columns)
+    non_numeric = [col for col in [response, *necessary_col] if col not in numeric]
+    if non_numeric:
+        raise ValueError(
+            f"stepwise_regression only supports numeric columns, got {non_numeric}"
+        )
+    features = [col for col in data.columns if col != response and col in numeric]
+    values = data[features].to_numpy(dtype="float64")
+    y = data[response].to_numpy(dtype="float64")
+    col_idx = {col: i for i, col in enumerate(features)}
+
+    # expected sign of each coefficient, 0 when the expected sign and the
+    # sign of the correlation with the response disagree.
+    corr_sign = np.sign(
+        pd.Series(features)
+        .map(dict(zip(correlation_data["index"][1:], correlation_data[response][1:])))
+        .to_numpy(dtype="float64")
+    )
+    expected_sign = _get_expected_signs(features, neg_coeff_columns)
+    expected_sign = np.where(corr_sign == expected_sign, expected_sign, 0)
 
     """Starting with necessary columns"""
-    selected = necessary_col
-    best_new_score = 0  # p value
-
-    while remaining and best_new_score <= 0.1:
-        scores_with_candidates = []
-        model_coeff = []
-        for candidate in remaining:
-            # print(f'loop {candidate}')
-            formula = "{} ~ {} + 1".format(response, " + ".join(selected + [candidate]))
-            score = smf.ols(formula, data).fit().pvalues.reset_index().iloc[-1, -1]
-            # print(f'printing score:{score}')
-            score_all = (
-                smf.ols(formula, data).fit().pvalues.reset_index().iloc[1:, 1].tolist()
-            )
-            # print(f'printing score_all:{score_all}')
-
-            """Coeff-check"""
-            coeff_table = coefficient_check(
-                formula, data, neg_coeff_columns, response, correlation_data
-            )
-
-            scores_with_candidates.append((score, candidate, score_all, coeff_table))
-            model_coeff.append(coeff_table)
-
-        scores_with_candidates.sort(reverse=True)
-
-        """Keeping only combinations with significant p values"""
-        score_with_candidates_updated = [
-            (i[0], i[1], i[2], i[3])
-            for i in scores_with_candidates
-            if all(j <= 0.1 for j in i[2])
-        ]
-        score_with_candidates_updated.sort(reverse=True)
-
-        """Keeping only combinations with intuitive signs"""
-        score_with_candidates_updated = [
-            (j[0], j[1], j[2], j[3])
-            for j in score_with_candidates_updated
-            if all(
-                (np.sign(j[3]["coef"]) == j[3]["sign"])
-                & (np.sign(j[3]["coef"]) == np.sign(j[3]["corr_sign"]))
+    selected = list(dict.fromkeys(necessary_col))
+    remaining = [col for col in features if col not in selected]
+    sel_idx = [col_idx[col] for col in selected]
+    Q = R = rows = None
+
+    while remaining:
+        # rows used by the current model, as dropped by smf.ols
+        model_rows = ~np.isnan(y) & ~np.isnan(values[:, sel_idx]).any(axis=1)
+        if rows is None or (rows != model_rows).any():
+            rows = model_rows
+            design = np.column_stack([np.ones(rows.sum()), values[rows][:, sel_idx]])
+            Q, R = np.linalg.qr(design)
+
+        cand_idx = np.array([col_idx[col] for col in remaining])
+        candidates = values[rows][:, cand_idx]
+        complete = ~np.isnan(candidates).any(axis=0)
+
+        # candidates with missing values are fit on their own rows
+        chunks = np.array_split(np.flatnonzero(complete), max(n_jobs, 1))
+        chunks = [chunk for chunk in chunks if len(chunk)]
+        jobs = [(Q, R, y[rows], candidates[:, chunk]) for chunk in chunks]
+        for i in np.flatnonzero(~complete):
+            cand_rows = rows.copy()
+            cand_rows[rows] = ~np.isnan(candidates[:, i])
+            design = np.column_stack(
+                [np.ones(cand_rows.sum()), values[cand_rows][:, sel_idx]]
             )
-        ]
-        score_with_candidates_updated.sort(reverse=True)
-
-        if len(score_with_candidates_updated) == 0:
+            cand_values = values[cand_rows][:, [cand_idx[i]]]
+            jobs.append((*np.linalg.qr(design), y[cand_rows], cand_values))
+            chunks.append([i])
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_score_candidates)(*job) for job in jobs
+        )
+        order = np.concatenate(chunks).astype(int)
+        coefs = np.hstack([res[0] for res in results])[1:]
+        pvalues = np.hstack([res[1] for res in results])[1:]
+
+        """Keeping only combinations with significant p values and intuitive signs"""
+        signs = np.vstack(
+            [
+                np.repeat(expected_sign[sel_idx][:, None], len(order), axis=1),
+                expected_sign[cand_idx[order]],
+            ]
+        )
+        valid = (pvalues <= 0.1).all(axis=0) & (np.sign(coefs) == signs).all(axis=0)
+        valid &= (signs != 0).all(axis=0)
+        if not valid.any():
             print("No remaining iterations where log_total_visits is significant")
             break
 
-        # print(score_with_candidates_updated[-1])
-        (
-            best_new_score,
-            best_candidate,
-            all_scores,
-            table_coeff,
-        ) = score_with_candidates_updated[-1]
-        # if len(all_scores)==0:
-        # all_scores.append(0.1)
-        # print(best_new_score,all_scores)
-        if all(i <= 0.1 for i in all_scores):
-            remaining.remove(best_candidate)
-            selected.append(best_candidate)
-        elif all_scores[0] > 0.1:
-            print(
-                "log_total_visits is insignificant. "
-                + "pvalue is: "
-                + str(all_scores[0])
-            )
-            break
+        best_new_score, best_candidate = min(
+            (pvalues[-1, i], remaining[order[i]]) for i in np.flatnonzero(valid)
+        )
+        best_idx = col_idx[best_candidate]
+        remaining.remove(best_candidate)
+        selected.append(best_candidate)
+        sel_idx.append(best_idx)
+        if not np.isnan(values[rows, best_idx]).any():
+            Q, R = _qr_append(Q, R, values[rows, best_idx])
 
     formula = "{} ~ {} + 1".format(response, " + ".join(selected))
     model = smf.ols(formula, data).fit()
@@ -362,55 +454,101 @@ def get_ROI(train_X, train_y, coeff_dict, rtm_cols, cost_col):
     return rtm_impact / cost
 
 
-# Add optimal visits
-def get_optimal_visits(
-    coeff_dict, visit_var, visits_transformation, RSV_TO_MAC, cost_per_visit
+def get_visit_scenarios(
+    visits_coeff, visits_transformation, RSV_TO_MAC, cost_per_visit, max_visits=1000
 ):
-    """Calculate the optimal number of visits for RTM, given the model coefficients and other parameters.
+    """Evaluate the RTM contribution, ROI and incremental ROI of visit counts for many segments and cost assumptions at once.
 
-    The function first calculate the RTM contribution for each possible number of visits, using the model coefficients and the specified transformation function. It then calculates the ROI and incremental ROI for each number of visits, using the RSV_TO_MAC conversion and the cost per visit. Finally, it plots the RTM contribution, ROI, and incremental ROI for each number of visits, and returns the optimal number of visits and the plot object as a tuple.
+    The function evaluates the visits transformation once per visit count and broadcasts it against the visit coefficients of every segment (e.g. the outlet clusters of ``rtm.cluster``) and every cost scenario. As in ``get_optimal_visits``, the visit counts grow by 5 from 12 until the incremental ROI of every scenario drops below 1, or ``max_visits`` is reached.
 
     Parameters
     ----------
-    coeff_dict : dict
-                 A dictionary containing the coefficients for the features used in the regression.
-    visit_var : str
-                The name of the feature referring to the RTM visits in the dataframe.
+    visits_coeff : float or array-like
+                   Coefficient of the visits feature of each segment, of shape ``(n_segments,)``.
     visits_transformation : callable
                             A function that takes the number of visits as input and returns a transformed value.
-    RSV_TO_MAC : float
-                 A finance metric used to convert RSV to MAC.
-    cost_per_visit : float
-                     The calculated cost of a single visit.
+    RSV_TO_MAC : float or array-like
+                 A finance metric used to convert RSV to MAC, for each cost scenario.
+    cost_per_visit : float or array-like
+                     The cost of a single visit, for each cost scenario. Broadcast together with RSV_TO_MAC to shape ``(n_costs,)``.
+    max_visits : int, default=1000
+                 Largest number of visits evaluated.
 
     Returns
     -------
-    (optimal_visits,ax1): tuple
-                    A tuple containing the optimal number of visits and the plot object used to visualize the results.
+    scenarios : dict
+                Dictionary with the evaluated ``visits`` of shape ``(n_visits,)``, the ``contribution`` of shape ``(n_visits, n_segments)``, the ``roi`` of shape ``(n_visits, n_segments, n_costs)``, the ``incremental_roi`` of shape ``(n_visits - 1, n_segments, n_costs)`` and the ``optimal_visits`` of shape ``(n_segments, n_costs)``. The optimal visits are -1 for scenarios whose incremental ROI stays above 1 up to ``max_visits``.
+
+    Raises
+    ------
+    ValueError
+               If a visit coefficient is missing or not finite.
     """
-    visits_coeff = coeff_dict.get(visit_var)
-    fig = plt.figure()
-    ax1 = fig.add_subplot(1, 1, 1)
-    ax2 = ax1.twinx()
-    max_visits = 12
-    inc_roi = []
+    visits_coeff = np.atleast_1d(np.asarray(visits_coeff, dtype="float64"))
+    if not np.isfinite(visits_coeff).all():
+        raise ValueError(f"Visit coefficients should be finite, got {visits_coeff}")
+    rsv_to_mac, cost = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(RSV_TO_MAC, dtype="float64")),
+        np.atleast_1d(np.asarray(cost_per_visit, dtype="float64")),
+    )
+
     # Only varying factor in the hypothetical scenario is total number visits.
     # Hence, only total visits contrib is reqd to calculate optimal visits
     # Optimal visits is when incremental because of additional 1 visits is less than the cost of a single visit.
-    while not any([inc_ < 1 for inc_ in inc_roi]):
-        visits = range(1, max_visits + 1)
-        contrib = [visits_transformation(nvisit) * visits_coeff for nvisit in visits]
-        roi = [
-            c * RSV_TO_MAC / (cost_per_visit * nvisit)
-            for nvisit, c in zip(visits, contrib)
-        ]
-        inc_roi = [
-            (c_ - c) * RSV_TO_MAC / cost_per_visit
-            for c, c_ in zip(contrib[:-1], contrib[1:])
+    # Only the increments of the visits added at each step are checked.
+    transformed = np.empty(max_visits, dtype="float64")
+    found = np.zeros((len(visits_coeff), len(cost)), dtype=bool)
+    n_done, n_visits = 0, min(12, max_visits)
+    while True:
+        transformed[n_done:n_visits] = [
+            visits_transformation(nvisit) for nvisit in range(n_done + 1, n_visits + 1)
         ]
-        max_visits += 5
+        new_contrib = transformed[max(n_done - 1, 0) : n_visits, None] * visits_coeff
+        new_inc_roi = np.diff(new_contrib, axis=0)[:, :, None] * rsv_to_mac / cost
+        found |= (new_inc_roi < 1).any(axis=0)
+        n_done = n_visits
+        if found.all() or n_visits >= max_visits:
+            break
+        n_visits = min(n_visits + 5, max_visits)
+
+    visits = np.arange(1, n_visits + 1)
+    contrib = transformed[:n_visits, None] * visits_coeff
+    inc_roi = np.diff(contrib, axis=0)[:, :, None] * rsv_to_mac / cost
+    roi = contrib[:, :, None] * rsv_to_mac / (cost * visits[:, None, None])
+    return {
+        "visits": visits,
+        "contribution": contrib,
+        "roi": roi,
+        "incremental_roi": inc_roi,
+        "optimal_visits": np.where(found, (inc_roi < 1).argmax(axis=0), -1),
+    }
+
+
+def plot_visit_scenario(scenarios, segment=0, cost_scenario=0):
+    """Plot the RTM contribution, ROI and incremental ROI of one scenario returned by ``get_visit_scenarios``.
 
-    optimal_visits = [i for i, inc_ in enumerate(inc_roi) if inc_ < 1][0]
+    Parameters
+    ----------
+    scenarios : dict
+                Output of ``get_visit_scenarios``.
+    segment : int, default=0
+              Position of the segment to plot.
+    cost_scenario : int, default=0
+                    Position of the cost scenario to plot.
+
+    Returns
+    -------
+    ax1 : matplotlib.axes.Axes
+          The plot object used to visualize the results.
+    """
+    visits = scenarios["visits"]
+    contrib = scenarios["contribution"][:, segment]
+    roi = scenarios["roi"][:, segment, cost_scenario]
+    inc_roi = scenarios["incremental_roi"][:, segment, cost_scenario]
+
+    fig = plt.figure()
+    ax1 = fig.add_subplot(1, 1, 1)
+    ax2 = ax1.twinx()
     line1 = ax1.plot(visits, contrib, color="b", label="RTM contribution")
     line2 = ax2.plot(visits, roi, color="m", label="ROI")
     line3 = ax2.plot(visits[1:], inc_roi, color="r", label="Incremental ROI")
@@ -421,7 +559,64 @@ def get_optimal_visits(
     ax1.grid(False)
     lns = line1 + line2 + line3
     ax1.legend(lns, [line.get_label() for line in lns], loc=0)
-    return (optimal_visits, ax1)
+    return ax1
+
+
+# Add optimal visits
+def get_optimal_visits(
+    coeff_dict,
+    visit_var,
+    visits_transformation,
+    RSV_TO_MAC,
+    cost_per_visit,
+    max_visits=100000,
+):
+    """Calculate the optimal number of visits for RTM, given the model coefficients and other parameters.
+
+    The function first calculate the RTM contribution for each possible number of visits, using the model coefficients and the specified transformation function. It then calculates the ROI and incremental ROI for each number of visits, using the RSV_TO_MAC conversion and the cost per visit. Finally, it plots the RTM contribution, ROI, and incremental ROI for each number of visits, and returns the optimal number of visits and the plot object as a tuple.
+    Use ``get_visit_scenarios`` to evaluate many segments or cost assumptions at once.
+
+    Parameters
+    ----------
+    coeff_dict : dict
+                 A dictionary containing the coefficients for the features used in the regression.
+    visit_var : str
+                The name of the feature referring to the RTM visits in the dataframe.
+    visits_transformation : callable
+                            A function that takes the number of visits as input and returns a transformed value.
+    RSV_TO_MAC : float
+                 A finance metric used to convert RSV to MAC.
+    cost_per_visit : float
+                     The calculated cost of a single visit.
+    max_visits : int, default=100000
+                 Largest number of visits evaluated.
+
+    Returns
+    -------
+    (optimal_visits,ax1): tuple
+                    A tuple containing the optimal number of visits and the plot object used to visualize the results.
+
+    Raises
+    ------
+    ValueError
+               If the coefficient of visit_var is missing or not finite, or if the incremental ROI stays above 1 up to ``max_visits``.
+    """
+    if visit_var not in coeff_dict:
+        raise ValueError(f"{visit_var} is not in the model coefficients")
+    scenarios = get_visit_scenarios(
+        coeff_dict[visit_var],
+        visits_transformation,
+        RSV_TO_MAC,
+        cost_per_visit,
+        max_visits=max_visits,
+    )
+    optimal_visits = int(scenarios["optimal_visits"][0, 0])
+    if optimal_visits < 0:
+        raise ValueError(
+            f"Incremental ROI of {visit_var} stays above 1 up to "
+            f"{scenarios['visits'][-1]} visits"
+        )
+    return (optimal_visits, plot_visit_scenario(scenarios))
 
 
 def get_contribution(train_X, train_y, coeff_dict, rtm_cols):
@@ -456,6 +651,76 @@ def get_contribution(train_X, train_y, coeff_dict, rtm_cols):
     return contrib_dict, rtm_contrib
 
 
+def get_segment_contribution(train_X, train_y, coeff_frame, rtm_cols, segments):
+    """Contribution-calculating function for the models of many segments at once.
+
+    This function is the segment-wise version of ``get_contribution``. The feature and output sums of each segment are computed in one groupby and multiplied with the coefficients of all the segment models together.
+
+    Parameters
+    ----------
+    train_X : pd.DataFrame
+              Training input dataset, where each row represents an instance and each column represents a feature.
+    train_y : pd.DataFrame
+              Training output dataset, where each row represents the output of an instance.
+    coeff_frame : pd.DataFrame
+                  Coefficients of the model of each segment, indexed by segment with a column per feature (same as column names in train_X).
+    rtm_cols : list of str
+               List of column names describing RTM .
+    segments : array-like
+               Segment of each row of train_X, e.g. the cluster labels from ``rtm.cluster``.
+
+    Returns
+    -------
+    contrib : pd.DataFrame
+              Percentage contribution of all features in the model of each segment.
+    rtm_contrib : pd.DataFrame
+                  Percentage contribution of the RTM features in the model of each segment.
+    """
+    segments = np.asarray(segments)
+    y = pd.Series(np.asarray(train_y, dtype="float64").ravel(), index=train_X.index)
+    feature_sums = train_X[coeff_frame.columns].groupby(segments).sum()
+    y_sums = y.groupby(segments).sum().reindex(coeff_frame.index)
+    contrib = feature_sums.reindex(coeff_frame.index) * coeff_frame
+    contrib = contrib.div(y_sums, axis=0)
+    return contrib, contrib.reindex(columns=rtm_cols)
+
+
+def get_segment_ROI(train_X, train_y, coeff_frame, rtm_cols, cost_col, segments):
+    """Calculate the RSV ROI of the models of many segments at once.
+
+    Parameters
+    ----------
+    train_X : pandas.DataFrame
+              A dataframe containing the features used for the regression.
+    train_y : pandas.DataFrame
+              A dataframe containing the target variable for the regression.
+    coeff_frame : pandas.DataFrame
+                  Coefficients of the model of each segment, indexed by segment with a column per feature.
+    rtm_cols : list of str
+               A list of column names for features that correspond to the RTM activities.
+    cost_col : str or list of str
+               The name of the column containing the total visit cost, or a list of cost columns to evaluate several cost assumptions.
+    segments : array-like
+               Segment of each row of train_X.
+
+    Returns
+    -------
+    ROI : pandas.Series or pandas.DataFrame
+          ROI of each segment, with a column per cost column when ``cost_col`` is a list.
+    """
+    segments = np.asarray(segments)
+    _, rtm_contrib = get_segment_contribution(
+        train_X, train_y, coeff_frame, rtm_cols, segments
+    )
+    y = pd.Series(np.asarray(train_y, dtype="float64").ravel(), index=train_X.index)
+    y_sums = y.groupby(segments).sum().reindex(coeff_frame.index)
+    rtm_impact = rtm_contrib.sum(axis=1, skipna=False) * y_sums
+    cost = train_X[cost_col].groupby(segments).sum().reindex(coeff_frame.index)
+    if isinstance(cost, pd.DataFrame):
+        return cost.rdiv(rtm_impact, axis=0)
+    return rtm_impact / cost
+
+
 # Custom Transformations like these can be utilised
 def _custom_data_transform(df, cols2keep=None):
     """Customised Transformer to eliminate some data columns.
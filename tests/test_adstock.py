@@ -0,0 +1,136 @@
+"""Equivalence test and benchmark of the vectorized ``create_adstock``.
+
+The reference below is the previous row by row implementation. Run the file
+directly to time both implementations::
+
+    python tests/test_adstock.py
+"""
+import time
+from math import exp, log
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ta_lib.mmx.feature_engineering.data_preprocessing import create_adstock
+
+
+def _reference_apply_adstock(x, max_memory, decay):
+    adstocked_x = []
+    if max_memory != 0:
+        x = np.append(np.zeros(max_memory - 1), x)
+        weights = np.zeros(max_memory)
+        for j in range(max_memory):
+            weights[max_memory - 1 - j] = decay**j
+        for i in range(max_memory - 1, len(x)):
+            adstocked_x.append(sum(x[i - max_memory + 1 : i + 1] * weights))
+    else:
+        for i in x:
+            if len(adstocked_x) == 0:
+                adstocked_x.append(i)
+            else:
+                adstocked_x.append(i + decay * adstocked_x[-1])
+    return pd.Series(adstocked_x, copy=False)
+
+
+def _reference_create_adstock(
+    data, date_col, half_lives, max_memory=0, group_cols=None, suffix=""
+):
+    if group_cols is not None:
+        columns = [e for e in data.columns if e not in (*group_cols, date_col)]
+        data_res = data.sort_values([*group_cols, date_col])
+        data_res["id"] = data_res.groupby(group_cols).ngroup()
+    else:
+        columns = [e for e in data.columns if e not in date_col]
+        data_res = data.sort_values([date_col])
+        data_res["id"] = 0
+
+    key_cols = [date_col] if group_cols is None else [*group_cols, date_col]
+    data_adstock = pd.DataFrame()
+    for id in data_res["id"].unique():
+        temp_data = data_res[data_res["id"] == id][columns]
+        tmp_adstock = pd.DataFrame()
+        for n in half_lives:
+            decay_rate = exp(log(0.5) / n)
+            ad_dr = pd.DataFrame()
+            for i in temp_data.columns:
+                ad_dr[i] = _reference_apply_adstock(
+                    temp_data[i], max_memory=max_memory, decay=decay_rate
+                )
+            ad_dr = ad_dr.add_suffix(f"_{n}").add_suffix(suffix)
+            tmp_adstock = pd.concat([tmp_adstock, ad_dr], axis=1)
+        tmp_adstock = pd.concat(
+            [
+                data_res[data_res["id"] == id][key_cols].reset_index(drop=True),
+                tmp_adstock.reset_index(drop=True),
+            ],
+            axis=1,
+        )
+        data_adstock = pd.concat([data_adstock, tmp_adstock], ignore_index=True)
+    return data_adstock
+
+
+def _make_media_data(n_geos, n_weeks, n_cols, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "geo": np.repeat([f"g{i}" for i in range(n_geos)], n_weeks),
+            "date": np.tile(
+                pd.date_range("2020", periods=n_weeks, freq="W"), n_geos
+            ),
+        }
+    )
+    for c in range(n_cols):
+        df[f"m{c}"] = rng.random(n_geos * n_weeks) * 100
+    # unsorted input, as the groups are sorted by create_adstock
+    return df.sample(frac=1, random_state=seed)
+
+
+@pytest.mark.parametrize("max_memory", [0, 4])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_create_adstock_matches_reference(max_memory, n_jobs):
+    df = _make_media_data(n_geos=5, n_weeks=20, n_cols=3)
+    expected = _reference_create_adstock(
+        df, "date", [1, 2, 4], max_memory=max_memory, group_cols=["geo"], suffix="w"
+    )
+    actual = create_adstock(
+        df,
+        "date",
+        [1, 2, 4],
+        max_memory=max_memory,
+        group_cols=["geo"],
+        suffix="w",
+        n_jobs=n_jobs,
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_create_adstock_without_groups_matches_reference():
+    df = _make_media_data(n_geos=1, n_weeks=50, n_cols=2).drop(columns="geo")
+    expected = _reference_create_adstock(df, "date", [3])
+    pd.testing.assert_frame_equal(create_adstock(df, "date", [3]), expected)
+
+
+def benchmark(n_geos=60, n_weeks=104, n_cols=20, half_lives=(1, 2, 4)):
+    """Time both implementations on a media dataset and check they match."""
+    df = _make_media_data(n_geos, n_weeks, n_cols)
+    for max_memory in (0, 4):
+        start = time.perf_counter()
+        expected = _reference_create_adstock(
+            df, "date", list(half_lives), max_memory=max_memory, group_cols=["geo"]
+        )
+        t_ref = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = create_adstock(
+            df, "date", list(half_lives), max_memory=max_memory, group_cols=["geo"]
+        )
+        t_new = time.perf_counter() - start
+        pd.testing.assert_frame_equal(actual, expected)
+        print(
+            f"max_memory={max_memory}: reference {t_ref:.2f}s, "
+            f"vectorized {t_new:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,128 @@
+"""Round trip of the drift tables through the metrics sink on a local SQLite file."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+import ta_lib  # noqa: F401, adds the vendored tigerml to the path
+from tigerml.model_monitoring.utils.dao.db_connection import get_db_engine
+from tigerml.model_monitoring.utils.dao.metrics_sink import (
+    MetricsSink,
+    get_metrics_table,
+    melt_drift_table,
+)
+
+
+def _make_tables():
+    feature_drift = pd.DataFrame(
+        {
+            "variable": ["x", "c"],
+            "psi": [0.12, 0.03],
+            "ks_stats": [0.2, np.nan],
+            "drift": ["Moderate", "Low"],
+        }
+    )
+    bins = pd.cut(pd.Series([0.5, 1.5]), bins=[0, 1, 2])
+    psi_bins = pd.DataFrame(
+        {
+            "feature": ["x", "x"],
+            "bins_or_categories": bins,
+            "count_base": [10, 20],
+            "psi": [0.01, 0.02],
+        }
+    )
+    dsi_bins = pd.DataFrame(
+        {
+            "feature_bin": ["a", "b"],
+            "target_bin": bins,
+            "count_base": [3, 4],
+            "dsi": [0.3, 0.4],
+        }
+    )
+    return {
+        "Data Drift": {"Feature Drift": feature_drift, "PSI at bin level": psi_bins},
+        "Concept Drift": {"DSI at bin level": {"c": dsi_bins}},
+        "Glossary": "not a table",
+    }
+
+
+def _read_metrics(engine):
+    table = get_metrics_table()
+    with engine.connect() as conn:
+        rows = conn.execute(select(table)).mappings().all()
+    return pd.DataFrame(rows, columns=table.c.keys()).sort_values(
+        ["run_id", "table_name", "feature", "bin", "metric"], ignore_index=True
+    )
+
+
+def test_melt_drift_table_keeps_the_bins():
+    tables = _make_tables()
+    psi = melt_drift_table("psi", tables["Data Drift"]["PSI at bin level"])
+    assert psi["feature"].tolist() == ["x"] * 4
+    assert psi["bin"].tolist() == ["(0, 1]", "(1, 2]"] * 2
+    assert psi["metric"].tolist() == ["count_base"] * 2 + ["psi"] * 2
+
+    dsi = melt_drift_table("dsi", tables["Concept Drift"]["DSI at bin level"]["c"])
+    assert dsi["feature"].isna().all()
+    assert dsi["bin"].tolist() == ["a|(0, 1]", "b|(1, 2]"] * 2
+
+
+def test_metrics_sink_sqlite_round_trip(tmp_path):
+    engine = get_db_engine(f"sqlite:///{tmp_path / 'monitoring.db'}")
+    timestamp = datetime(2024, 1, 31, 12, 30)
+    sink = MetricsSink(engine, model_name="churn", model_version="1.0", chunksize=3)
+
+    assert sink.add_tables(_make_tables()).flush(timestamp=timestamp) == 1
+    assert sink.add_tables(_make_tables()).flush() == 2
+
+    metrics = _read_metrics(engine)
+    first_run = metrics[metrics["run_id"] == 1]
+    assert len(first_run) == 6 + 4 + 4
+    assert (first_run["model"] == "churn").all()
+    assert (first_run["version"] == "1.0").all()
+    assert (first_run["timestamp"] == pd.Timestamp(timestamp)).all()
+    assert metrics.groupby("run_id").size().tolist() == [14, 14]
+
+    drift = first_run[first_run["table_name"] == "Data Drift.Feature Drift"]
+    psi = drift.set_index(["feature", "metric"])
+    assert psi.loc[("x", "psi"), "value"] == pytest.approx(0.12)
+    assert np.isnan(psi.loc[("c", "ks_stats"), "value"])
+    assert psi.loc[("x", "drift"), "value_text"] == "Moderate"
+    assert psi["bin"].isna().all()
+
+    bins = first_run[first_run["table_name"] == "Concept Drift.DSI at bin level.c"]
+    assert set(bins["bin"]) == {"a|(0, 1]", "b|(1, 2]"}
+    assert bins.loc[bins["metric"] == "dsi", "value"].tolist() == [0.3, 0.4]
+
+
+def test_metrics_sink_rolls_back_a_failed_run(tmp_path):
+    engine = get_db_engine(f"sqlite:///{tmp_path / 'monitoring.db'}")
+    sink = MetricsSink(engine, model_name="churn", model_version="1.0")
+    sink.add_tables(_make_tables()).flush()
+
+    # a run whose rows violate the NOT NULL metric column is not written
+    sink.add_tables(_make_tables())
+    sink._tables[0]["metric"] = None
+    with pytest.raises(Exception):
+        sink.flush()
+    assert _read_metrics(engine)["run_id"].unique().tolist() == [1]
+
+
+def test_metrics_sink_rejects_a_run_id_already_written(tmp_path):
+    engine = get_db_engine(f"sqlite:///{tmp_path / 'monitoring.db'}")
+    sink = MetricsSink(engine, model_name="churn", model_version="1.0")
+    assert sink.add_tables(_make_tables()).flush(run_id=1) == 1
+
+    # e.g. a concurrent run which got the same run_id
+    other_sink = MetricsSink(engine, model_name="churn", model_version="1.0")
+    with pytest.raises(IntegrityError):
+        other_sink.add_tables(_make_tables()).flush(run_id=1)
+    assert len(_read_metrics(engine)) == 14
+
+    # the same run_id of another version is fine
+    other_version = MetricsSink(engine, model_name="churn", model_version="2.0")
+    assert other_version.add_tables(_make_tables()).flush(run_id=1) == 1
+    assert sink.add_tables(_make_tables()).flush() == 2